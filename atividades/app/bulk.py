@@ -0,0 +1,124 @@
+import csv
+import io
+import json
+import math
+
+from flask import request
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+
+from app.extensions import db
+from app.models.nota import Nota
+from app.models.resumo import recalcular_resumos
+
+MAXIMO_REGISTROS = 10000
+TAMANHO_LOTE_IN = 500
+
+
+def ler_registros():
+    """
+    Lê o corpo da requisição como CSV (com cabeçalho), array JSON ou NDJSON
+    (um objeto por linha). O CSV é reconhecido pelo `Content-Type: text/csv`
+    ou por não começar com `{`/`[`. Lança ValueError se o corpo for inválido.
+    """
+    corpo = request.get_data(as_text=True).strip()
+    if not corpo:
+        raise ValueError("Corpo vazio: envie CSV, um array JSON ou NDJSON")
+
+    if request.mimetype == "text/csv" or corpo[0] not in "[{":
+        registros = list(csv.DictReader(io.StringIO(corpo)))
+    elif corpo.startswith("["):
+        try:
+            registros = json.loads(corpo)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e.msg}")
+    else:
+        registros = []
+        for numero, linha in enumerate(corpo.splitlines(), start=1):
+            if not linha.strip():
+                continue
+            try:
+                registros.append(json.loads(linha))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"NDJSON inválido na linha {numero}: {e.msg}")
+
+    if len(registros) > MAXIMO_REGISTROS:
+        raise ValueError(f"Máximo de {MAXIMO_REGISTROS} registros por requisição")
+    return registros
+
+
+def ler_inteiro(valor, campo):
+    """
+    Converte `valor` (número JSON inteiro ou, vindo do CSV, o mesmo número
+    como texto) em int. Retorna `(inteiro, erro)`.
+    """
+    try:
+        if isinstance(valor, bool) or isinstance(valor, float):
+            raise ValueError
+        return int(valor), None
+    except (TypeError, ValueError):
+        return None, f"Campo '{campo}' deve ser um inteiro"
+
+
+def ler_nota(registro):
+    """
+    Extrai `(aluno_id, valor)` de um registro. Aceita números JSON ou, vindos
+    do CSV, os mesmos valores como texto. Retorna `(valores, erro)`.
+    """
+    if not isinstance(registro, dict):
+        return None, "Registro deve ser um objeto JSON"
+
+    aluno_id, valor = registro.get("aluno_id"), registro.get("valor")
+    if aluno_id in (None, "") or valor in (None, ""):
+        return None, "Campos obrigatórios: aluno_id, valor"
+
+    aluno_id, erro = ler_inteiro(aluno_id, "aluno_id")
+    if erro:
+        return None, erro
+
+    try:
+        if isinstance(valor, bool):
+            raise ValueError
+        valor = float(valor)
+        if not math.isfinite(valor):
+            raise ValueError
+    except (TypeError, ValueError):
+        return None, "Campo 'valor' deve ser um número"
+
+    return (aluno_id, valor), None
+
+
+def gravar_notas(atividade_id, notas):
+    """
+    Grava `notas` (`[(linha, aluno_id, valor)]`) da atividade em uma única
+    transação, com um único INSERT ... ON CONFLICT (aluno_id, atividade_id)
+    DO UPDATE: atualiza a nota que o aluno já tem na atividade ou cria uma
+    nova. Retorna `(criadas, atualizadas)` como listas de `{linha, id}`.
+    """
+    alunos = [aluno_id for _, aluno_id, _ in notas]
+    ja_avaliados = set()
+    for i in range(0, len(alunos), TAMANHO_LOTE_IN):
+        ja_avaliados.update(db.session.execute(
+            select(Nota.aluno_id).where(
+                Nota.atividade_id == atividade_id, Nota.aluno_id.in_(alunos[i:i + TAMANHO_LOTE_IN])
+            )
+        ).scalars())
+
+    inserir = insert(Nota).returning(Nota.id, Nota.aluno_id)
+    inserir = inserir.on_conflict_do_update(
+        index_elements=[Nota.aluno_id, Nota.atividade_id],
+        set_={"valor": inserir.excluded.valor},
+    )
+    ids = dict((aluno_id, id) for id, aluno_id in db.session.execute(
+        inserir,
+        [{"aluno_id": aluno_id, "atividade_id": atividade_id, "valor": valor} for _, aluno_id, valor in notas],
+    ))
+    # o INSERT em Core não passa pelo listener do ORM: os resumos são recalculados aqui
+    recalcular_resumos(db.session.connection(), aluno_ids=alunos, atividade_ids=[atividade_id])
+    db.session.commit()
+
+    criadas, atualizadas = [], []
+    for linha, aluno_id, _ in notas:
+        destino = atualizadas if aluno_id in ja_avaliados else criadas
+        destino.append({"linha": linha, "id": ids[aluno_id]})
+    return criadas, atualizadas
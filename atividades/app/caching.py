@@ -0,0 +1,109 @@
+# Módulo compartilhado: mantenha idêntico em reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class CacheTTL:
+    """LRU limitado em que cada entrada expira após o seu próprio TTL."""
+
+    def __init__(self, tamanho_maximo):
+        self.tamanho_maximo = tamanho_maximo
+        self._lock = threading.Lock()
+        self._itens = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirados = 0
+
+    def obter(self, chave):
+        """Retorna `(encontrado, valor)`."""
+        agora = time.monotonic()
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.misses += 1
+                return False, None
+            valor, expira_em = item
+            if expira_em <= agora:
+                del self._itens[chave]
+                self.expirados += 1
+                self.misses += 1
+                return False, None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            return True, valor
+
+    def guardar(self, chave, valor, ttl):
+        if self.tamanho_maximo <= 0 or ttl <= 0:
+            return
+        with self._lock:
+            self._itens[chave] = (valor, time.monotonic() + ttl)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+                self.evictions += 1
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+
+    def resumo(self):
+        with self._lock:
+            return {
+                "tamanho": len(self._itens),
+                "tamanho_maximo": self.tamanho_maximo,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirados": self.expirados,
+            }
+
+
+class SingleFlight:
+    """
+    Garante uma única chamada em andamento por chave: quem chega enquanto
+    a primeira chamada não terminou aguarda e reaproveita o mesmo resultado
+    (ou a mesma exceção).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._em_andamento = {}
+        self.executadas = 0
+        self.compartilhadas = 0
+
+    def executar(self, chave, funcao):
+        with self._lock:
+            futuro = self._em_andamento.get(chave)
+            lider = futuro is None
+            if lider:
+                futuro = self._em_andamento[chave] = Future()
+                self.executadas += 1
+            else:
+                self.compartilhadas += 1
+
+        if not lider:
+            return futuro.result()
+
+        try:
+            resultado = funcao()
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        else:
+            futuro.set_result(resultado)
+            return resultado
+        finally:
+            with self._lock:
+                del self._em_andamento[chave]
+
+    def resumo(self):
+        with self._lock:
+            return {
+                "em_andamento": len(self._em_andamento),
+                "executadas": self.executadas,
+                "compartilhadas": self.compartilhadas,
+            }
@@ -4,4 +4,22 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__))
 
 class Config:
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(BASE_DIR, 'atividades.db')
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # ajustes do SQLite aplicados em cada nova conexão (ver app/extensions.py)
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    # valor negativo = tamanho em KiB (padrão: 64 MiB por conexão)
+    SQLITE_CACHE_SIZE = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+
+    # perfil das consultas SQL (ver app/profiling.py); desligado por padrão
+    SQL_PROFILE = os.getenv("SQL_PROFILE", "0").lower() in ("1", "true", "sim", "yes")
+    SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+    # acima deste número de consultas em uma requisição, registra um aviso (0 desativa)
+    SQL_MAX_QUERIES = int(os.getenv("SQL_MAX_QUERIES", "50"))
+
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "connect_args": {"timeout": SQLITE_BUSY_TIMEOUT_MS / 1000},
+    }
@@ -1,14 +1,18 @@
 from flask import Blueprint, jsonify, request
+from app.bulk import gravar_notas, ler_nota, ler_registros
+from app.entidades import expandir
 from app.extensions import db
+from app.estatisticas import FAIXAS_MAXIMO, FAIXAS_PADRAO, estatisticas_notas
+from app.idempotency import idempotente
 from app.models.atividade import Atividade
+from app.models.nota import Nota
+from app.models.resumo import ResumoAtividade, resumo_vazio
+from app.query_filters import ParametroInvalido, aplicar_filtros, parametro_inteiro, parametro_lista
+from app.validacao import FalhaValidacao, existem, existem_em_lote
 import requests
-import os
 
 atividade_bp = Blueprint("atividades", __name__)
 
-# variáveis de ambiente definidas no docker-compose
-GERENCIAMENTO_URL = os.getenv("GERENCIAMENTO_URL", "http://localhost:8001/api")
-
 @atividade_bp.route("/", methods=["GET"])
 def listar_atividades():
     """
@@ -18,6 +22,24 @@ def listar_atividades():
       - Atividades
     summary: Lista todas as atividades
     description: Retorna uma lista com todas as atividades cadastradas.
+    parameters:
+      - in: query
+        name: professor_id
+        type: integer
+        required: false
+        description: Filtra pelas atividades do professor
+      - in: query
+        name: turma_id
+        type: integer
+        required: false
+        description: Filtra pelas atividades da turma
+      - in: query
+        name: expand
+        type: string
+        required: false
+        description: |
+          Recursos a embutir em cada atividade, separados por vírgula (`professor`, `turma`).
+          Os IDs da lista são resolvidos juntos, em uma única chamada ao gerenciamento.
     responses:
       200:
         description: Lista de atividades
@@ -25,6 +47,14 @@ def listar_atividades():
           type: array
           items:
             $ref: '#/definitions/Atividade'
+      400:
+        description: Parâmetros de filtro inválidos
+        schema:
+          $ref: '#/definitions/Error'
+      500:
+        description: Erro ao contatar serviço de gerenciamento (com `expand`)
+        schema:
+          $ref: '#/definitions/Error'
     definitions:
       Atividade:
         type: object
@@ -97,8 +127,18 @@ def listar_atividades():
             type: string
             example: Atividade 1 removida com sucesso
     """
-    atividades = Atividade.query.all()
-    return jsonify([a.to_dict() for a in atividades])
+    try:
+        query = aplicar_filtros(Atividade.query, Atividade, ["professor_id", "turma_id"])
+        expand = parametro_lista("expand", ["professor", "turma"])
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    atividades = [a.to_dict() for a in query.order_by(Atividade.id).all()]
+
+    try:
+        expandir(atividades, expand)
+    except requests.exceptions.RequestException:
+        return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento."}), 500
+    return jsonify(atividades)
 
 @atividade_bp.route("/<int:id>", methods=["GET"])
 def obter_atividade(id):
@@ -129,7 +169,264 @@ def obter_atividade(id):
         return jsonify({"erro": "Atividade não encontrada"}), 404
     return jsonify(atividade.to_dict()), 200
 
+@atividade_bp.route("/<int:id>/notas", methods=["GET"])
+def listar_notas_da_atividade(id):
+    """
+    Listar notas de uma atividade
+    ---
+    tags:
+      - Atividades
+    summary: Lista as notas lançadas para uma atividade
+    description: Consulta pelo índice de `notas.atividade_id`.
+    parameters:
+      - in: path
+        name: id
+        type: integer
+        required: true
+        description: ID da atividade
+    responses:
+      200:
+        description: Notas da atividade
+        schema:
+          type: array
+          items:
+            $ref: '#/definitions/Nota'
+      404:
+        description: Atividade não encontrada
+        schema:
+          $ref: '#/definitions/Error'
+    """
+    if not db.session.get(Atividade, id):
+        return jsonify({"erro": "Atividade não encontrada"}), 404
+    notas = Nota.query.filter(Nota.atividade_id == id).order_by(Nota.id).all()
+    return jsonify([n.to_dict() for n in notas]), 200
+
+@atividade_bp.route("/<int:id>/notas/lote", methods=["POST"])
+@idempotente
+def importar_notas(id):
+    """
+    Lançar notas de uma atividade em lote
+    ---
+    tags:
+      - Atividades
+    summary: Lança ou atualiza várias notas da atividade a partir de CSV ou NDJSON
+    description: |
+      Aceita CSV com cabeçalho `aluno_id,valor` (`Content-Type: text/csv`),
+      NDJSON (um objeto `{"aluno_id", "valor"}` por linha) ou um array JSON.
+      A atividade é validada uma vez e todos os alunos em uma única chamada ao
+      gerenciamento. Se o aluno já tem nota na atividade ela é atualizada; as
+      demais são criadas. Tudo é gravado em uma única transação. Linhas
+      inválidas não interrompem o lote e voltam em `erros` com o número da
+      linha (a partir de 1, sem contar o cabeçalho do CSV).
+    consumes:
+      - text/csv
+      - application/x-ndjson
+      - application/json
+    parameters:
+      - in: path
+        name: id
+        type: integer
+        required: true
+        description: ID da atividade
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: string
+          example: "aluno_id,valor\n1,8.5\n2,7.0"
+    responses:
+      201:
+        description: Ao menos uma nota foi gravada
+        schema:
+          $ref: '#/definitions/ResultadoLoteNotas'
+      400:
+        description: Corpo inválido ou nenhuma nota válida
+        schema:
+          $ref: '#/definitions/ResultadoLoteNotas'
+      404:
+        description: Atividade não encontrada
+        schema:
+          $ref: '#/definitions/Error'
+      500:
+        description: Erro ao contatar serviço de gerenciamento
+        schema:
+          $ref: '#/definitions/Error'
+    definitions:
+      ResultadoLoteNotas:
+        type: object
+        properties:
+          criadas:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 1
+                id:
+                  type: integer
+                  example: 15
+          atualizadas:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 2
+                id:
+                  type: integer
+                  example: 4
+          erros:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 3
+                erro:
+                  type: string
+                  example: Aluno 99 não encontrado.
+    """
+    if not db.session.get(Atividade, id):
+        return jsonify({"erro": "Atividade não encontrada"}), 404
+
+    try:
+        registros = ler_registros()
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    validas, erros = [], []
+    linha_do_aluno = {}
+    for linha, registro in enumerate(registros, start=1):
+        valores, erro = ler_nota(registro)
+        if valores and valores[0] in linha_do_aluno:
+            erro = f"Aluno {valores[0]} repetido (já informado na linha {linha_do_aluno[valores[0]]})"
+        if erro:
+            erros.append({"linha": linha, "erro": erro})
+            continue
+        linha_do_aluno[valores[0]] = linha
+        validas.append((linha, *valores))
+
+    try:
+        alunos = existem_em_lote("alunos", linha_do_aluno) if linha_do_aluno else {}
+    except requests.exceptions.RequestException:
+        return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento (alunos)."}), 500
+
+    notas = []
+    for linha, aluno_id, valor in validas:
+        if alunos[aluno_id]:
+            notas.append((linha, aluno_id, valor))
+        else:
+            erros.append({"linha": linha, "erro": f"Aluno {aluno_id} não encontrado."})
+
+    criadas, atualizadas = gravar_notas(id, notas) if notas else ([], [])
+    erros.sort(key=lambda e: e["linha"])
+    status = 201 if notas else 400
+    return jsonify({"criadas": criadas, "atualizadas": atualizadas, "erros": erros}), status
+
+@atividade_bp.route("/<int:id>/estatisticas", methods=["GET"])
+def estatisticas_da_atividade(id):
+    """
+    Estatísticas das notas de uma atividade
+    ---
+    tags:
+      - Atividades
+    summary: Quantidade, média, mínimo, máximo, desvio padrão, mediana, percentis e histograma das notas
+    description: Agregação feita no banco, sem carregar as notas uma a uma.
+    parameters:
+      - in: path
+        name: id
+        type: integer
+        required: true
+        description: ID da atividade
+      - in: query
+        name: faixas
+        type: integer
+        required: false
+        description: Número de faixas do histograma (padrão 10, máximo 100)
+    responses:
+      200:
+        description: Estatísticas calculadas
+        schema:
+          $ref: '#/definitions/EstatisticasNotas'
+      400:
+        description: Parâmetros inválidos
+        schema:
+          $ref: '#/definitions/Error'
+      404:
+        description: Atividade não encontrada
+        schema:
+          $ref: '#/definitions/Error'
+    """
+    try:
+        faixas = parametro_inteiro("faixas", 1) or FAIXAS_PADRAO
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    if not db.session.get(Atividade, id):
+        return jsonify({"erro": "Atividade não encontrada"}), 404
+    return jsonify(estatisticas_notas([Nota.atividade_id == id], min(faixas, FAIXAS_MAXIMO))), 200
+
+@atividade_bp.route("/<int:id>/resumo", methods=["GET"])
+def resumo_da_atividade(id):
+    """
+    Resumo das notas de uma atividade
+    ---
+    tags:
+      - Atividades
+    summary: Quantidade, soma, média, mínimo e máximo das notas da atividade
+    description: Lido da tabela de resumos, atualizada a cada nota gravada (uma leitura por chave).
+    parameters:
+      - in: path
+        name: id
+        type: integer
+        required: true
+        description: ID da atividade
+    responses:
+      200:
+        description: Resumo da atividade
+        schema:
+          $ref: '#/definitions/ResumoAtividade'
+      404:
+        description: Atividade não encontrada
+        schema:
+          $ref: '#/definitions/Error'
+    definitions:
+      ResumoAtividade:
+        type: object
+        properties:
+          atividade_id:
+            type: integer
+            example: 1
+          quantidade:
+            type: integer
+            example: 40
+          soma:
+            type: number
+            example: 294.0
+          media:
+            type: number
+            example: 7.35
+          minimo:
+            type: number
+            example: 2.5
+          maximo:
+            type: number
+            example: 10.0
+    """
+    if not db.session.get(Atividade, id):
+        return jsonify({"erro": "Atividade não encontrada"}), 404
+    resumo = db.session.get(ResumoAtividade, id)
+    return jsonify(resumo.to_dict() if resumo else resumo_vazio("atividade_id", id)), 200
+
 @atividade_bp.route("/", methods=["POST"])
+@idempotente
 def criar_atividade():
     """
     Criar nova atividade
@@ -140,6 +437,11 @@ def criar_atividade():
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
       - in: body
         name: body
         required: true
@@ -166,22 +468,20 @@ def criar_atividade():
 
     professor_id = data["professor_id"]
     turma_id = data["turma_id"]
+    for campo in ("professor_id", "turma_id"):
+        if type(data[campo]) is not int:
+            return jsonify({"erro": f"Campo '{campo}' deve ser um inteiro"}), 400
 
-    # valida professor
+    # professor e turma são independentes: valida os dois em paralelo
     try:
-        r_prof = requests.get(f"{GERENCIAMENTO_URL}/professores/{professor_id}")
-        if r_prof.status_code != 200:
-            return jsonify({"erro": f"Professor {professor_id} não encontrado."}), 400
-    except requests.exceptions.RequestException:
-        return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento (professores)."}), 500
+        existentes = existem([("professores", professor_id), ("turmas", turma_id)])
+    except FalhaValidacao as e:
+        return jsonify({"erro": f"Falha ao conectar ao serviço de gerenciamento ({e.entidade})."}), 500
 
-    # valida turma
-    try:
-        r_turma = requests.get(f"{GERENCIAMENTO_URL}/turmas/{turma_id}")
-        if r_turma.status_code != 200:
-            return jsonify({"erro": f"Turma {turma_id} não encontrada."}), 400
-    except requests.exceptions.RequestException:
-        return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento (turmas)."}), 500
+    if not existentes[("professores", professor_id)]:
+        return jsonify({"erro": f"Professor {professor_id} não encontrado."}), 400
+    if not existentes[("turmas", turma_id)]:
+        return jsonify({"erro": f"Turma {turma_id} não encontrada."}), 400
 
     nova = Atividade(
         titulo=data["titulo"],
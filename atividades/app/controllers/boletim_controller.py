@@ -0,0 +1,106 @@
+from flask import Blueprint, jsonify
+from app.entidades import resolver
+from app.extensions import db
+from app.models.atividade import Atividade
+from app.models.nota import Nota
+from app.models.resumo import ResumoAluno, resumo_vazio
+import requests
+
+boletim_bp = Blueprint("boletim", __name__)
+
+@boletim_bp.route("/boletim/aluno/<int:aluno_id>", methods=["GET"])
+def boletim_do_aluno(aluno_id):
+    """
+    Boletim do aluno
+    ---
+    tags:
+      - Boletim
+    summary: Todas as notas do aluno com a atividade, o professor e a turma
+    description: |
+      As notas e as atividades vêm de uma única consulta indexada por
+      `aluno_id`. O aluno, os professores e as turmas são buscados no
+      gerenciamento em uma única chamada em lote, com cache.
+    parameters:
+      - in: path
+        name: aluno_id
+        type: integer
+        required: true
+        description: ID do aluno
+    responses:
+      200:
+        description: Boletim do aluno
+        schema:
+          type: object
+          properties:
+            aluno:
+              type: object
+              example: {"id": 3, "nome": "Carla", "turma_id": 1}
+            resumo:
+              type: object
+              example: {"aluno_id": 3, "quantidade": 2, "soma": 17.5, "media": 8.75, "minimo": 8.0, "maximo": 9.5}
+            notas:
+              type: array
+              items:
+                type: object
+                properties:
+                  id:
+                    type: integer
+                    example: 1
+                  valor:
+                    type: number
+                    example: 9.5
+                  atividade:
+                    type: object
+                    example: {"id": 1, "titulo": "Prova de Matemática"}
+                  professor:
+                    type: object
+                    example: {"id": 1, "nome": "Ana", "materia": "Matemática"}
+                  turma:
+                    type: object
+                    example: {"id": 1, "nome": "Turma A", "professor_id": 1}
+      404:
+        description: Aluno não encontrado
+        schema:
+          $ref: '#/definitions/Error'
+      500:
+        description: Erro ao contatar serviço de gerenciamento
+        schema:
+          $ref: '#/definitions/Error'
+    """
+    linhas = db.session.execute(
+        db.select(
+            Nota.id, Nota.valor, Atividade.id, Atividade.titulo, Atividade.professor_id, Atividade.turma_id
+        )
+        .join(Atividade, Atividade.id == Nota.atividade_id)
+        .where(Nota.aluno_id == aluno_id)
+        .order_by(Atividade.id)
+    ).all()
+
+    try:
+        entidades = resolver({
+            "alunos": [aluno_id],
+            "professores": [linha[4] for linha in linhas],
+            "turmas": [linha[5] for linha in linhas],
+        })
+    except requests.exceptions.RequestException:
+        return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento."}), 500
+
+    aluno = entidades["alunos"][aluno_id]
+    if aluno is None:
+        return jsonify({"erro": f"Aluno {aluno_id} não encontrado."}), 404
+
+    resumo = db.session.get(ResumoAluno, aluno_id)
+    return jsonify({
+        "aluno": aluno,
+        "resumo": resumo.to_dict() if resumo else resumo_vazio("aluno_id", aluno_id),
+        "notas": [
+            {
+                "id": nota_id,
+                "valor": valor,
+                "atividade": {"id": atividade_id, "titulo": titulo},
+                "professor": entidades["professores"][professor_id],
+                "turma": entidades["turmas"][turma_id],
+            }
+            for nota_id, valor, atividade_id, titulo, professor_id, turma_id in linhas
+        ],
+    }), 200
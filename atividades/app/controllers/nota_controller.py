@@ -1,14 +1,19 @@
 from flask import Blueprint, jsonify, request
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import IntegrityError
+from app.bulk import ler_inteiro, ler_nota
 from app.extensions import db
+from app.idempotency import idempotente
 from app.models.nota import Nota
 from app.models.atividade import Atividade
+from app.models.resumo import ResumoAluno, recalcular_resumos, resumo_vazio
+from app.estatisticas import FAIXAS_MAXIMO, FAIXAS_PADRAO, estatisticas_notas
+from app.query_filters import ParametroInvalido, aplicar_filtros, parametro_inteiro
+from app.validacao import existe
 import requests
-import os
 
 nota_bp = Blueprint("notas", __name__)
 
-GERENCIAMENTO_URL = os.getenv("GERENCIAMENTO_URL", "http://localhost:8001/api")
-
 # 🔹 Listar todas as notas
 @nota_bp.route("/", methods=["GET"])
 def listar_notas():
@@ -19,6 +24,17 @@ def listar_notas():
       - Notas
     summary: Lista todas as notas
     description: Retorna uma lista com todas as notas cadastradas.
+    parameters:
+      - in: query
+        name: aluno_id
+        type: integer
+        required: false
+        description: Filtra pelas notas do aluno
+      - in: query
+        name: atividade_id
+        type: integer
+        required: false
+        description: Filtra pelas notas da atividade
     responses:
       200:
         description: Lista de notas
@@ -26,6 +42,10 @@ def listar_notas():
           type: array
           items:
             $ref: '#/definitions/Nota'
+      400:
+        description: Parâmetros de filtro inválidos
+        schema:
+          $ref: '#/definitions/Error'
     definitions:
       Nota:
         type: object
@@ -80,9 +100,159 @@ def listar_notas():
             type: string
             example: Nota 1 removida com sucesso
     """
-    notas = Nota.query.all()
+    try:
+        query = aplicar_filtros(Nota.query, Nota, ["aluno_id", "atividade_id"])
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    notas = query.order_by(Nota.id).all()
     return jsonify([n.to_dict() for n in notas]), 200
 
+# 🔹 Estatísticas das notas
+@nota_bp.route("/estatisticas", methods=["GET"])
+def estatisticas():
+    """
+    Estatísticas das notas
+    ---
+    tags:
+      - Notas
+    summary: Calcula estatísticas das notas (quantidade, média, desvio, percentis, histograma)
+    description: |
+      Agregação feita no banco, sem carregar as notas uma a uma. Sem filtros,
+      considera todas as notas.
+    parameters:
+      - in: query
+        name: turma_id
+        type: integer
+        required: false
+        description: Considera apenas as notas das atividades da turma
+      - in: query
+        name: aluno_id
+        type: integer
+        required: false
+        description: Considera apenas as notas do aluno
+      - in: query
+        name: atividade_id
+        type: integer
+        required: false
+        description: Considera apenas as notas da atividade
+      - in: query
+        name: faixas
+        type: integer
+        required: false
+        description: Número de faixas do histograma (padrão 10, máximo 100)
+    responses:
+      200:
+        description: Estatísticas calculadas
+        schema:
+          $ref: '#/definitions/EstatisticasNotas'
+      400:
+        description: Parâmetros inválidos
+        schema:
+          $ref: '#/definitions/Error'
+    definitions:
+      EstatisticasNotas:
+        type: object
+        properties:
+          quantidade:
+            type: integer
+            example: 40
+          media:
+            type: number
+            example: 7.35
+          minimo:
+            type: number
+            example: 2.5
+          maximo:
+            type: number
+            example: 10.0
+          desvio_padrao:
+            type: number
+            example: 1.82
+          mediana:
+            type: number
+            example: 7.5
+          percentis:
+            type: object
+            additionalProperties:
+              type: number
+            example: {"p10": 4.9, "p25": 6.0, "p50": 7.5, "p75": 8.75, "p90": 9.5}
+          histograma:
+            type: array
+            items:
+              type: object
+              properties:
+                de:
+                  type: number
+                  example: 2.5
+                ate:
+                  type: number
+                  example: 3.25
+                quantidade:
+                  type: integer
+                  example: 1
+    """
+    try:
+        turma_id = parametro_inteiro("turma_id")
+        aluno_id = parametro_inteiro("aluno_id")
+        atividade_id = parametro_inteiro("atividade_id")
+        faixas = parametro_inteiro("faixas", 1) or FAIXAS_PADRAO
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+
+    filtros = []
+    if turma_id is not None:
+        filtros.append(Nota.atividade_id.in_(db.select(Atividade.id).where(Atividade.turma_id == turma_id)))
+    if aluno_id is not None:
+        filtros.append(Nota.aluno_id == aluno_id)
+    if atividade_id is not None:
+        filtros.append(Nota.atividade_id == atividade_id)
+
+    return jsonify(estatisticas_notas(filtros, min(faixas, FAIXAS_MAXIMO))), 200
+
+# 🔹 Resumo das notas de um aluno
+@nota_bp.route("/resumo/aluno/<int:aluno_id>", methods=["GET"])
+def resumo_do_aluno(aluno_id):
+    """
+    Resumo das notas de um aluno
+    ---
+    tags:
+      - Notas
+    summary: Quantidade, soma, média, mínimo e máximo das notas do aluno
+    description: Lido da tabela de resumos, atualizada a cada nota gravada (uma leitura por chave).
+    parameters:
+      - in: path
+        name: aluno_id
+        type: integer
+        required: true
+        description: ID do aluno
+    responses:
+      200:
+        description: Resumo do aluno (quantidade 0 se ainda não houver notas)
+        schema:
+          type: object
+          properties:
+            aluno_id:
+              type: integer
+              example: 3
+            quantidade:
+              type: integer
+              example: 12
+            soma:
+              type: number
+              example: 90.5
+            media:
+              type: number
+              example: 7.5417
+            minimo:
+              type: number
+              example: 4.0
+            maximo:
+              type: number
+              example: 10.0
+    """
+    resumo = db.session.get(ResumoAluno, aluno_id)
+    return jsonify(resumo.to_dict() if resumo else resumo_vazio("aluno_id", aluno_id)), 200
+
 # 🔹 Buscar nota por ID
 @nota_bp.route("/<int:id>", methods=["GET"])
 def obter_nota(id):
@@ -114,6 +284,7 @@ def obter_nota(id):
     return jsonify(nota.to_dict()), 200
 
 @nota_bp.route("/", methods=["POST"])
+@idempotente
 def criar_nota():
     """
     Criar nova nota
@@ -124,6 +295,11 @@ def criar_nota():
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
       - in: body
         name: body
         required: true
@@ -138,6 +314,10 @@ def criar_nota():
         description: Validação falhou (campos obrigatórios/IDs inválidos)
         schema:
           $ref: '#/definitions/Error'
+      409:
+        description: O aluno já tem nota nesta atividade
+        schema:
+          $ref: '#/definitions/Error'
       500:
         description: Erro ao contatar serviço de gerenciamento
         schema:
@@ -149,13 +329,17 @@ def criar_nota():
     if not data or not all(c in data for c in campos):
         return jsonify({"erro": f"Campos obrigatórios: {', '.join(campos)}"}), 400
 
-    aluno_id = data["aluno_id"]
-    atividade_id = data["atividade_id"]
+    valores, erro = ler_nota(data)
+    if erro:
+        return jsonify({"erro": erro}), 400
+    aluno_id, valor = valores
+    atividade_id, erro = ler_inteiro(data["atividade_id"], "atividade_id")
+    if erro:
+        return jsonify({"erro": erro}), 400
 
     # valida aluno (no Gerenciamento)
     try:
-        r_aluno = requests.get(f"{GERENCIAMENTO_URL}/alunos/{aluno_id}")
-        if r_aluno.status_code != 200:
+        if not existe("alunos", aluno_id):
             return jsonify({"erro": f"Aluno {aluno_id} não encontrado."}), 400
     except requests.exceptions.RequestException:
         return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento (alunos)."}), 500
@@ -166,14 +350,92 @@ def criar_nota():
         return jsonify({"erro": f"Atividade {atividade_id} não encontrada."}), 400
 
     nova = Nota(
-        valor=data["valor"],
+        valor=valor,
         aluno_id=aluno_id,
         atividade_id=atividade_id
     )
     db.session.add(nova)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        existente = Nota.query.filter_by(aluno_id=aluno_id, atividade_id=atividade_id).first()
+        return jsonify({
+            "erro": f"Aluno {aluno_id} já tem nota na atividade {atividade_id}. Use PUT /api/notas/upsert para regravá-la.",
+            "nota_id": existente.id if existente else None,
+        }), 409
     return jsonify(nova.to_dict()), 201
 
+@nota_bp.route("/upsert", methods=["PUT"])
+def gravar_nota():
+    """
+    Criar ou substituir a nota de um aluno em uma atividade
+    ---
+    tags:
+      - Notas
+    summary: Grava a nota do aluno na atividade, criando-a ou substituindo a existente
+    description: |
+      Um único `INSERT ... ON CONFLICT (aluno_id, atividade_id) DO UPDATE`:
+      regravar uma nota não exige buscar, remover e recriar o registro.
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          $ref: '#/definitions/NotaInput'
+    responses:
+      200:
+        description: Nota gravada
+        schema:
+          $ref: '#/definitions/Nota'
+      400:
+        description: Validação falhou (campos obrigatórios/IDs inválidos)
+        schema:
+          $ref: '#/definitions/Error'
+      500:
+        description: Erro ao contatar serviço de gerenciamento
+        schema:
+          $ref: '#/definitions/Error'
+    """
+    data = request.get_json(silent=True)
+    campos = ["valor", "aluno_id", "atividade_id"]
+
+    if not data or not all(c in data for c in campos):
+        return jsonify({"erro": f"Campos obrigatórios: {', '.join(campos)}"}), 400
+
+    valores, erro = ler_nota(data)
+    if erro:
+        return jsonify({"erro": erro}), 400
+    aluno_id, valor = valores
+    atividade_id, erro = ler_inteiro(data["atividade_id"], "atividade_id")
+    if erro:
+        return jsonify({"erro": erro}), 400
+
+    try:
+        if not existe("alunos", aluno_id):
+            return jsonify({"erro": f"Aluno {aluno_id} não encontrado."}), 400
+    except requests.exceptions.RequestException:
+        return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento (alunos)."}), 500
+
+    if not db.session.get(Atividade, atividade_id):
+        return jsonify({"erro": f"Atividade {atividade_id} não encontrada."}), 400
+
+    gravar = insert(Nota).values(valor=valor, aluno_id=aluno_id, atividade_id=atividade_id)
+    gravar = gravar.on_conflict_do_update(
+        index_elements=[Nota.aluno_id, Nota.atividade_id],
+        set_={"valor": gravar.excluded.valor},
+    ).returning(Nota.id)
+    id = db.session.execute(gravar).scalar_one()
+    # o INSERT em Core não passa pelo listener do ORM: os resumos são recalculados aqui
+    recalcular_resumos(db.session.connection(), aluno_ids=[aluno_id], atividade_ids=[atividade_id])
+    # responde com a linha gravada, no mesmo formato do GET
+    nota = db.session.get(Nota, id, populate_existing=True).to_dict()
+    db.session.commit()
+
+    return jsonify(nota), 200
+
 # 🔹 Atualizar nota
 @nota_bp.route("/<int:id>", methods=["PUT"])
 def atualizar_nota(id):
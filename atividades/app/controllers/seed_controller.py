@@ -79,8 +79,10 @@ def seed_data():
     atv1 = Atividade(titulo="Prova de Matemática", descricao="Geometria Espacial", nota=8.5, professor_id=1, turma_id=1)
     atv2 = Atividade(titulo="Redação", descricao="Tema: Meio Ambiente", nota=9.0, professor_id=2, turma_id=2)
 
-    db.session.add_all([atv1, atv2])
-    db.session.commit()
+    # flush (e não commit) entre as etapas: os IDs ficam disponíveis sem expirar os objetos
+    atividades = [atv1, atv2]
+    db.session.add_all(atividades)
+    db.session.flush()
 
     notas = [
         Nota(valor=9.5, aluno_id=1, atividade_id=atv1.id),
@@ -88,10 +90,13 @@ def seed_data():
         Nota(valor=9.8, aluno_id=3, atividade_id=atv2.id),
     ]
     db.session.add_all(notas)
-    db.session.commit()
+    db.session.flush()
 
-    return jsonify({
+    # serializa antes do commit, que expiraria os objetos e obrigaria a relê-los do banco
+    resposta = {
         "message": "Banco de atividades e notas populado!",
-        "atividades": [a.to_dict() for a in Atividade.query.all()],
-        "notas": [n.to_dict() for n in Nota.query.all()]
-    }), 201
+        "atividades": [a.to_dict() for a in atividades],
+        "notas": [n.to_dict() for n in notas]
+    }
+    db.session.commit()
+    return jsonify(resposta), 201
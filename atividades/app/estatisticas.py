@@ -0,0 +1,97 @@
+import math
+
+from sqlalchemy import Integer, cast, func, select
+
+from app.extensions import db
+from app.models.nota import Nota
+
+PERCENTIS = (10, 25, 50, 75, 90)
+FAIXAS_PADRAO = 10
+FAIXAS_MAXIMO = 100
+
+
+def _percentis(filtros, quantidade):
+    """
+    Percentis por interpolação linear entre as posições vizinhas. Uma única
+    consulta numera as notas ordenadas (`row_number`) e devolve apenas as
+    posições necessárias, sem trazer as demais linhas.
+    """
+    alvos = {}
+    for p in PERCENTIS:
+        h = (quantidade - 1) * p / 100
+        alvos[p] = (h, math.floor(h), math.ceil(h))
+    posicoes = {pos for _, baixo, alto in alvos.values() for pos in (baixo, alto)}
+
+    ordenadas = select(
+        Nota.valor,
+        (func.row_number().over(order_by=Nota.valor) - 1).label("pos"),
+    ).where(*filtros).subquery()
+    valores = dict(db.session.execute(
+        select(ordenadas.c.pos, ordenadas.c.valor).where(ordenadas.c.pos.in_(posicoes))
+    ).all())
+
+    return {
+        f"p{p}": valores[baixo] + (h - baixo) * (valores[alto] - valores[baixo])
+        for p, (h, baixo, alto) in alvos.items()
+    }
+
+
+def _histograma(filtros, minimo, maximo, faixas):
+    """Faixas de mesma largura entre `minimo` e `maximo`, contadas com GROUP BY."""
+    if maximo == minimo:
+        faixas = 1
+    largura = (maximo - minimo) / faixas or 1
+    faixa = func.min(cast((Nota.valor - minimo) / largura, Integer), faixas - 1).label("faixa")
+    contagens = dict(db.session.execute(
+        select(faixa, func.count()).where(*filtros).group_by(faixa)
+    ).all())
+
+    return [
+        {
+            "de": round(minimo + i * largura, 4),
+            "ate": round(maximo if i == faixas - 1 else minimo + (i + 1) * largura, 4),
+            "quantidade": contagens.get(i, 0),
+        }
+        for i in range(faixas)
+    ]
+
+
+def estatisticas_notas(filtros, faixas=FAIXAS_PADRAO):
+    """
+    Estatísticas de `Nota.valor` para as notas que satisfazem `filtros`
+    (expressões SQLAlchemy). Toda a agregação roda no SQLite: nenhuma
+    nota é carregada como objeto do ORM.
+    """
+    quantidade, media, minimo, maximo = db.session.execute(
+        select(func.count(Nota.id), func.avg(Nota.valor), func.min(Nota.valor), func.max(Nota.valor))
+        .where(*filtros)
+    ).one()
+
+    if not quantidade:
+        return {
+            "quantidade": 0,
+            "media": None,
+            "minimo": None,
+            "maximo": None,
+            "desvio_padrao": None,
+            "mediana": None,
+            "percentis": {},
+            "histograma": [],
+        }
+
+    # segunda passada sobre os desvios: evita a perda de precisão de avg(v²) - avg(v)²
+    variancia = db.session.execute(
+        select(func.avg((Nota.valor - media) * (Nota.valor - media))).where(*filtros)
+    ).scalar_one()
+    percentis = _percentis(filtros, quantidade)
+
+    return {
+        "quantidade": quantidade,
+        "media": round(media, 4),
+        "minimo": minimo,
+        "maximo": maximo,
+        "desvio_padrao": round(math.sqrt(variancia), 4),
+        "mediana": round(percentis["p50"], 4),
+        "percentis": {nome: round(valor, 4) for nome, valor in percentis.items()},
+        "histograma": _histograma(filtros, minimo, maximo, faixas),
+    }
@@ -1,2 +1,63 @@
+# Módulo compartilhado: mantenha idêntico em gerenciamento/, reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+import logging
+
 from flask_sqlalchemy import SQLAlchemy
-db = SQLAlchemy()
\ No newline at end of file
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+db = SQLAlchemy()
+
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+logger = logging.getLogger(__name__)
+
+
+def configurar_sqlite(app):
+    """
+    Registra os PRAGMAs do SQLite (WAL, synchronous, busy_timeout, mmap_size,
+    cache_size) para toda conexão aberta pelo engine da aplicação.
+    """
+    journal_mode = app.config["SQLITE_JOURNAL_MODE"].upper()
+    synchronous = app.config["SQLITE_SYNCHRONOUS"].upper()
+    if journal_mode not in JOURNAL_MODES:
+        raise ValueError(f"SQLITE_JOURNAL_MODE inválido: {journal_mode}")
+    if synchronous not in SYNCHRONOUS:
+        raise ValueError(f"SQLITE_SYNCHRONOUS inválido: {synchronous}")
+
+    pragmas = [
+        f"PRAGMA journal_mode={journal_mode}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA mmap_size={int(app.config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA cache_size={int(app.config['SQLITE_CACHE_SIZE'])}",
+    ]
+
+    def aplicar_pragmas(conexao_dbapi, connection_record):
+        cursor = conexao_dbapi.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    with app.app_context():
+        if db.engine.dialect.name == "sqlite":
+            event.listen(db.engine, "connect", aplicar_pragmas)
+
+
+def criar_indices_faltantes():
+    """
+    `create_all` não altera tabelas que já existem; cria aqui os índices
+    declarados nos models que ainda não estão no banco. Se os dados atuais
+    violarem um índice único, a subida falha: seguir sem ele desligaria a
+    restrição em silêncio. As migrações do serviço devem resolver as
+    duplicatas antes desta chamada.
+    """
+    for tabela in db.metadata.sorted_tables:
+        for indice in tabela.indexes:
+            try:
+                indice.create(db.engine, checkfirst=True)
+            except IntegrityError as e:
+                raise RuntimeError(
+                    f"Índice {indice.name} não pôde ser criado: dados existentes violam a restrição ({e.orig})"
+                ) from e
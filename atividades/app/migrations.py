@@ -0,0 +1,43 @@
+import logging
+
+from app.extensions import db
+from app.models.resumo import recalcular_resumos
+
+logger = logging.getLogger(__name__)
+
+
+def deduplicar_notas():
+    """
+    Prepara `notas` para o índice único (aluno_id, atividade_id): quando um
+    aluno tem mais de uma nota na mesma atividade, mantém a mais recente (maior
+    id) e move as demais para `notas_duplicadas`. Os resumos dos alunos e
+    atividades afetados são recalculados. Também remove o índice simples de
+    `aluno_id`, substituído pelo índice composto.
+    """
+    conexao = db.session.connection()
+    conexao.exec_driver_sql("DROP INDEX IF EXISTS ix_notas_aluno_id")
+
+    duplicadas = conexao.exec_driver_sql(
+        "SELECT id, aluno_id, atividade_id FROM notas WHERE id NOT IN "
+        "(SELECT MAX(id) FROM notas GROUP BY aluno_id, atividade_id)"
+    ).all()
+
+    if duplicadas:
+        ids = [id for id, _, _ in duplicadas]
+        marcadores = ", ".join("?" for _ in ids)
+        conexao.exec_driver_sql("CREATE TABLE IF NOT EXISTS notas_duplicadas AS SELECT * FROM notas WHERE 0")
+        conexao.exec_driver_sql(
+            f"INSERT INTO notas_duplicadas SELECT * FROM notas WHERE id IN ({marcadores})", tuple(ids)
+        )
+        conexao.exec_driver_sql(f"DELETE FROM notas WHERE id IN ({marcadores})", tuple(ids))
+        recalcular_resumos(
+            conexao,
+            aluno_ids=[aluno_id for _, aluno_id, _ in duplicadas],
+            atividade_ids=[atividade_id for _, _, atividade_id in duplicadas],
+        )
+        logger.warning(
+            "%d nota(s) duplicada(s) de um mesmo aluno/atividade movida(s) para notas_duplicadas: %s",
+            len(ids), ids
+        )
+
+    db.session.commit()
@@ -7,8 +7,8 @@ class Atividade(db.Model):
     titulo = db.Column(db.String(100), nullable=False)
     descricao = db.Column(db.String(255))
     nota = db.Column(db.Float)
-    professor_id = db.Column(db.Integer, nullable=False)
-    turma_id = db.Column(db.Integer, nullable=False)
+    professor_id = db.Column(db.Integer, nullable=False, index=True)
+    turma_id = db.Column(db.Integer, nullable=False, index=True)
 
     def to_dict(self):
         return {
@@ -2,11 +2,15 @@ from app.extensions import db
 
 class Nota(db.Model):
     __tablename__ = "notas"
+    __table_args__ = (
+        # uma nota por aluno em cada atividade; atende também os filtros por aluno_id
+        db.Index("ux_notas_aluno_atividade", "aluno_id", "atividade_id", unique=True),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     valor = db.Column(db.Float, nullable=False)
     aluno_id = db.Column(db.Integer, nullable=False)
-    atividade_id = db.Column(db.Integer, nullable=False)
+    atividade_id = db.Column(db.Integer, nullable=False, index=True)
 
     def to_dict(self):
         return {
@@ -0,0 +1,182 @@
+from sqlalchemy import delete, event, func, inspect, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.nota import Nota
+
+
+class ResumoAluno(db.Model):
+    """Soma, quantidade, mínimo e máximo das notas de cada aluno, mantidos a cada escrita."""
+
+    __tablename__ = "resumos_aluno"
+
+    aluno_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    soma = db.Column(db.Float, nullable=False, default=0)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+    minimo = db.Column(db.Float)
+    maximo = db.Column(db.Float)
+
+    def to_dict(self):
+        return {"aluno_id": self.aluno_id, **_valores(self)}
+
+
+class ResumoAtividade(db.Model):
+    """Soma, quantidade, mínimo e máximo das notas de cada atividade, mantidos a cada escrita."""
+
+    __tablename__ = "resumos_atividade"
+
+    atividade_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    soma = db.Column(db.Float, nullable=False, default=0)
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+    minimo = db.Column(db.Float)
+    maximo = db.Column(db.Float)
+
+    def to_dict(self):
+        return {"atividade_id": self.atividade_id, **_valores(self)}
+
+
+# (model do resumo, coluna de Nota que o identifica)
+RESUMOS = ((ResumoAluno, "aluno_id"), (ResumoAtividade, "atividade_id"))
+TAMANHO_LOTE_IN = 500
+
+
+def _valores(resumo):
+    quantidade = resumo.quantidade if resumo else 0
+    return {
+        "quantidade": quantidade,
+        "soma": round(resumo.soma, 4) if quantidade else 0,
+        "media": round(resumo.soma / quantidade, 4) if quantidade else None,
+        "minimo": resumo.minimo if quantidade else None,
+        "maximo": resumo.maximo if quantidade else None,
+    }
+
+
+def resumo_vazio(campo, id):
+    """Formato devolvido para um aluno/atividade que ainda não tem notas."""
+    return {campo: id, **_valores(None)}
+
+
+def somar_nota(conexao, aluno_id, atividade_id, valor):
+    """Acrescenta `valor` aos resumos do aluno e da atividade (upsert, O(1))."""
+    ids = {"aluno_id": aluno_id, "atividade_id": atividade_id}
+    for modelo, campo in RESUMOS:
+        tabela = modelo.__table__
+        conexao.execute(
+            insert(tabela)
+            .values({campo: ids[campo], "soma": valor, "quantidade": 1, "minimo": valor, "maximo": valor})
+            .on_conflict_do_update(
+                index_elements=[campo],
+                set_={
+                    "soma": tabela.c.soma + valor,
+                    "quantidade": tabela.c.quantidade + 1,
+                    "minimo": func.min(tabela.c.minimo, valor),
+                    "maximo": func.max(tabela.c.maximo, valor),
+                },
+            )
+        )
+
+
+def subtrair_nota(conexao, aluno_id, atividade_id, valor):
+    """
+    Retira `valor` dos resumos do aluno e da atividade. Deve ser chamada com
+    a remoção/alteração da nota já enviada ao banco: só quando `valor` era o
+    mínimo ou o máximo é preciso reler as notas (pelo índice da coluna).
+    """
+    ids = {"aluno_id": aluno_id, "atividade_id": atividade_id}
+    for modelo, campo in RESUMOS:
+        tabela = modelo.__table__
+        id = ids[campo]
+        conexao.execute(
+            update(tabela)
+            .where(tabela.c[campo] == id)
+            .values(soma=tabela.c.soma - valor, quantidade=tabela.c.quantidade - 1)
+        )
+        linha = conexao.execute(
+            select(tabela.c.quantidade, tabela.c.minimo, tabela.c.maximo).where(tabela.c[campo] == id)
+        ).first()
+        if linha is None:
+            continue
+        if linha.quantidade <= 0:
+            conexao.execute(delete(tabela).where(tabela.c[campo] == id))
+        elif valor <= linha.minimo or valor >= linha.maximo:
+            coluna = Nota.__table__.c[campo]
+            minimo, maximo = conexao.execute(
+                select(func.min(Nota.__table__.c.valor), func.max(Nota.__table__.c.valor)).where(coluna == id)
+            ).one()
+            conexao.execute(update(tabela).where(tabela.c[campo] == id).values(minimo=minimo, maximo=maximo))
+
+
+def recalcular_resumos(conexao, aluno_ids=None, atividade_ids=None):
+    """
+    Recalcula a partir das notas os resumos dos IDs informados, ou de todos
+    quando ambos forem None. Usado pelas escritas em lote e pela reconstrução.
+    """
+    notas = Nota.__table__
+    todos = aluno_ids is None and atividade_ids is None
+    for (modelo, campo), ids in zip(RESUMOS, (aluno_ids, atividade_ids)):
+        if not todos and not ids:
+            continue
+        tabela = modelo.__table__
+        coluna = notas.c[campo]
+        agregados = select(
+            coluna, func.sum(notas.c.valor), func.count(), func.min(notas.c.valor), func.max(notas.c.valor)
+        ).group_by(coluna)
+
+        if todos:
+            lotes = [(delete(tabela), agregados)]
+        else:
+            ids = list(set(ids))
+            lotes = [
+                (delete(tabela).where(tabela.c[campo].in_(lote)), agregados.where(coluna.in_(lote)))
+                for lote in (ids[i:i + TAMANHO_LOTE_IN] for i in range(0, len(ids), TAMANHO_LOTE_IN))
+            ]
+
+        for remover, selecionar in lotes:
+            conexao.execute(remover)
+            conexao.execute(
+                insert(tabela).from_select([campo, "soma", "quantidade", "minimo", "maximo"], selecionar)
+            )
+
+
+def reconstruir_resumos():
+    """Recalcula todos os resumos do zero e confirma a transação."""
+    recalcular_resumos(db.session.connection())
+    db.session.commit()
+
+
+def preencher_resumos():
+    """Na subida, constrói os resumos de bancos que já tinham notas antes deles."""
+    if db.session.query(ResumoAtividade.atividade_id).first() is None and \
+            db.session.query(Nota.id).first() is not None:
+        reconstruir_resumos()
+
+
+def _anterior(obj, campo):
+    historico = inspect(obj).attrs[campo].history
+    return historico.deleted[0] if historico.deleted else getattr(obj, campo)
+
+
+@event.listens_for(Session, "after_flush")
+def _atualizar_resumos_do_flush(session, flush_context):
+    somar, subtrair = [], []
+    for obj in session.new:
+        if isinstance(obj, Nota):
+            somar.append((obj.aluno_id, obj.atividade_id, obj.valor))
+    for obj in session.deleted:
+        if isinstance(obj, Nota):
+            subtrair.append((_anterior(obj, "aluno_id"), _anterior(obj, "atividade_id"), _anterior(obj, "valor")))
+    for obj in session.dirty:
+        if isinstance(obj, Nota) and session.is_modified(obj, include_collections=False):
+            antes = (_anterior(obj, "aluno_id"), _anterior(obj, "atividade_id"), _anterior(obj, "valor"))
+            depois = (obj.aluno_id, obj.atividade_id, obj.valor)
+            if antes != depois:
+                subtrair.append(antes)
+                somar.append(depois)
+
+    if somar or subtrair:
+        conexao = session.connection()
+        for nota in subtrair:
+            subtrair_nota(conexao, *nota)
+        for nota in somar:
+            somar_nota(conexao, *nota)
@@ -0,0 +1,84 @@
+# Módulo compartilhado: mantenha idêntico em gerenciamento/, reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+import logging
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from app.extensions import db
+
+TAMANHO_MAXIMO_PARAMETROS = 500
+
+logger = logging.getLogger(__name__)
+
+
+def _origem():
+    if has_request_context():
+        rota = request.url_rule.rule if request.url_rule else request.path
+        return f"{request.method} {rota}"
+    return "<fora de requisição>"
+
+
+def _parametros(parametros):
+    texto = repr(parametros)
+    if len(texto) > TAMANHO_MAXIMO_PARAMETROS:
+        texto = texto[:TAMANHO_MAXIMO_PARAMETROS] + "..."
+    return texto
+
+
+def configurar_profiling(app):
+    """
+    Perfil das consultas SQL, ativado por SQL_PROFILE:
+
+      - conta as consultas e soma o tempo no banco de cada requisição; em modo
+        debug, envia os totais nos headers `X-DB-Queries` e `X-DB-Time-ms`;
+      - registra no log, com parâmetros e rota de origem, toda consulta que
+        demorar mais que SQL_SLOW_QUERY_MS;
+      - avisa quando uma requisição passa de SQL_MAX_QUERIES consultas, sinal
+        típico de N+1.
+    """
+    if not app.config["SQL_PROFILE"]:
+        return
+
+    limite_lenta = app.config["SQL_SLOW_QUERY_MS"] / 1000
+    maximo_consultas = app.config["SQL_MAX_QUERIES"]
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _iniciar_consulta(conexao, cursor, statement, parameters, context, executemany):
+        context.profiling_inicio = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _encerrar_consulta(conexao, cursor, statement, parameters, context, executemany):
+        duracao = time.perf_counter() - context.profiling_inicio
+        if has_request_context():
+            perfil = g.get("perfil_sql")
+            if perfil is not None:
+                perfil["consultas"] += 1
+                perfil["tempo"] += duracao
+        if duracao >= limite_lenta:
+            logger.warning(
+                "Consulta lenta (%.1f ms) em %s: %s | parâmetros: %s",
+                duracao * 1000, _origem(), statement, _parametros(parameters)
+            )
+
+    @app.before_request
+    def _iniciar_perfil():
+        g.perfil_sql = {"consultas": 0, "tempo": 0.0}
+
+    @app.after_request
+    def _encerrar_perfil(resposta):
+        perfil = g.pop("perfil_sql", None)
+        if perfil is None:
+            return resposta
+        if maximo_consultas and perfil["consultas"] > maximo_consultas:
+            logger.warning(
+                "%s executou %d consultas SQL (limite %d): possível N+1",
+                _origem(), perfil["consultas"], maximo_consultas
+            )
+        if app.debug:
+            resposta.headers["X-DB-Queries"] = str(perfil["consultas"])
+            resposta.headers["X-DB-Time-ms"] = f"{perfil['tempo'] * 1000:.1f}"
+        return resposta
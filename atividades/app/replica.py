@@ -0,0 +1,169 @@
+# Módulo compartilhado: mantenha idêntico em reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.dialects.sqlite import insert
+
+from app.extensions import db
+from app.http_client import gerenciamento
+from app.models.replica import ReplicaEstado, ReplicaId
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+# intervalo (s) entre sincronizações; 0 desativa a réplica
+REPLICA_SYNC_INTERVALO = float(os.getenv("REPLICA_SYNC_INTERVALO", "5"))
+# acima deste atraso (s) a réplica é ignorada e a validação volta a usar HTTP
+REPLICA_MAX_ATRASO = float(os.getenv("REPLICA_MAX_ATRASO", "30"))
+REPLICA_LOTE = int(os.getenv("REPLICA_LOTE", "1000"))
+
+logger = logging.getLogger(__name__)
+
+
+def _obter_estado():
+    estado = db.session.get(ReplicaEstado, 1)
+    if estado is None:
+        estado = ReplicaEstado(id=1, ultimo_seq=0)
+        db.session.add(estado)
+    return estado
+
+
+def _aplicar(alteracoes):
+    # dentro de uma página vale a última operação de cada ID
+    existe = {}
+    for alteracao in alteracoes:
+        chave = (alteracao["entidade"], alteracao["id"])
+        existe[chave] = alteracao["operacao"] != "removido"
+
+    inserir = [{"entidade": e, "entidade_id": i} for (e, i), ok in existe.items() if ok]
+    if inserir:
+        db.session.execute(insert(ReplicaId).on_conflict_do_nothing(), inserir)
+
+    remover = {}
+    for (entidade, id), ok in existe.items():
+        if not ok:
+            remover.setdefault(entidade, []).append(id)
+    for entidade, ids in remover.items():
+        ReplicaId.query.filter(
+            ReplicaId.entidade == entidade, ReplicaId.entidade_id.in_(ids)
+        ).delete(synchronize_session=False)
+
+
+def sincronizar():
+    """Aplica as alterações pendentes do feed do gerenciamento. Retorna quantas foram aplicadas."""
+    estado = _obter_estado()
+    aplicadas = 0
+    while True:
+        resposta = gerenciamento.get("/changes", params={"since": estado.ultimo_seq, "limit": REPLICA_LOTE})
+        resposta.raise_for_status()
+        feed = resposta.json()
+
+        if feed["geracao"] != estado.geracao:
+            # banco do gerenciamento foi recriado: a réplica recomeça do zero
+            ReplicaId.query.delete(synchronize_session=False)
+            estado.geracao = feed["geracao"]
+            estado.sincronizado_em = None
+            if estado.ultimo_seq:
+                estado.ultimo_seq = 0
+                continue
+
+        alteracoes = feed["alteracoes"]
+        _aplicar(alteracoes)
+        if alteracoes:
+            estado.ultimo_seq = alteracoes[-1]["seq"]
+        aplicadas += len(alteracoes)
+
+        if not feed["tem_mais"]:
+            estado.sincronizado_em = datetime.utcnow()
+            db.session.commit()
+            return aplicadas
+        db.session.commit()
+
+
+def consultar(entidade, id):
+    """
+    Consulta a réplica local. Retorna True quando o ID está nela, ou None
+    quando não está ou quando a réplica está desativada ou desatualizada além
+    de REPLICA_MAX_ATRASO (o chamador deve então validar via HTTP).
+
+    Uma ausência nunca é definitiva: a réplica pode estar até um intervalo de
+    sincronização atrás do gerenciamento e ainda não conhecer IDs recém-criados.
+    """
+    if type(id) is not int or not em_dia():
+        return None
+    return True if db.session.get(ReplicaId, (entidade, id)) is not None else None
+
+
+def em_dia():
+    """Indica se a réplica está ativa e sincronizada há no máximo REPLICA_MAX_ATRASO segundos."""
+    if REPLICA_SYNC_INTERVALO <= 0:
+        return False
+    estado = db.session.get(ReplicaEstado, 1)
+    if estado is None or estado.sincronizado_em is None:
+        return False
+    return datetime.utcnow() - estado.sincronizado_em <= timedelta(seconds=REPLICA_MAX_ATRASO)
+
+
+def resumo():
+    estado = db.session.get(ReplicaEstado, 1)
+    if estado is None:
+        return {"ativa": REPLICA_SYNC_INTERVALO > 0, "ultimo_seq": 0, "sincronizado_em": None}
+    return {
+        "ativa": REPLICA_SYNC_INTERVALO > 0,
+        "ultimo_seq": estado.ultimo_seq,
+        "sincronizado_em": estado.sincronizado_em.isoformat() if estado.sincronizado_em else None,
+    }
+
+
+def _arquivo_trava():
+    # um arquivo por instalação do serviço, compartilhado pelos workers do gunicorn
+    sufixo = hashlib.sha1(os.path.abspath(__file__).encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"replica-sync-{sufixo}.lock")
+
+
+def _obter_trava(arquivo):
+    """Tenta obter a trava exclusiva (sem bloquear). Retorna True se este processo a detém."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(arquivo, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def iniciar_sincronizacao(app):
+    """
+    Inicia a thread que mantém a réplica atualizada em segundo plano.
+
+    Com vários workers, cada um inicia a sua thread, mas apenas o processo que
+    detém a trava de arquivo sincroniza; os demais assumem se ele morrer.
+    """
+    if REPLICA_SYNC_INTERVALO <= 0:
+        return None
+
+    def loop():
+        arquivo = open(_arquivo_trava(), "a")
+        while not _obter_trava(arquivo):
+            time.sleep(REPLICA_SYNC_INTERVALO)
+
+        while True:
+            with app.app_context():
+                try:
+                    sincronizar()
+                except Exception as e:
+                    db.session.rollback()
+                    logger.warning("Falha ao sincronizar réplica do gerenciamento: %s", e)
+            time.sleep(REPLICA_SYNC_INTERVALO)
+
+    thread = threading.Thread(target=loop, name="replica-sync", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,185 @@
+import os
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+
+import requests
+from sqlalchemy import select
+
+from app import metrics, replica
+from app.caching import CacheTTL, SingleFlight
+from app.extensions import db
+from app.http_client import EstatisticasLatencia, gerenciamento
+from app.models.replica import ReplicaId
+
+VALIDACAO_CACHE_TAMANHO = int(os.getenv("VALIDACAO_CACHE_TAMANHO", "10000"))
+VALIDACAO_CACHE_TTL = float(os.getenv("VALIDACAO_CACHE_TTL", "60"))
+VALIDACAO_CACHE_TTL_NEGATIVO = float(os.getenv("VALIDACAO_CACHE_TTL_NEGATIVO", "10"))
+# threads usadas para validar dependências independentes em paralelo
+VALIDACAO_WORKERS = int(os.getenv("VALIDACAO_WORKERS", "8"))
+# prazo total (s) para o conjunto de validações de uma requisição
+VALIDACAO_PRAZO = float(os.getenv("VALIDACAO_PRAZO", "5"))
+TAMANHO_LOTE_IN = 500
+
+
+class FalhaValidacao(requests.exceptions.RequestException):
+    """Falha ao validar `entidade` no gerenciamento (conexão, erro ou prazo esgotado)."""
+
+    def __init__(self, entidade, mensagem):
+        super().__init__(mensagem)
+        self.entidade = entidade
+
+
+cache = CacheTTL(VALIDACAO_CACHE_TAMANHO)
+consultas = SingleFlight()
+# tempo de cada validação por entidade, incluindo respostas da réplica e do cache
+tempos = EstatisticasLatencia()
+_executor = ThreadPoolExecutor(max_workers=VALIDACAO_WORKERS, thread_name_prefix="validacao")
+
+
+def existe(entidade, id):
+    """
+    Verifica se `id` existe na `entidade` ("professores", "turmas", "alunos")
+    do serviço de gerenciamento.
+
+    Respostas 200 ficam em cache por VALIDACAO_CACHE_TTL segundos e 404 por
+    VALIDACAO_CACHE_TTL_NEGATIVO. Outros status não são guardados. Falhas de
+    conexão propagam `requests.exceptions.RequestException`.
+
+    Quando a réplica local está em dia e contém o ID, a resposta vem dela,
+    sem rede; IDs ausentes dela ainda são conferidos no gerenciamento.
+    Consultas simultâneas do mesmo ID compartilham uma única chamada ao
+    gerenciamento.
+    """
+    inicio = time.perf_counter()
+    local = replica.consultar(entidade, id)
+    if local is not None:
+        tempos.registrar(entidade, (time.perf_counter() - inicio) * 1000)
+        return local
+    return _existe_remoto(entidade, id)
+
+
+def _existe_remoto(entidade, id):
+    inicio = time.perf_counter()
+    erro = True
+    try:
+        chave = (entidade, str(id))
+        encontrado, valor = cache.obter(chave)
+        if not encontrado:
+            valor = consultas.executar(chave, lambda: _consultar(entidade, id, chave))
+        erro = False
+        return valor
+    finally:
+        tempos.registrar(entidade, (time.perf_counter() - inicio) * 1000, erro=erro)
+
+
+def existem(pares, prazo=VALIDACAO_PRAZO):
+    """
+    Valida vários `(entidade, id)` independentes ao mesmo tempo. Retorna
+    `{(entidade, id): bool}`.
+
+    A réplica local é consultada na própria thread da requisição; o que
+    precisar de rede vai para um pool limitado de threads, com um único prazo
+    para o conjunto. A latência passa a ser a da chamada mais lenta, e não a
+    soma delas. Qualquer falha (ou prazo esgotado) lança `FalhaValidacao`
+    com a entidade afetada.
+    """
+    resultado = {}
+    futuros = {}
+    for entidade, id in dict.fromkeys(pares):
+        inicio = time.perf_counter()
+        local = replica.consultar(entidade, id)
+        if local is not None:
+            tempos.registrar(entidade, (time.perf_counter() - inicio) * 1000)
+            resultado[(entidade, id)] = local
+        else:
+            futuros[_executor.submit(_existe_remoto, entidade, id)] = (entidade, id)
+
+    inicio = time.perf_counter()
+    concluidos, pendentes = wait(futuros, timeout=prazo, return_when=FIRST_EXCEPTION)
+    if futuros:
+        # as chamadas rodam em outras threads: o tempo de espera entra no Server-Timing daqui
+        metrics.acumular_tempo("upstream", time.perf_counter() - inicio)
+    for futuro in concluidos:
+        entidade, id = futuros[futuro]
+        erro = futuro.exception()
+        if erro is not None:
+            raise FalhaValidacao(entidade, str(erro)) from erro
+        resultado[(entidade, id)] = futuro.result()
+    for futuro in pendentes:
+        # a chamada segue em segundo plano e, se concluir, ainda alimenta o cache
+        entidade, _ = futuros[futuro]
+        raise FalhaValidacao(entidade, f"Prazo de {prazo}s esgotado ao validar {entidade}")
+    return resultado
+
+
+def existem_em_lote(entidade, ids):
+    """
+    Valida vários IDs inteiros de uma mesma entidade. Retorna `{id: bool}`.
+
+    IDs presentes na réplica local (quando ela está em dia) são aceitos sem
+    rede; os demais, se não estiverem no cache, são validados em uma única
+    chamada `POST /validate` ao gerenciamento, e o resultado alimenta o cache.
+    Falhas propagam `requests.exceptions.RequestException`.
+    """
+    ids = set(ids)
+    inicio = time.perf_counter()
+    resultado = dict.fromkeys(_presentes_na_replica(entidade, ids), True)
+    if len(resultado) == len(ids):
+        tempos.registrar(entidade, (time.perf_counter() - inicio) * 1000)
+        return resultado
+
+    faltantes = []
+    for id in ids - resultado.keys():
+        encontrado, valor = cache.obter((entidade, str(id)))
+        if encontrado:
+            resultado[id] = valor
+        else:
+            faltantes.append(id)
+    if not faltantes:
+        return resultado
+
+    erro = True
+    try:
+        resposta = gerenciamento.post("/validate", json={entidade: sorted(faltantes)})
+        resposta.raise_for_status()
+        validados = resposta.json()[entidade]
+        erro = False
+    finally:
+        tempos.registrar(entidade, (time.perf_counter() - inicio) * 1000, erro=erro)
+
+    for id in validados["existentes"]:
+        resultado[id] = True
+        cache.guardar((entidade, str(id)), True, VALIDACAO_CACHE_TTL)
+    for id in validados["inexistentes"]:
+        resultado[id] = False
+        cache.guardar((entidade, str(id)), False, VALIDACAO_CACHE_TTL_NEGATIVO)
+    return resultado
+
+
+def _presentes_na_replica(entidade, ids):
+    """
+    IDs inteiros de `ids` presentes na réplica local, ou nenhum se ela não
+    estiver em dia. Uma ausência não é definitiva (a réplica pode não conhecer
+    IDs recém-criados), por isso só os presentes são devolvidos.
+    """
+    if not replica.em_dia():
+        return set()
+    ids = [id for id in ids if type(id) is int]
+    presentes = set()
+    for i in range(0, len(ids), TAMANHO_LOTE_IN):
+        presentes.update(db.session.execute(
+            select(ReplicaId.entidade_id).where(
+                ReplicaId.entidade == entidade, ReplicaId.entidade_id.in_(ids[i:i + TAMANHO_LOTE_IN])
+            )
+        ).scalars())
+    return presentes
+
+
+def _consultar(entidade, id, chave):
+    resposta = gerenciamento.get(f"/{entidade}/{id}")
+    if resposta.status_code == 200:
+        cache.guardar(chave, True, VALIDACAO_CACHE_TTL)
+        return True
+    if resposta.status_code == 404:
+        cache.guardar(chave, False, VALIDACAO_CACHE_TTL_NEGATIVO)
+    return False
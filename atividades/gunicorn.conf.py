@@ -0,0 +1,34 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# configuração do gunicorn; todos os valores podem ser sobrescritos por variáveis de ambiente
+bind = f"0.0.0.0:{os.getenv('PORT', '5003')}"
+workers = int(os.getenv("WEB_WORKERS", min(multiprocessing.cpu_count() * 2 + 1, 4)))
+threads = int(os.getenv("WEB_THREADS", "4"))
+worker_class = "gthread" if threads > 1 else "sync"
+keepalive = int(os.getenv("WEB_KEEPALIVE", "5"))
+timeout = int(os.getenv("WEB_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "0"))
+accesslog = os.getenv("WEB_ACCESS_LOG", "-")
+errorlog = "-"
+
+# cada worker grava ali o snapshot das suas métricas; /metrics soma os de todos
+os.environ.setdefault("METRICS_DIR", os.path.join(tempfile.gettempdir(), f"metrics-{bind.rsplit(':', 1)[1]}"))
+
+
+def on_starting(server):
+    # métricas de uma execução anterior não devem ser somadas às desta
+    shutil.rmtree(os.environ["METRICS_DIR"], ignore_errors=True)
+
+    # cria o schema uma única vez, no processo master, antes de criar os workers
+    from app import create_app, init_db
+    from app.extensions import db
+
+    app = create_app()
+    init_db(app)
+    with app.app_context():
+        db.engine.dispose()
@@ -1,10 +1,10 @@
-from app import create_app
-from app.extensions import db
+from app import create_app, init_db
+from app.replica import iniciar_sincronizacao
 
 app = create_app()
 
-with app.app_context():
-    db.create_all()
-
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5003, debug=True)
\ No newline at end of file
+    # servidor de desenvolvimento; em produção use o gunicorn (ver wsgi.py)
+    init_db(app)
+    iniciar_sincronizacao(app)
+    app.run(host="0.0.0.0", port=5003, debug=True)
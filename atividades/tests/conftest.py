@@ -0,0 +1,67 @@
+import pytest
+
+from app import create_app, entidades, init_db, validacao
+from app.extensions import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'atividades.db'}"})
+    init_db(app)
+    validacao.cache.limpar()
+    entidades.cache.limpar()
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+
+class RespostaFalsa:
+    def __init__(self, dados):
+        self.dados = dados
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.dados
+
+
+@pytest.fixture
+def gerenciamento(monkeypatch):
+    """Simula o gerenciamento com os IDs 1 a 50 de cada entidade e registra as chamadas feitas."""
+    chamadas = []
+
+    def existe(id):
+        return 1 <= id <= 50
+
+    def consultar(entidade, id, chave):
+        chamadas.append(("GET", entidade, id))
+        validacao.cache.guardar(chave, existe(id), 60)
+        return existe(id)
+
+    def post(caminho, json):
+        chamadas.append(("POST", caminho, json))
+        if caminho == "/resolve":
+            return RespostaFalsa({
+                entidade: {
+                    "encontrados": [{"id": id, "nome": f"{entidade} {id}"} for id in ids if existe(id)],
+                    "inexistentes": [id for id in ids if not existe(id)],
+                }
+                for entidade, ids in json.items()
+            })
+        return RespostaFalsa({
+            entidade: {
+                "existentes": [id for id in ids if existe(id)],
+                "inexistentes": [id for id in ids if not existe(id)],
+            }
+            for entidade, ids in json.items()
+        })
+
+    monkeypatch.setattr(validacao, "_consultar", consultar)
+    monkeypatch.setattr(validacao.gerenciamento, "post", post)
+    return chamadas
@@ -0,0 +1,69 @@
+import pytest
+
+from app import validacao
+from app.models.atividade import Atividade
+
+
+@pytest.fixture
+def consultas(monkeypatch):
+    """Gerenciamento com professores e turmas de 1 a 50; registra cada ID consultado."""
+    chamadas = []
+
+    def consultar(entidade, id, chave):
+        chamadas.append((entidade, id))
+        return 1 <= id <= 50
+
+    monkeypatch.setattr(validacao, "_consultar", consultar)
+    return chamadas
+
+
+def _criar(cliente, **campos):
+    return cliente.post("/api/atividades/", json={"titulo": "Prova 1", "professor_id": 1, "turma_id": 2, **campos})
+
+
+def test_cria_atividade_validando_professor_e_turma(cliente, consultas):
+    resposta = _criar(cliente)
+
+    assert resposta.status_code == 201
+    assert resposta.get_json()["professor_id"] == 1
+    assert sorted(consultas) == [("professores", 1), ("turmas", 2)]
+
+
+@pytest.mark.parametrize("campos, erro", [
+    ({"professor_id": 99}, "Professor 99"),
+    ({"turma_id": 99}, "Turma 99"),
+])
+def test_professor_ou_turma_inexistente_devolve_400(cliente, consultas, campos, erro):
+    resposta = _criar(cliente, **campos)
+
+    assert resposta.status_code == 400
+    assert erro in resposta.get_json()["erro"]
+    assert Atividade.query.count() == 0
+
+
+@pytest.mark.parametrize("campos", [
+    {"professor_id": [1]},
+    {"turma_id": {"id": 2}},
+    {"professor_id": "1"},
+    {"turma_id": 2.0},
+    {"professor_id": True},
+    {"turma_id": None},
+])
+def test_ids_que_nao_sao_inteiros_devolvem_400_sem_consultar_o_gerenciamento(cliente, consultas, campos):
+    resposta = _criar(cliente, **campos)
+
+    assert resposta.status_code == 400
+    assert "deve ser um inteiro" in resposta.get_json()["erro"]
+    assert consultas == []
+    assert Atividade.query.count() == 0
+
+
+def test_falha_no_gerenciamento_devolve_500(cliente, monkeypatch):
+    def fora_do_ar(entidade, id, chave):
+        raise ConnectionError("gerenciamento fora do ar")
+
+    monkeypatch.setattr(validacao, "_consultar", fora_do_ar)
+    resposta = _criar(cliente)
+
+    assert resposta.status_code == 500
+    assert Atividade.query.count() == 0
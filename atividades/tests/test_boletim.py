@@ -0,0 +1,94 @@
+import requests
+
+from app import entidades
+from app.extensions import db
+from app.models.atividade import Atividade
+from app.models.nota import Nota
+
+
+def _lancar(aluno_id, professor_id, turma_id, valor, titulo="Prova"):
+    atividade = Atividade(titulo=titulo, professor_id=professor_id, turma_id=turma_id)
+    db.session.add(atividade)
+    db.session.flush()
+    db.session.add(Nota(valor=valor, aluno_id=aluno_id, atividade_id=atividade.id))
+    db.session.commit()
+    return atividade.id
+
+
+def _posts(chamadas):
+    return [c for c in chamadas if c[0] == "POST"]
+
+
+def test_boletim_resolve_tudo_em_uma_chamada(cliente, gerenciamento):
+    primeira = _lancar(3, professor_id=1, turma_id=2, valor=9.5, titulo="Prova 1")
+    segunda = _lancar(3, professor_id=1, turma_id=60, valor=8)
+    _lancar(4, professor_id=5, turma_id=2, valor=1)  # outro aluno
+
+    resposta = cliente.get("/api/boletim/aluno/3")
+
+    assert resposta.status_code == 200
+    corpo = resposta.get_json()
+    assert corpo["aluno"] == {"id": 3, "nome": "alunos 3"}
+    assert (corpo["resumo"]["quantidade"], corpo["resumo"]["soma"]) == (2, 17.5)
+    assert corpo["notas"] == [
+        {
+            "id": corpo["notas"][0]["id"],
+            "valor": 9.5,
+            "atividade": {"id": primeira, "titulo": "Prova 1"},
+            "professor": {"id": 1, "nome": "professores 1"},
+            "turma": {"id": 2, "nome": "turmas 2"},
+        },
+        {
+            "id": corpo["notas"][1]["id"],
+            "valor": 8,
+            "atividade": {"id": segunda, "titulo": "Prova"},
+            "professor": {"id": 1, "nome": "professores 1"},
+            # turma removida do gerenciamento
+            "turma": None,
+        },
+    ]
+    assert _posts(gerenciamento) == [
+        ("POST", "/resolve", {"alunos": [3], "professores": [1], "turmas": [2, 60]}),
+    ]
+
+
+def test_boletim_repetido_vem_do_cache(cliente, gerenciamento):
+    _lancar(3, professor_id=1, turma_id=2, valor=7)
+
+    primeiro = cliente.get("/api/boletim/aluno/3").get_json()
+    segundo = cliente.get("/api/boletim/aluno/3").get_json()
+
+    assert segundo == primeiro
+    assert len(_posts(gerenciamento)) == 1
+
+
+def test_cache_busca_so_o_que_falta(cliente, gerenciamento):
+    _lancar(3, professor_id=1, turma_id=2, valor=7)
+    _lancar(4, professor_id=1, turma_id=5, valor=6)
+
+    cliente.get("/api/boletim/aluno/3")
+    cliente.get("/api/boletim/aluno/4")
+
+    assert _posts(gerenciamento)[-1] == ("POST", "/resolve", {"alunos": [4], "turmas": [5]})
+
+
+def test_aluno_sem_notas_tem_resumo_vazio(cliente, gerenciamento):
+    corpo = cliente.get("/api/boletim/aluno/7").get_json()
+
+    assert corpo["notas"] == []
+    assert corpo["resumo"]["quantidade"] == 0
+
+
+def test_aluno_inexistente_devolve_404_e_fica_em_cache_negativo(cliente, gerenciamento):
+    assert cliente.get("/api/boletim/aluno/99").status_code == 404
+    assert cliente.get("/api/boletim/aluno/99").status_code == 404
+    assert len(_posts(gerenciamento)) == 1
+
+
+def test_falha_no_gerenciamento_devolve_500(cliente, monkeypatch):
+    def fora_do_ar(caminho, json):
+        raise requests.exceptions.ConnectionError("gerenciamento fora do ar")
+
+    monkeypatch.setattr(entidades.gerenciamento, "post", fora_do_ar)
+
+    assert cliente.get("/api/boletim/aluno/1").status_code == 500
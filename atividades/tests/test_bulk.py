@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from app.extensions import db
+from app.models.atividade import Atividade
+from app.models.nota import Nota
+from app.models.resumo import ResumoAtividade
+
+
+@pytest.fixture
+def atividade(app):
+    atividade = Atividade(titulo="Prova", professor_id=1, turma_id=1)
+    db.session.add(atividade)
+    db.session.commit()
+    return atividade.id
+
+
+def _enviar(cliente, atividade, corpo, content_type, chave=None):
+    headers = {"Idempotency-Key": chave} if chave else {}
+    return cliente.post(f"/api/atividades/{atividade}/notas/lote", data=corpo, content_type=content_type, headers=headers)
+
+
+def _notas(atividade):
+    return {n.aluno_id: n.valor for n in Nota.query.filter_by(atividade_id=atividade)}
+
+
+def test_csv_grava_as_linhas_validas_e_aponta_as_invalidas(cliente, gerenciamento, atividade):
+    corpo = "\n".join([
+        "aluno_id,valor",
+        "1,7.5",
+        "2,abc",
+        "x,8",
+        "3,",
+        "99,6",
+        "4,10",
+        "1,9",
+        "5,nan",
+        "6,1.5",
+    ])
+
+    resposta = _enviar(cliente, atividade, corpo, "text/csv")
+
+    assert resposta.status_code == 201
+    corpo = resposta.get_json()
+    assert [c["linha"] for c in corpo["criadas"]] == [1, 6, 9]
+    assert corpo["atualizadas"] == []
+    assert [(e["linha"], e["erro"]) for e in corpo["erros"]] == [
+        (2, "Campo 'valor' deve ser um número"),
+        (3, "Campo 'aluno_id' deve ser um inteiro"),
+        (4, "Campos obrigatórios: aluno_id, valor"),
+        (5, "Aluno 99 não encontrado."),
+        (7, "Aluno 1 repetido (já informado na linha 1)"),
+        (8, "Campo 'valor' deve ser um número"),
+    ]
+    assert _notas(atividade) == {1: 7.5, 4: 10, 6: 1.5}
+    # todos os alunos validados em uma única chamada
+    assert [c for c in gerenciamento if c[0] == "POST"] == [("POST", "/validate", {"alunos": [1, 4, 6, 99]})]
+
+
+def test_ndjson_rejeita_tipos_errados(cliente, gerenciamento, atividade):
+    linhas = [
+        {"aluno_id": 1, "valor": 8},
+        {"aluno_id": 2.0, "valor": 8},
+        {"aluno_id": True, "valor": 8},
+        {"aluno_id": 3, "valor": False},
+        [4, 8],
+    ]
+    corpo = "\n".join(json.dumps(linha) for linha in linhas)
+
+    resposta = _enviar(cliente, atividade, corpo, "application/x-ndjson")
+
+    assert [c["linha"] for c in resposta.get_json()["criadas"]] == [1]
+    assert [e["linha"] for e in resposta.get_json()["erros"]] == [2, 3, 4, 5]
+
+
+def test_reenvio_atualiza_em_vez_de_duplicar(cliente, gerenciamento, atividade):
+    corpo = "aluno_id,valor\n1,5\n2,6\n"
+    primeira = _enviar(cliente, atividade, corpo, "text/csv").get_json()
+    segunda = _enviar(cliente, atividade, corpo, "text/csv").get_json()
+
+    assert segunda["criadas"] == []
+    assert segunda["atualizadas"] == primeira["criadas"]
+    assert Nota.query.count() == 2
+
+    # reenvio corrigido: atualiza uma, cria outra, mantém os resumos em dia
+    _enviar(cliente, atividade, "aluno_id,valor\n1,9\n3,4\n", "text/csv")
+    assert _notas(atividade) == {1: 9, 2: 6, 3: 4}
+    resumo = db.session.get(ResumoAtividade, atividade)
+    assert (resumo.quantidade, resumo.soma) == (3, 19)
+
+
+def test_reenvio_com_a_mesma_chave_repete_a_resposta(cliente, gerenciamento, atividade):
+    primeira = _enviar(cliente, atividade, "aluno_id,valor\n1,5\n", "text/csv", chave="lote-1")
+    repetida = _enviar(cliente, atividade, "aluno_id,valor\n1,5\n", "text/csv", chave="lote-1")
+
+    assert repetida.get_json() == primeira.get_json()
+    assert repetida.headers["Idempotent-Replayed"] == "true"
+
+
+@pytest.mark.parametrize("corpo, content_type", [
+    ("", "text/csv"),
+    ("[{", "application/json"),
+    ('{"aluno_id": 1, "valor": 5}\n{', "application/x-ndjson"),
+    ("aluno_id,valor\n99,5\n", "text/csv"),
+])
+def test_lote_sem_nenhuma_nota_gravada_devolve_400(cliente, gerenciamento, atividade, corpo, content_type):
+    resposta = _enviar(cliente, atividade, corpo, content_type)
+
+    assert resposta.status_code == 400
+    assert Nota.query.count() == 0
+
+
+def test_atividade_inexistente_devolve_404(cliente, gerenciamento):
+    assert _enviar(cliente, 999, "aluno_id,valor\n1,5\n", "text/csv").status_code == 404
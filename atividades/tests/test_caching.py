@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from app import caching
+from app.caching import CacheTTL, SingleFlight
+
+
+@pytest.fixture
+def relogio(monkeypatch):
+    agora = [1000.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: agora[0])
+    return agora
+
+
+def test_cache_expira_cada_entrada_no_seu_ttl(relogio):
+    cache = CacheTTL(10)
+    cache.guardar("curta", True, 5)
+    cache.guardar("longa", False, 60)
+
+    relogio[0] += 10
+    assert cache.obter("curta") == (False, None)
+    assert cache.obter("longa") == (True, False)
+    assert cache.resumo()["expirados"] == 1
+
+
+def test_cache_descarta_o_menos_usado_quando_cheio(relogio):
+    cache = CacheTTL(2)
+    cache.guardar("a", 1, 60)
+    cache.guardar("b", 2, 60)
+    cache.obter("a")
+    cache.guardar("c", 3, 60)
+
+    assert cache.obter("b") == (False, None)
+    assert cache.obter("a") == (True, 1)
+    assert cache.obter("c") == (True, 3)
+    assert cache.resumo()["evictions"] == 1
+
+
+def test_cache_desativado_nao_guarda(relogio):
+    sem_espaco, sem_ttl = CacheTTL(0), CacheTTL(10)
+    sem_espaco.guardar("a", 1, 60)
+    sem_ttl.guardar("a", 1, 0)
+    assert sem_espaco.obter("a") == (False, None)
+    assert sem_ttl.obter("a") == (False, None)
+
+
+def _aguardar_chegada(voo, quantidade):
+    prazo = time.monotonic() + 5
+    while voo.resumo()["executadas"] + voo.resumo()["compartilhadas"] < quantidade:
+        assert time.monotonic() < prazo, "threads não chegaram ao SingleFlight"
+        time.sleep(0.001)
+
+
+def _em_paralelo(quantidade, funcao):
+    barreira = threading.Barrier(quantidade)
+    resultados, erros = [None] * quantidade, [None] * quantidade
+
+    def executar(i):
+        barreira.wait()
+        try:
+            resultados[i] = funcao()
+        except Exception as e:
+            erros[i] = e
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(quantidade)]
+    for thread in threads:
+        thread.start()
+    return threads, resultados, erros
+
+
+def test_single_flight_compartilha_uma_unica_chamada():
+    voo = SingleFlight()
+    liberar = threading.Event()
+    chamadas = []
+
+    def consultar():
+        chamadas.append(1)
+        liberar.wait(5)
+        return "resultado"
+
+    threads, resultados, erros = _em_paralelo(8, lambda: voo.executar("turmas:1", consultar))
+    # todas as threads chegam antes de a chamada em andamento terminar
+    _aguardar_chegada(voo, 8)
+    liberar.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(chamadas) == 1
+    assert resultados == ["resultado"] * 8
+    assert erros == [None] * 8
+    assert voo.resumo() == {"em_andamento": 0, "executadas": 1, "compartilhadas": 7}
+
+
+def test_single_flight_propaga_a_mesma_excecao_e_libera_a_chave():
+    voo = SingleFlight()
+    liberar = threading.Event()
+
+    def falhar():
+        liberar.wait(5)
+        raise ConnectionError("gerenciamento fora do ar")
+
+    threads, _, erros = _em_paralelo(4, lambda: voo.executar("turmas:1", falhar))
+    _aguardar_chegada(voo, 4)
+    liberar.set()
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(erro, ConnectionError) for erro in erros)
+    assert voo.resumo()["em_andamento"] == 0
+    # a próxima chamada não reaproveita a falha
+    assert voo.executar("turmas:1", lambda: "ok") == "ok"
@@ -0,0 +1,83 @@
+import pytest
+
+from app.extensions import db
+from app.models.atividade import Atividade
+from app.models.nota import Nota
+
+# média 5 e desvio padrão populacional 2
+VALORES = [9, 4, 2, 5, 4, 7, 4, 5]
+
+
+def _atividade(turma_id=1):
+    atividade = Atividade(titulo="Prova", professor_id=1, turma_id=turma_id)
+    db.session.add(atividade)
+    db.session.commit()
+    return atividade.id
+
+
+def _lancar(atividade_id, valores, primeiro_aluno=1):
+    db.session.add_all([
+        Nota(valor=valor, aluno_id=primeiro_aluno + i, atividade_id=atividade_id)
+        for i, valor in enumerate(valores)
+    ])
+    db.session.commit()
+
+
+def test_estatisticas_de_um_conjunto_conhecido(cliente):
+    atividade = _atividade()
+    _lancar(atividade, VALORES)
+
+    resposta = cliente.get(f"/api/atividades/{atividade}/estatisticas?faixas=7")
+
+    assert resposta.status_code == 200
+    corpo = resposta.get_json()
+    assert (corpo["quantidade"], corpo["media"], corpo["minimo"], corpo["maximo"]) == (8, 5, 2, 9)
+    assert corpo["desvio_padrao"] == 2
+    # interpolação linear sobre 2, 4, 4, 4, 5, 5, 7, 9
+    assert corpo["percentis"] == pytest.approx({"p10": 3.4, "p25": 4, "p50": 4.5, "p75": 5.5, "p90": 7.6})
+    assert corpo["mediana"] == pytest.approx(4.5)
+    # o máximo entra na última faixa
+    assert [(f["de"], f["ate"], f["quantidade"]) for f in corpo["histograma"]] == [
+        (2, 3, 1), (3, 4, 0), (4, 5, 3), (5, 6, 2), (6, 7, 0), (7, 8, 1), (8, 9, 1),
+    ]
+
+
+def test_uma_unica_nota(cliente):
+    atividade = _atividade()
+    _lancar(atividade, [7.5])
+
+    corpo = cliente.get(f"/api/atividades/{atividade}/estatisticas").get_json()
+
+    assert corpo["desvio_padrao"] == 0
+    assert set(corpo["percentis"].values()) == {7.5}
+    assert corpo["histograma"] == [{"de": 7.5, "ate": 7.5, "quantidade": 1}]
+
+
+def test_atividade_sem_notas(cliente):
+    corpo = cliente.get(f"/api/atividades/{_atividade()}/estatisticas").get_json()
+
+    assert corpo["quantidade"] == 0
+    assert corpo["media"] is None
+    assert corpo["histograma"] == []
+
+
+def test_filtros_de_notas_por_turma_aluno_e_atividade(cliente):
+    primeira, segunda, outra_turma = _atividade(), _atividade(), _atividade(turma_id=2)
+    _lancar(primeira, [2, 4])
+    _lancar(segunda, [6, 8])
+    _lancar(outra_turma, [10])
+
+    def media(consulta):
+        return cliente.get(f"/api/notas/estatisticas?{consulta}").get_json()["media"]
+
+    assert media("") == 6
+    assert media("turma_id=1") == 5
+    assert media(f"atividade_id={segunda}") == 7
+    assert media("aluno_id=1") == 6
+    assert media("turma_id=1&aluno_id=2") == 6
+
+
+def test_erros(cliente):
+    assert cliente.get("/api/atividades/999/estatisticas").status_code == 404
+    assert cliente.get(f"/api/atividades/{_atividade()}/estatisticas?faixas=0").status_code == 400
+    assert cliente.get("/api/notas/estatisticas?turma_id=x").status_code == 400
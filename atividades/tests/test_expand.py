@@ -0,0 +1,67 @@
+import pytest
+import requests
+
+from app import entidades
+from app.extensions import db
+from app.models.atividade import Atividade
+
+
+@pytest.fixture
+def atividades(app):
+    registros = [
+        Atividade(titulo="Prova 1", professor_id=1, turma_id=2),
+        Atividade(titulo="Prova 2", professor_id=1, turma_id=3),
+        Atividade(titulo="Trabalho", professor_id=60, turma_id=2),
+    ]
+    db.session.add_all(registros)
+    db.session.commit()
+    return [a.id for a in registros]
+
+
+def _posts(chamadas):
+    return [c for c in chamadas if c[0] == "POST"]
+
+
+def test_sem_expand_nao_chama_o_gerenciamento(cliente, gerenciamento, atividades):
+    corpo = cliente.get("/api/atividades/").get_json()
+
+    assert [a["id"] for a in corpo] == atividades
+    assert "professor" not in corpo[0]
+    assert gerenciamento == []
+
+
+def test_expand_embute_professor_e_turma_com_uma_unica_chamada(cliente, gerenciamento, atividades):
+    corpo = cliente.get("/api/atividades/?expand=professor,turma").get_json()
+
+    assert [(a["professor"], a["turma"]) for a in corpo] == [
+        ({"id": 1, "nome": "professores 1"}, {"id": 2, "nome": "turmas 2"}),
+        ({"id": 1, "nome": "professores 1"}, {"id": 3, "nome": "turmas 3"}),
+        # professor removido do gerenciamento
+        (None, {"id": 2, "nome": "turmas 2"}),
+    ]
+    assert _posts(gerenciamento) == [("POST", "/resolve", {"professores": [1, 60], "turmas": [2, 3]})]
+
+
+def test_expand_combina_com_filtros_e_reaproveita_o_cache(cliente, gerenciamento, atividades):
+    cliente.get("/api/atividades/?expand=turma")
+    corpo = cliente.get("/api/atividades/?turma_id=2&expand=turma").get_json()
+
+    assert [a["id"] for a in corpo] == [atividades[0], atividades[2]]
+    assert len(_posts(gerenciamento)) == 1
+
+
+def test_expand_desconhecido_devolve_400(cliente, gerenciamento, atividades):
+    resposta = cliente.get("/api/atividades/?expand=aluno")
+
+    assert resposta.status_code == 400
+    assert gerenciamento == []
+
+
+def test_falha_no_gerenciamento_devolve_500(cliente, atividades, monkeypatch):
+    def fora_do_ar(caminho, json):
+        raise requests.exceptions.ConnectionError("gerenciamento fora do ar")
+
+    monkeypatch.setattr(entidades.gerenciamento, "post", fora_do_ar)
+
+    assert cliente.get("/api/atividades/?expand=turma").status_code == 500
+    assert cliente.get("/api/atividades/").status_code == 200
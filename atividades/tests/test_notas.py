@@ -0,0 +1,62 @@
+import pytest
+
+from app.extensions import db
+from app.models.atividade import Atividade
+from app.models.nota import Nota
+from app.models.resumo import ResumoAluno
+
+
+@pytest.fixture
+def atividade(app):
+    atividade = Atividade(titulo="Prova", professor_id=1, turma_id=1)
+    db.session.add(atividade)
+    db.session.commit()
+    return atividade.id
+
+
+def _upsert(cliente, **campos):
+    return cliente.put("/api/notas/upsert", json=campos)
+
+
+def test_upsert_cria_e_depois_atualiza_a_mesma_nota(cliente, gerenciamento, atividade):
+    criada = _upsert(cliente, aluno_id=1, atividade_id=atividade, valor=5)
+    atualizada = _upsert(cliente, aluno_id=1, atividade_id=atividade, valor=8.5)
+
+    assert criada.status_code == atualizada.status_code == 200
+    assert criada.get_json()["id"] == atualizada.get_json()["id"]
+    assert Nota.query.count() == 1
+    assert db.session.get(ResumoAluno, 1).soma == 8.5
+
+
+def test_upsert_responde_como_o_get(cliente, gerenciamento, atividade):
+    resposta = _upsert(cliente, aluno_id="1", atividade_id=str(atividade), valor=5)
+
+    corpo = resposta.get_json()
+    assert corpo == cliente.get(f"/api/notas/{corpo['id']}").get_json()
+    assert corpo == {"id": corpo["id"], "valor": 5.0, "aluno_id": 1, "atividade_id": atividade}
+    assert type(corpo["valor"]) is float
+
+
+@pytest.mark.parametrize("atividade_id", [[1], {"id": 1}, 1.0, True, "um", ""])
+@pytest.mark.parametrize("metodo, caminho", [("put", "/api/notas/upsert"), ("post", "/api/notas/")])
+def test_atividade_id_que_nao_e_inteiro_devolve_400(cliente, gerenciamento, atividade, metodo, caminho, atividade_id):
+    resposta = getattr(cliente, metodo)(caminho, json={"aluno_id": 1, "atividade_id": atividade_id, "valor": 5})
+
+    assert resposta.status_code == 400
+    assert "atividade_id" in resposta.get_json()["erro"]
+    assert Nota.query.count() == 0
+
+
+def test_atividade_ou_aluno_inexistente_devolve_400(cliente, gerenciamento, atividade):
+    assert _upsert(cliente, aluno_id=1, atividade_id=999, valor=5).status_code == 400
+    assert _upsert(cliente, aluno_id=99, atividade_id=atividade, valor=5).status_code == 400
+    assert Nota.query.count() == 0
+
+
+def test_post_de_nota_repetida_devolve_409(cliente, gerenciamento, atividade):
+    primeira = cliente.post("/api/notas/", json={"aluno_id": 1, "atividade_id": atividade, "valor": 5})
+    repetida = cliente.post("/api/notas/", json={"aluno_id": 1, "atividade_id": atividade, "valor": 7})
+
+    assert primeira.status_code == 201
+    assert repetida.status_code == 409
+    assert repetida.get_json()["nota_id"] == primeira.get_json()["id"]
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from app.extensions import db
+from app.models.nota import Nota
+from app.models.resumo import RESUMOS, reconstruir_resumos
+
+
+def _resumos():
+    """Estado das duas tabelas de resumo, com somas arredondadas para comparar floats."""
+    return {
+        modelo.__tablename__: {
+            getattr(r, campo): (round(r.soma, 6), r.quantidade, r.minimo, r.maximo)
+            for r in modelo.query.all()
+        }
+        for modelo, campo in RESUMOS
+    }
+
+
+def _esperado():
+    """Resumos calculados em Python a partir das notas gravadas."""
+    grupos = {modelo.__tablename__: {} for modelo, _ in RESUMOS}
+    for nota in Nota.query.all():
+        for modelo, campo in RESUMOS:
+            grupos[modelo.__tablename__].setdefault(getattr(nota, campo), []).append(nota.valor)
+    return {
+        tabela: {id: (round(sum(v), 6), len(v), min(v), max(v)) for id, v in valores.items()}
+        for tabela, valores in grupos.items()
+    }
+
+
+@pytest.mark.parametrize("semente", range(5))
+def test_resumos_incrementais_batem_com_o_recalculo(app, semente):
+    aleatorio = random.Random(semente)
+    for _ in range(300):
+        notas = Nota.query.all()
+        operacao = aleatorio.choice(["criar", "criar", "alterar", "mover", "remover"]) if notas else "criar"
+        if operacao == "criar":
+            aluno_id, atividade_id = aleatorio.randint(1, 8), aleatorio.randint(1, 5)
+            if Nota.query.filter_by(aluno_id=aluno_id, atividade_id=atividade_id).first() is None:
+                db.session.add(Nota(valor=aleatorio.choice([0, 5, 7.5, 10]), aluno_id=aluno_id, atividade_id=atividade_id))
+        elif operacao == "alterar":
+            aleatorio.choice(notas).valor = aleatorio.uniform(0, 10)
+        elif operacao == "mover":
+            nota, atividade_id = aleatorio.choice(notas), aleatorio.randint(1, 5)
+            if Nota.query.filter_by(aluno_id=nota.aluno_id, atividade_id=atividade_id).first() is None:
+                nota.atividade_id = atividade_id
+        else:
+            db.session.delete(aleatorio.choice(notas))
+        db.session.commit()
+
+        assert _resumos() == _esperado()
+
+    incremental = _resumos()
+    reconstruir_resumos()
+    assert _resumos() == incremental
+
+
+def test_remover_a_ultima_nota_apaga_o_resumo(app):
+    nota = Nota(valor=9, aluno_id=1, atividade_id=1)
+    db.session.add(nota)
+    db.session.commit()
+    db.session.delete(nota)
+    db.session.commit()
+
+    assert _resumos() == {modelo.__tablename__: {} for modelo, _ in RESUMOS}
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+import pytest
+
+from app import replica, validacao
+from app.extensions import db
+from app.models.replica import ReplicaEstado, ReplicaId
+
+
+@pytest.fixture
+def replica_em_dia(app, monkeypatch):
+    """Réplica recém-sincronizada que conhece apenas os alunos 1 e 2."""
+    monkeypatch.setattr(replica, "REPLICA_SYNC_INTERVALO", 5)
+    db.session.add(ReplicaEstado(id=1, ultimo_seq=2, sincronizado_em=datetime.utcnow()))
+    db.session.add_all([ReplicaId(entidade="alunos", entidade_id=id) for id in (1, 2)])
+    db.session.commit()
+
+
+def test_id_presente_na_replica_dispensa_a_rede(replica_em_dia, gerenciamento):
+    assert validacao.existe("alunos", 1) is True
+    assert validacao.existem([("alunos", 2)]) == {("alunos", 2): True}
+    assert gerenciamento == []
+
+
+def test_id_ausente_da_replica_ainda_e_conferido_no_gerenciamento(replica_em_dia, gerenciamento):
+    # criado no gerenciamento depois da última sincronização
+    assert validacao.existe("alunos", 7) is True
+    assert validacao.existe("alunos", 99) is False
+    assert gerenciamento == [("GET", "alunos", 7), ("GET", "alunos", 99)]
+
+
+def test_lote_valida_no_gerenciamento_so_o_que_a_replica_nao_tem(replica_em_dia, gerenciamento):
+    assert validacao.existem_em_lote("alunos", [1, 2, 7, 99]) == {1: True, 2: True, 7: True, 99: False}
+    assert gerenciamento == [("POST", "/validate", {"alunos": [7, 99]})]
+
+    # a segunda vez vem inteira da réplica e do cache
+    assert validacao.existem_em_lote("alunos", [1, 7, 99]) == {1: True, 7: True, 99: False}
+    assert len(gerenciamento) == 1
+
+
+def test_replica_desatualizada_e_ignorada(app, gerenciamento, monkeypatch):
+    monkeypatch.setattr(replica, "REPLICA_SYNC_INTERVALO", 5)
+    db.session.add(ReplicaEstado(id=1, ultimo_seq=2, sincronizado_em=datetime(2000, 1, 1)))
+    db.session.add(ReplicaId(entidade="alunos", entidade_id=99))
+    db.session.commit()
+
+    assert validacao.existe("alunos", 99) is False
+    assert gerenciamento == [("GET", "alunos", 99)]
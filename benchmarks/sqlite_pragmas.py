@@ -0,0 +1,117 @@
+"""
+Benchmark de leitura/escrita concorrente no SQLite: configuração padrão
+(journal de rollback, synchronous=FULL) vs. a usada pelos serviços
+(WAL, synchronous=NORMAL, busy_timeout, mmap_size, cache_size).
+
+Simula vários workers do gunicorn com processos independentes, cada um com a
+sua conexão, fazendo escritas curtas (uma transação por INSERT, como um POST)
+e leituras por chave primária (como um GET por ID).
+
+Uso:
+    python benchmarks/sqlite_pragmas.py [--segundos 5] [--escritores 4] [--leitores 4]
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+CONFIGURACOES = {
+    "padrao": [],
+    "ajustado": [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA busy_timeout=5000",
+        f"PRAGMA mmap_size={256 * 1024 * 1024}",
+        "PRAGMA cache_size=-65536",
+    ],
+}
+
+LINHAS_INICIAIS = 10_000
+
+
+def _conectar(caminho, pragmas):
+    # mesmo timeout padrão (5 s) do sqlite3/SQLAlchemy usado antes nos serviços
+    conexao = sqlite3.connect(caminho)
+    for pragma in pragmas:
+        conexao.execute(pragma)
+    return conexao
+
+
+def _escritor(caminho, pragmas, segundos, fila):
+    conexao = _conectar(caminho, pragmas)
+    ops = erros = 0
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        try:
+            with conexao:
+                conexao.execute("INSERT INTO alunos (nome, turma_id) VALUES (?, ?)", ("bench", ops % 50))
+            ops += 1
+        except sqlite3.OperationalError:
+            erros += 1
+    fila.put(("escrita", ops, erros))
+
+
+def _leitor(caminho, pragmas, segundos, fila):
+    conexao = _conectar(caminho, pragmas)
+    ops = erros = 0
+    fim = time.perf_counter() + segundos
+    while time.perf_counter() < fim:
+        try:
+            conexao.execute("SELECT id, nome, turma_id FROM alunos WHERE id = ?", (ops % LINHAS_INICIAIS + 1,)).fetchone()
+            ops += 1
+        except sqlite3.OperationalError:
+            erros += 1
+    fila.put(("leitura", ops, erros))
+
+
+def executar(nome, pragmas, segundos, escritores, leitores):
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "bench.db")
+        conexao = _conectar(caminho, pragmas)
+        conexao.execute("CREATE TABLE alunos (id INTEGER PRIMARY KEY, nome VARCHAR(100) NOT NULL, turma_id INTEGER)")
+        with conexao:
+            conexao.executemany(
+                "INSERT INTO alunos (nome, turma_id) VALUES (?, ?)",
+                ((f"aluno {i}", i % 50) for i in range(LINHAS_INICIAIS)),
+            )
+        conexao.close()
+
+        fila = multiprocessing.Queue()
+        processos = [
+            multiprocessing.Process(target=_escritor, args=(caminho, pragmas, segundos, fila))
+            for _ in range(escritores)
+        ] + [
+            multiprocessing.Process(target=_leitor, args=(caminho, pragmas, segundos, fila))
+            for _ in range(leitores)
+        ]
+        for p in processos:
+            p.start()
+        resultados = [fila.get() for _ in processos]
+        for p in processos:
+            p.join()
+
+    totais = {"escrita": [0, 0], "leitura": [0, 0]}
+    for tipo, ops, erros in resultados:
+        totais[tipo][0] += ops
+        totais[tipo][1] += erros
+
+    print(f"{nome:>9}: "
+          f"escritas {totais['escrita'][0] / segundos:9.0f}/s ({totais['escrita'][1]} 'database is locked')  "
+          f"leituras {totais['leitura'][0] / segundos:9.0f}/s ({totais['leitura'][1]} 'database is locked')")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--escritores", type=int, default=4)
+    parser.add_argument("--leitores", type=int, default=4)
+    args = parser.parse_args()
+
+    for nome, pragmas in CONFIGURACOES.items():
+        executar(nome, pragmas, args.segundos, args.escritores, args.leitores)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import json
+
+from flask import request
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import db
+from app.models.alteracao import registrar_alteracoes
+
+TAMANHO_LOTE = 500
+MAXIMO_REGISTROS = 50000
+
+
+def ler_registros():
+    """
+    Lê o corpo da requisição como array JSON ou NDJSON (um objeto por linha).
+    Lança ValueError se o corpo for inválido.
+    """
+    corpo = request.get_data(as_text=True).strip()
+    if not corpo:
+        raise ValueError("Corpo vazio: envie um array JSON ou NDJSON")
+
+    if corpo.startswith("["):
+        try:
+            registros = json.loads(corpo)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"JSON inválido: {e.msg}")
+    else:
+        registros = []
+        for numero, linha in enumerate(corpo.splitlines(), start=1):
+            if not linha.strip():
+                continue
+            try:
+                registros.append(json.loads(linha))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"NDJSON inválido na linha {numero}: {e.msg}")
+
+    if len(registros) > MAXIMO_REGISTROS:
+        raise ValueError(f"Máximo de {MAXIMO_REGISTROS} registros por requisição")
+    return registros
+
+
+def _validar(registro, campos):
+    """`campos` = {nome: (tipo, obrigatorio)}. Retorna (valores, erro)."""
+    if not isinstance(registro, dict):
+        return None, "Registro deve ser um objeto JSON"
+
+    valores = {}
+    for campo, (tipo, obrigatorio) in campos.items():
+        valor = registro.get(campo)
+        if valor is None:
+            if obrigatorio:
+                return None, f"Campo '{campo}' é obrigatório"
+        elif type(valor) is not tipo:
+            return None, f"Campo '{campo}' deve ser do tipo {tipo.__name__}"
+        valores[campo] = valor
+    return valores, None
+
+
+def _inserir_linha_a_linha(modelo, entidade, lote):
+    criados, erros = [], []
+    for linha, valores in lote:
+        try:
+            with db.session.begin_nested():
+                id = db.session.execute(insert(modelo).returning(modelo.id), valores).scalar_one()
+                registrar_alteracoes(db.session.connection(), entidade, [id], "criado")
+            criados.append({"linha": linha, "id": id})
+        except SQLAlchemyError as e:
+            erros.append({"linha": linha, "erro": str(e.orig if hasattr(e, "orig") else e)})
+    db.session.commit()
+    return criados, erros
+
+
+def inserir_em_lote(modelo, entidade, registros, campos):
+    """
+    Valida e insere `registros` em transações de até TAMANHO_LOTE linhas
+    (um executemany por transação). Registros inválidos não interrompem o
+    lote: são devolvidos em `erros` com o número da linha (a partir de 1).
+    """
+    validos, erros = [], []
+    for linha, registro in enumerate(registros, start=1):
+        valores, erro = _validar(registro, campos)
+        if erro:
+            erros.append({"linha": linha, "erro": erro})
+        else:
+            validos.append((linha, valores))
+
+    criados = []
+    for i in range(0, len(validos), TAMANHO_LOTE):
+        lote = validos[i:i + TAMANHO_LOTE]
+        try:
+            ids = db.session.execute(
+                insert(modelo).returning(modelo.id, sort_by_parameter_order=True),
+                [valores for _, valores in lote],
+            ).scalars().all()
+            registrar_alteracoes(db.session.connection(), entidade, ids, "criado")
+            db.session.commit()
+            criados.extend({"linha": linha, "id": id} for (linha, _), id in zip(lote, ids))
+        except SQLAlchemyError:
+            # isola as linhas problemáticas do lote sem descartar as demais
+            db.session.rollback()
+            criados_lote, erros_lote = _inserir_linha_a_linha(modelo, entidade, lote)
+            criados.extend(criados_lote)
+            erros.extend(erros_lote)
+
+    erros.sort(key=lambda e: e["linha"])
+    return {"criados": criados, "erros": erros}
@@ -0,0 +1,105 @@
+from flask import Blueprint, jsonify
+from app.extensions import db
+from app.models.alteracao import Alteracao, geracao_atual
+from app.query_filters import ParametroInvalido, parametro_inteiro
+
+alteracao_bp = Blueprint("alteracoes", __name__)
+
+LIMITE_PADRAO = 1000
+LIMITE_MAXIMO = 5000
+
+
+@alteracao_bp.route("/changes", methods=["GET"])
+def listar_alteracoes():
+    """
+    Feed de alterações de Professores, Turmas e Alunos
+    ---
+    tags:
+      - Alterações
+    summary: Lista as alterações com sequência maior que `since`
+    description: |
+      Cada criação, atualização ou remoção de Professor, Turma ou Aluno gera um
+      registro com número de sequência crescente. Os serviços dependentes usam
+      o feed para manter uma réplica local dos IDs válidos.
+      Quando `geracao` muda (banco recriado), a réplica deve recomeçar de `since=0`.
+    parameters:
+      - in: query
+        name: since
+        type: integer
+        required: false
+        default: 0
+        description: Última sequência já aplicada pelo cliente
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 1000
+        description: Máximo de alterações retornadas (de 1 a 5000)
+    responses:
+      200:
+        description: Alterações posteriores a `since`
+        schema:
+          type: object
+          properties:
+            geracao:
+              type: string
+              example: "2025-11-20T12:00:00"
+            ultimo_seq:
+              type: integer
+              example: 42
+            tem_mais:
+              type: boolean
+              example: false
+            alteracoes:
+              type: array
+              items:
+                type: object
+                properties:
+                  seq:
+                    type: integer
+                    example: 41
+                  entidade:
+                    type: string
+                    example: alunos
+                  id:
+                    type: integer
+                    example: 7
+                  operacao:
+                    type: string
+                    enum: [criado, atualizado, removido]
+                    example: criado
+      400:
+        description: Parâmetros inválidos
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+    """
+    try:
+        since = parametro_inteiro("since", 0)
+        limite = parametro_inteiro("limit", 1, LIMITE_MAXIMO)
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    if since is None:
+        since = 0
+    if limite is None:
+        limite = LIMITE_PADRAO
+
+    alteracoes = (
+        Alteracao.query
+        .filter(Alteracao.seq > since)
+        .order_by(Alteracao.seq)
+        .limit(limite + 1)
+        .all()
+    )
+    tem_mais = len(alteracoes) > limite
+    alteracoes = alteracoes[:limite]
+
+    ultimo_seq = db.session.query(db.func.max(Alteracao.seq)).scalar() or 0
+    return jsonify({
+        "geracao": geracao_atual(),
+        "ultimo_seq": ultimo_seq,
+        "tem_mais": tem_mais,
+        "alteracoes": [a.to_dict() for a in alteracoes],
+    }), 200
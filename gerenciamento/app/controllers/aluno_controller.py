@@ -1,9 +1,16 @@
 from flask import Blueprint, jsonify, request
 from app.extensions import db
+from app.idempotency import idempotente
 from app.models.aluno import Aluno
+from app.bulk import inserir_em_lote, ler_registros
+from app.pagination import listar_paginado
+from app.query_filters import ParametroInvalido, aplicar_filtros
 
 aluno_bp = Blueprint("alunos", __name__)
 
+# campos aceitos na criação em lote: nome -> (tipo, obrigatório)
+CAMPOS_ALUNO = {"nome": (str, True), "turma_id": (int, False)}
+
 # 🔹 Listar todos os alunos
 @aluno_bp.route("/", methods=["GET"])
 def listar_alunos():
@@ -14,13 +21,45 @@ def listar_alunos():
       - Alunos
     summary: Lista todos os alunos
     description: Retorna uma lista com todos os alunos cadastrados.
+    parameters:
+      - in: query
+        name: turma_id
+        type: integer
+        required: false
+        description: Filtra pelos alunos da turma (consulta indexada)
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Tamanho máximo da página (até 1000). Ativa a paginação por cursor.
+      - in: query
+        name: after
+        type: integer
+        required: false
+        description: Cursor da página; retorna apenas alunos com id maior que este valor.
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Transmite o resultado linha a linha (memória constante).
     responses:
       200:
         description: Lista de alunos
+        headers:
+          Link:
+            type: string
+            description: URL da próxima página (rel="next"), quando houver
+          X-Next-Cursor:
+            type: integer
+            description: Cursor a ser enviado em `after` para obter a próxima página
         schema:
           type: array
           items:
             $ref: '#/definitions/Aluno'
+      400:
+        description: Parâmetros de filtro ou paginação inválidos
+        schema:
+          $ref: '#/definitions/Error'
     definitions:
       Aluno:
         type: object
@@ -72,8 +111,11 @@ def listar_alunos():
             type: string
             example: "Aluno 1 removido com sucesso"
     """
-    alunos = Aluno.query.all()
-    return jsonify([a.to_dict() for a in alunos]), 200
+    try:
+        query = aplicar_filtros(Aluno.query, Aluno, ["turma_id"])
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    return listar_paginado(query, Aluno)
 
 # 🔹 Buscar aluno por ID
 @aluno_bp.route("/<int:id>", methods=["GET"])
@@ -107,6 +149,7 @@ def obter_aluno(id):
 
 # 🔹 Criar novo aluno
 @aluno_bp.route("/", methods=["POST"])
+@idempotente
 def criar_aluno():
     """
     Criar novo aluno
@@ -117,6 +160,11 @@ def criar_aluno():
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
       - in: body
         name: body
         required: true
@@ -144,6 +192,81 @@ def criar_aluno():
     db.session.commit()
     return jsonify(novo_aluno.to_dict()), 201
 
+# 🔹 Criar alunos em lote
+@aluno_bp.route("/bulk", methods=["POST"])
+@idempotente
+def criar_alunos_em_lote():
+    """
+    Criar alunos em lote
+    ---
+    tags:
+      - Alunos
+    summary: Cria vários alunos em uma única requisição
+    description: |
+      Aceita um array JSON ou NDJSON (um objeto por linha, `Content-Type: application/x-ndjson`).
+      As inserções são feitas em transações de até 500 linhas. Registros inválidos
+      não interrompem o lote e são devolvidos em `erros` com o número da linha.
+    consumes:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: array
+          items:
+            $ref: '#/definitions/AlunoInput'
+          example: [{"nome": "Maria Silva", "turma_id": 1}, {"nome": "João Souza"}]
+    responses:
+      201:
+        description: Lote processado (ao menos um registro criado)
+        schema:
+          $ref: '#/definitions/ResultadoLote'
+      400:
+        description: Corpo inválido ou nenhum registro criado
+        schema:
+          $ref: '#/definitions/ResultadoLote'
+    definitions:
+      ResultadoLote:
+        type: object
+        properties:
+          criados:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 1
+                id:
+                  type: integer
+                  example: 10
+          erros:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 2
+                erro:
+                  type: string
+                  example: "Campo 'nome' é obrigatório"
+    """
+    try:
+        registros = ler_registros()
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    resultado = inserir_em_lote(Aluno, "alunos", registros, CAMPOS_ALUNO)
+    return jsonify(resultado), 201 if resultado["criados"] else 400
+
 # 🔹 Atualizar aluno existente
 @aluno_bp.route("/<int:id>", methods=["PUT"])
 def atualizar_aluno(id):
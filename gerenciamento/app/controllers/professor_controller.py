@@ -1,9 +1,16 @@
 from flask import Blueprint, jsonify, request
 from app.extensions import db
+from app.idempotency import idempotente
 from app.models.professor import Professor
+from app.models.turma import Turma
+from app.bulk import inserir_em_lote, ler_registros
+from app.pagination import listar_paginado
 
 professor_bp = Blueprint("professores", __name__)
 
+# campos aceitos na criação em lote: nome -> (tipo, obrigatório)
+CAMPOS_PROFESSOR = {"nome": (str, True), "materia": (str, False)}
+
 @professor_bp.route("/", methods=["GET"])
 def listar_professores():
     """
@@ -13,13 +20,40 @@ def listar_professores():
       - Professores
     summary: Lista todos os professores
     description: Retorna uma lista com todos os professores cadastrados.
+    parameters:
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Tamanho máximo da página (até 1000). Ativa a paginação por cursor.
+      - in: query
+        name: after
+        type: integer
+        required: false
+        description: Cursor da página; retorna apenas professores com id maior que este valor.
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Transmite o resultado linha a linha (memória constante).
     responses:
       200:
         description: Lista de professores
+        headers:
+          Link:
+            type: string
+            description: URL da próxima página (rel="next"), quando houver
+          X-Next-Cursor:
+            type: integer
+            description: Cursor a ser enviado em `after` para obter a próxima página
         schema:
           type: array
           items:
             $ref: '#/definitions/Professor'
+      400:
+        description: Parâmetros de paginação inválidos
+        schema:
+          $ref: '#/definitions/Error'
     definitions:
       Professor:
         type: object
@@ -67,8 +101,7 @@ def listar_professores():
             type: string
             example: "Professor 1 removido com sucesso"
     """
-    professores = Professor.query.all()
-    return jsonify([p.to_dict() for p in professores])
+    return listar_paginado(Professor.query, Professor)
 
 @professor_bp.route("/<int:id>", methods=["GET"])
 def obter_professor(id):
@@ -99,7 +132,47 @@ def obter_professor(id):
         return jsonify({"erro": "Professor não encontrado"}), 404
     return jsonify(professor.to_dict()), 200
 
+@professor_bp.route("/<int:id>/turmas", methods=["GET"])
+def listar_turmas_do_professor(id):
+    """
+    Listar turmas de um professor
+    ---
+    tags:
+      - Professores
+    summary: Lista as turmas de um professor
+    description: Consulta pelo índice de `turmas.professor_id`. Aceita a mesma paginação de `GET /api/turmas/`.
+    parameters:
+      - in: path
+        name: id
+        type: integer
+        required: true
+        description: ID do professor
+      - in: query
+        name: limit
+        type: integer
+        required: false
+      - in: query
+        name: after
+        type: integer
+        required: false
+    responses:
+      200:
+        description: Turmas do professor
+        schema:
+          type: array
+          items:
+            $ref: '#/definitions/Turma'
+      404:
+        description: Professor não encontrado
+        schema:
+          $ref: '#/definitions/Error'
+    """
+    if not db.session.get(Professor, id):
+        return jsonify({"erro": "Professor não encontrado"}), 404
+    return listar_paginado(Turma.query.filter(Turma.professor_id == id), Turma)
+
 @professor_bp.route("/", methods=["POST"])
+@idempotente
 def criar_professor():
     """
     Criar novo professor
@@ -110,6 +183,11 @@ def criar_professor():
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
       - in: body
         name: body
         required: true
@@ -133,6 +211,80 @@ def criar_professor():
     db.session.commit()
     return jsonify(novo.to_dict()), 201
 
+@professor_bp.route("/bulk", methods=["POST"])
+@idempotente
+def criar_professores_em_lote():
+    """
+    Criar professores em lote
+    ---
+    tags:
+      - Professores
+    summary: Cria vários professores em uma única requisição
+    description: |
+      Aceita um array JSON ou NDJSON (um objeto por linha, `Content-Type: application/x-ndjson`).
+      As inserções são feitas em transações de até 500 linhas. Registros inválidos
+      não interrompem o lote e são devolvidos em `erros` com o número da linha.
+    consumes:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: array
+          items:
+            $ref: '#/definitions/ProfessorInput'
+          example: [{"nome": "João Pereira", "materia": "Matemática"}]
+    responses:
+      201:
+        description: Lote processado (ao menos um registro criado)
+        schema:
+          $ref: '#/definitions/ResultadoLote'
+      400:
+        description: Corpo inválido ou nenhum registro criado
+        schema:
+          $ref: '#/definitions/ResultadoLote'
+    definitions:
+      ResultadoLote:
+        type: object
+        properties:
+          criados:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 1
+                id:
+                  type: integer
+                  example: 10
+          erros:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 2
+                erro:
+                  type: string
+                  example: "Campo 'nome' é obrigatório"
+    """
+    try:
+        registros = ler_registros()
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    resultado = inserir_em_lote(Professor, "professores", registros, CAMPOS_PROFESSOR)
+    return jsonify(resultado), 201 if resultado["criados"] else 400
+
 @professor_bp.route("/<int:id>", methods=["PUT"])
 def atualizar_professor(id):
     """
@@ -83,13 +83,16 @@ def seed_data():
     prof1 = Professor(nome="Marcos Paulo", materia="Matemática")
     prof2 = Professor(nome="Ana Beatriz", materia="Português")
 
-    db.session.add_all([prof1, prof2])
-    db.session.commit()
+    # flush (e não commit) entre as etapas: os IDs ficam disponíveis sem expirar os objetos
+    professores = [prof1, prof2]
+    db.session.add_all(professores)
+    db.session.flush()
 
     turma1 = Turma(nome="1A", professor_id=prof1.id)
     turma2 = Turma(nome="2B", professor_id=prof2.id)
-    db.session.add_all([turma1, turma2])
-    db.session.commit()
+    turmas = [turma1, turma2]
+    db.session.add_all(turmas)
+    db.session.flush()
 
     alunos = [
         Aluno(nome="Carlos", turma_id=turma1.id),
@@ -97,11 +100,14 @@ def seed_data():
         Aluno(nome="Rafaela", turma_id=turma2.id),
     ]
     db.session.add_all(alunos)
-    db.session.commit()
+    db.session.flush()
 
-    return jsonify({
+    # serializa antes do commit, que expiraria os objetos e obrigaria a relê-los do banco
+    resposta = {
         "message": "Banco populado com sucesso!",
-        "professores": [p.to_dict() for p in Professor.query.all()],
-        "turmas": [t.to_dict() for t in Turma.query.all()],
-        "alunos": [a.to_dict() for a in Aluno.query.all()]
-    }), 201
+        "professores": [p.to_dict() for p in professores],
+        "turmas": [t.to_dict() for t in turmas],
+        "alunos": [a.to_dict() for a in alunos]
+    }
+    db.session.commit()
+    return jsonify(resposta), 201
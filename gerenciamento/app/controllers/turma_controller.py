@@ -1,9 +1,17 @@
 from flask import Blueprint, jsonify, request
 from app.extensions import db
+from app.idempotency import idempotente
 from app.models.turma import Turma
+from app.models.aluno import Aluno
+from app.bulk import inserir_em_lote, ler_registros
+from app.pagination import listar_paginado
+from app.query_filters import ParametroInvalido, aplicar_filtros
 
 turma_bp = Blueprint("turmas", __name__)
 
+# campos aceitos na criação em lote: nome -> (tipo, obrigatório)
+CAMPOS_TURMA = {"nome": (str, True), "professor_id": (int, False)}
+
 # 🔹 Listar todas as turmas
 @turma_bp.route("/", methods=["GET"])
 def listar_turmas():
@@ -14,13 +22,45 @@ def listar_turmas():
       - Turmas
     summary: Lista todas as turmas
     description: Retorna uma lista com todas as turmas cadastradas.
+    parameters:
+      - in: query
+        name: professor_id
+        type: integer
+        required: false
+        description: Filtra pelas turmas do professor (consulta indexada)
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        description: Tamanho máximo da página (até 1000). Ativa a paginação por cursor.
+      - in: query
+        name: after
+        type: integer
+        required: false
+        description: Cursor da página; retorna apenas turmas com id maior que este valor.
+      - in: query
+        name: stream
+        type: boolean
+        required: false
+        description: Transmite o resultado linha a linha (memória constante).
     responses:
       200:
         description: Lista de turmas
+        headers:
+          Link:
+            type: string
+            description: URL da próxima página (rel="next"), quando houver
+          X-Next-Cursor:
+            type: integer
+            description: Cursor a ser enviado em `after` para obter a próxima página
         schema:
           type: array
           items:
             $ref: '#/definitions/Turma'
+      400:
+        description: Parâmetros de filtro ou paginação inválidos
+        schema:
+          $ref: '#/definitions/Error'
     definitions:
       Turma:
         type: object
@@ -72,8 +112,11 @@ def listar_turmas():
             type: string
             example: "Turma 1 removida com sucesso"
     """
-    turmas = Turma.query.all()
-    return jsonify([t.to_dict() for t in turmas]), 200
+    try:
+        query = aplicar_filtros(Turma.query, Turma, ["professor_id"])
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    return listar_paginado(query, Turma)
 
 # 🔹 Buscar turma por ID
 @turma_bp.route("/<int:id>", methods=["GET"])
@@ -105,8 +148,49 @@ def obter_turma(id):
         return jsonify({"erro": "Turma não encontrada"}), 404
     return jsonify(turma.to_dict()), 200
 
+# 🔹 Listar alunos de uma turma
+@turma_bp.route("/<int:id>/alunos", methods=["GET"])
+def listar_alunos_da_turma(id):
+    """
+    Listar alunos de uma turma
+    ---
+    tags:
+      - Turmas
+    summary: Lista os alunos de uma turma
+    description: Consulta pelo índice de `alunos.turma_id`. Aceita a mesma paginação de `GET /api/alunos/`.
+    parameters:
+      - in: path
+        name: id
+        type: integer
+        required: true
+        description: ID da turma
+      - in: query
+        name: limit
+        type: integer
+        required: false
+      - in: query
+        name: after
+        type: integer
+        required: false
+    responses:
+      200:
+        description: Alunos da turma
+        schema:
+          type: array
+          items:
+            $ref: '#/definitions/Aluno'
+      404:
+        description: Turma não encontrada
+        schema:
+          $ref: '#/definitions/Error'
+    """
+    if not db.session.get(Turma, id):
+        return jsonify({"erro": "Turma não encontrada"}), 404
+    return listar_paginado(Aluno.query.filter(Aluno.turma_id == id), Aluno)
+
 # 🔹 Criar nova turma
 @turma_bp.route("/", methods=["POST"])
+@idempotente
 def criar_turma():
     """
     Criar nova turma
@@ -117,6 +201,11 @@ def criar_turma():
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
       - in: body
         name: body
         required: true
@@ -144,6 +233,81 @@ def criar_turma():
     db.session.commit()
     return jsonify(nova_turma.to_dict()), 201
 
+# 🔹 Criar turmas em lote
+@turma_bp.route("/bulk", methods=["POST"])
+@idempotente
+def criar_turmas_em_lote():
+    """
+    Criar turmas em lote
+    ---
+    tags:
+      - Turmas
+    summary: Cria vários turmas em uma única requisição
+    description: |
+      Aceita um array JSON ou NDJSON (um objeto por linha, `Content-Type: application/x-ndjson`).
+      As inserções são feitas em transações de até 500 linhas. Registros inválidos
+      não interrompem o lote e são devolvidos em `erros` com o número da linha.
+    consumes:
+      - application/json
+      - application/x-ndjson
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: array
+          items:
+            $ref: '#/definitions/TurmaInput'
+          example: [{"nome": "Turma A", "professor_id": 1}]
+    responses:
+      201:
+        description: Lote processado (ao menos um registro criado)
+        schema:
+          $ref: '#/definitions/ResultadoLote'
+      400:
+        description: Corpo inválido ou nenhum registro criado
+        schema:
+          $ref: '#/definitions/ResultadoLote'
+    definitions:
+      ResultadoLote:
+        type: object
+        properties:
+          criados:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 1
+                id:
+                  type: integer
+                  example: 10
+          erros:
+            type: array
+            items:
+              type: object
+              properties:
+                linha:
+                  type: integer
+                  example: 2
+                erro:
+                  type: string
+                  example: "Campo 'nome' é obrigatório"
+    """
+    try:
+        registros = ler_registros()
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    resultado = inserir_em_lote(Turma, "turmas", registros, CAMPOS_TURMA)
+    return jsonify(resultado), 201 if resultado["criados"] else 400
+
 # 🔹 Atualizar turma existente
 @turma_bp.route("/<int:id>", methods=["PUT"])
 def atualizar_turma(id):
@@ -0,0 +1,204 @@
+from flask import Blueprint, jsonify, request
+from app.extensions import db
+from app.models.professor import Professor
+from app.models.turma import Turma
+from app.models.aluno import Aluno
+
+validacao_bp = Blueprint("validacao", __name__)
+
+ENTIDADES = {
+    "professores": Professor,
+    "turmas": Turma,
+    "alunos": Aluno,
+}
+
+# mantém cada IN abaixo do limite de parâmetros do SQLite
+TAMANHO_LOTE_IN = 500
+
+
+def ids_existentes(modelo, ids):
+    existentes = set()
+    ids = list(ids)
+    for i in range(0, len(ids), TAMANHO_LOTE_IN):
+        lote = ids[i:i + TAMANHO_LOTE_IN]
+        linhas = db.session.query(modelo.id).filter(modelo.id.in_(lote)).all()
+        existentes.update(linha[0] for linha in linhas)
+    return existentes
+
+
+def registros_existentes(modelo, ids):
+    registros = []
+    ids = list(ids)
+    for i in range(0, len(ids), TAMANHO_LOTE_IN):
+        lote = ids[i:i + TAMANHO_LOTE_IN]
+        registros.extend(modelo.query.filter(modelo.id.in_(lote)).order_by(modelo.id).all())
+    return registros
+
+
+def ler_pedido_ids(data):
+    """Valida o corpo `{entidade: [ids]}` e devolve `{entidade: set(ids)}`."""
+    if not isinstance(data, dict) or not data:
+        raise ValueError(f"Informe ao menos uma lista de IDs: {', '.join(ENTIDADES)}")
+
+    pedido = {}
+    for entidade, ids in data.items():
+        if entidade not in ENTIDADES:
+            raise ValueError(f"Entidade desconhecida: '{entidade}'")
+        if not isinstance(ids, list) or not all(type(i) is int for i in ids):
+            raise ValueError(f"'{entidade}' deve ser uma lista de inteiros")
+        pedido[entidade] = set(ids)
+    return pedido
+
+
+@validacao_bp.route("/validate", methods=["POST"])
+def validar_ids():
+    """
+    Validar a existência de vários IDs em uma única chamada
+    ---
+    tags:
+      - Validação
+    summary: Verifica quais IDs de professores, turmas e alunos existem
+    description: |
+      Executa uma consulta indexada (`IN`) por tabela e informa quais IDs
+      existem. Permite que os serviços dependentes validem qualquer número
+      de referências em uma única ida e volta.
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            professores:
+              type: array
+              items:
+                type: integer
+              example: [1, 2]
+            turmas:
+              type: array
+              items:
+                type: integer
+              example: [1, 99]
+            alunos:
+              type: array
+              items:
+                type: integer
+              example: [1, 2, 3]
+    responses:
+      200:
+        description: IDs existentes e inexistentes por entidade
+        schema:
+          type: object
+          additionalProperties:
+            type: object
+            properties:
+              existentes:
+                type: array
+                items:
+                  type: integer
+                example: [1]
+              inexistentes:
+                type: array
+                items:
+                  type: integer
+                example: [99]
+      400:
+        description: Requisição inválida
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+    """
+    try:
+        pedido = ler_pedido_ids(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    resultado = {}
+    for entidade, ids in pedido.items():
+        existentes = ids_existentes(ENTIDADES[entidade], ids)
+        resultado[entidade] = {
+            "existentes": sorted(existentes),
+            "inexistentes": sorted(ids - existentes),
+        }
+    return jsonify(resultado), 200
+
+
+@validacao_bp.route("/resolve", methods=["POST"])
+def resolver_ids():
+    """
+    Buscar vários professores, turmas e alunos em uma única chamada
+    ---
+    tags:
+      - Validação
+    summary: Devolve os registros de vários IDs de professores, turmas e alunos
+    description: |
+      Mesmo corpo de `/validate`, mas devolve os próprios registros. Usado
+      pelos serviços dependentes para montar respostas com nomes (boletim,
+      `expand`) com uma única ida e volta, em vez de um GET por ID.
+    consumes:
+      - application/json
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          properties:
+            professores:
+              type: array
+              items:
+                type: integer
+              example: [1]
+            turmas:
+              type: array
+              items:
+                type: integer
+              example: [1, 99]
+            alunos:
+              type: array
+              items:
+                type: integer
+              example: [3]
+    responses:
+      200:
+        description: Registros encontrados e IDs inexistentes por entidade
+        schema:
+          type: object
+          additionalProperties:
+            type: object
+            properties:
+              encontrados:
+                type: array
+                items:
+                  type: object
+                example: [{"id": 1, "nome": "Turma A", "professor_id": 1}]
+              inexistentes:
+                type: array
+                items:
+                  type: integer
+                example: [99]
+      400:
+        description: Requisição inválida
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+    """
+    try:
+        pedido = ler_pedido_ids(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+
+    resultado = {}
+    for entidade, ids in pedido.items():
+        registros = registros_existentes(ENTIDADES[entidade], ids)
+        resultado[entidade] = {
+            "encontrados": [r.to_dict() for r in registros],
+            "inexistentes": sorted(ids - {r.id for r in registros}),
+        }
+    return jsonify(resultado), 200
@@ -0,0 +1,113 @@
+# Módulo compartilhado: mantenha idêntico em gerenciamento/, reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, jsonify, make_response, request
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.chave_idempotencia import ChaveIdempotencia
+
+# por quanto tempo (s) uma resposta fica disponível para repetição
+IDEMPOTENCIA_TTL = int(os.getenv("IDEMPOTENCIA_TTL", "86400"))
+# após este tempo (s) uma chave "em processamento" é considerada abandonada
+IDEMPOTENCIA_TIMEOUT_PROCESSAMENTO = int(os.getenv("IDEMPOTENCIA_TIMEOUT_PROCESSAMENTO", "60"))
+INTERVALO_LIMPEZA = 300
+TAMANHO_MAXIMO_CHAVE = 255
+
+_limpeza_lock = threading.Lock()
+_ultima_limpeza = 0.0
+
+
+def _limpar_expiradas():
+    global _ultima_limpeza
+    agora = time.monotonic()
+    with _limpeza_lock:
+        if agora - _ultima_limpeza < INTERVALO_LIMPEZA:
+            return
+        _ultima_limpeza = agora
+
+    limite = datetime.utcnow() - timedelta(seconds=IDEMPOTENCIA_TTL)
+    ChaveIdempotencia.query.filter(ChaveIdempotencia.criado_em < limite).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def _liberar(chave):
+    ChaveIdempotencia.query.filter_by(chave=chave).delete(synchronize_session=False)
+    db.session.commit()
+
+
+def idempotente(view):
+    """
+    Suporte ao header `Idempotency-Key` em endpoints de criação.
+
+    A primeira requisição com uma chave reserva a chave, executa a view e
+    grava status + corpo da resposta. Repetições com o mesmo corpo recebem a
+    resposta gravada, sem executar a view de novo (nem validações, nem inserções).
+    Respostas 5xx não são gravadas, para que o cliente possa tentar outra vez.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        chave_cliente = request.headers.get("Idempotency-Key")
+        if not chave_cliente:
+            return view(*args, **kwargs)
+        if len(chave_cliente) > TAMANHO_MAXIMO_CHAVE:
+            return jsonify({"erro": f"Idempotency-Key deve ter no máximo {TAMANHO_MAXIMO_CHAVE} caracteres"}), 400
+
+        _limpar_expiradas()
+        chave = hashlib.sha256(f"{request.method} {request.path} {chave_cliente}".encode()).hexdigest()
+        impressao = hashlib.sha256(request.get_data()).hexdigest()
+        agora = datetime.utcnow()
+
+        registro = db.session.get(ChaveIdempotencia, chave)
+        if registro is not None:
+            expirado = registro.criado_em < agora - timedelta(seconds=IDEMPOTENCIA_TTL)
+            abandonado = registro.status is None and \
+                registro.criado_em < agora - timedelta(seconds=IDEMPOTENCIA_TIMEOUT_PROCESSAMENTO)
+            if expirado or abandonado:
+                db.session.delete(registro)
+                db.session.commit()
+                registro = None
+
+        if registro is not None:
+            if registro.hash_requisicao != impressao:
+                return jsonify({"erro": "Idempotency-Key já usada com outro corpo de requisição"}), 422
+            if registro.status is None:
+                return jsonify({"erro": "Requisição com esta Idempotency-Key ainda em processamento"}), 409
+            resposta = current_app.response_class(registro.corpo, status=registro.status, mimetype="application/json")
+            resposta.headers["Idempotent-Replayed"] = "true"
+            return resposta
+
+        db.session.add(ChaveIdempotencia(chave=chave, hash_requisicao=impressao, criado_em=agora))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"erro": "Requisição com esta Idempotency-Key ainda em processamento"}), 409
+
+        try:
+            resposta = make_response(view(*args, **kwargs))
+        except Exception:
+            db.session.rollback()
+            _liberar(chave)
+            raise
+
+        # descarta o que a view deixou pendente sem commit (ex.: validação falhou)
+        db.session.rollback()
+        if resposta.status_code >= 500 or resposta.is_streamed:
+            _liberar(chave)
+            return resposta
+
+        ChaveIdempotencia.query.filter_by(chave=chave).update(
+            {"status": resposta.status_code, "corpo": resposta.get_data(as_text=True)},
+            synchronize_session=False,
+        )
+        db.session.commit()
+        return resposta
+
+    return wrapper
@@ -0,0 +1,311 @@
+# Módulo compartilhado: mantenha idêntico em gerenciamento/, reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+from app.extensions import db, logger
+
+# diretório compartilhado pelos workers do gunicorn; sem ele, /metrics mostra só este processo
+METRICS_DIR = os.getenv("METRICS_DIR")
+# intervalo mínimo (s) entre gravações do snapshot deste worker em METRICS_DIR
+METRICS_INTERVALO = float(os.getenv("METRICS_INTERVALO", "1"))
+
+# limites (s) dos buckets dos histogramas de latência
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SEM_ROTA = "<sem_rota>"
+
+# partes do header Server-Timing, na ordem em que aparecem
+PARTES_SERVER_TIMING = ("db", "upstream", "serialization")
+
+# nome -> (tipo, descrição)
+METRICAS = {
+    "http_requests_total": ("counter", "Requisições HTTP atendidas, por rota e classe de status."),
+    "http_request_duration_seconds": ("histogram", "Latência das requisições HTTP, por rota."),
+    "http_requests_in_progress": ("gauge", "Requisições HTTP em andamento."),
+    "upstream_request_duration_seconds": (
+        "histogram", "Latência das chamadas a outros serviços, por entidade e resultado (hit, 404, error, timeout)."
+    ),
+    "process_resident_memory_bytes": ("gauge", "Memória residente (RSS) do processo."),
+    "process_open_fds": ("gauge", "Descritores de arquivo abertos pelo processo."),
+    "db_pool_connections_checked_out": ("gauge", "Conexões do pool do SQLAlchemy em uso."),
+    "db_pool_size": ("gauge", "Tamanho configurado do pool do SQLAlchemy."),
+}
+
+
+class Registro:
+    """
+    Contadores e histogramas em memória, sem lock no caminho da requisição:
+    cada thread escreve apenas no seu próprio dicionário e a leitura soma os
+    dicionários de todas as threads. As cópias feitas na leitura (`dict(...)`,
+    `list(...)`) são atômicas no CPython.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._por_thread = []
+
+    def _dados(self):
+        dados = getattr(self._local, "dados", None)
+        if dados is None:
+            dados = self._local.dados = {}
+            with self._lock:
+                self._por_thread.append(dados)
+        return dados
+
+    def incrementar(self, nome, rotulos, valor=1):
+        dados = self._dados()
+        chave = (nome, rotulos)
+        dados[chave] = dados.get(chave, 0) + valor
+
+    def observar(self, nome, rotulos, valor):
+        dados = self._dados()
+        chave = (nome, rotulos)
+        histograma = dados.get(chave)
+        if histograma is None:
+            # contagem por bucket (não cumulativa; a última posição é +Inf) seguida da soma
+            histograma = dados[chave] = [0] * (len(BUCKETS) + 1) + [0.0]
+        histograma[bisect_left(BUCKETS, valor)] += 1
+        histograma[-1] += valor
+
+    def valores(self):
+        with self._lock:
+            por_thread = list(self._por_thread)
+        total = {}
+        for dados in por_thread:
+            for chave, valor in dict(dados).items():
+                if isinstance(valor, list):
+                    valor = list(valor)
+                    atual = total.get(chave)
+                    total[chave] = valor if atual is None else [a + b for a, b in zip(atual, valor)]
+                else:
+                    total[chave] = total.get(chave, 0) + valor
+        return total
+
+
+registro = Registro()
+_medidores = {}
+_ultima_gravacao = 0.0
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource  # fora do Linux: pico de uso (KiB no Linux, bytes no macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _fds_abertos():
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def snapshot():
+    """Estado atual deste processo em formato serializável (JSON)."""
+    metricas = [[nome, list(rotulos), valor] for (nome, rotulos), valor in registro.valores().items()]
+    for nome, medir in _medidores.items():
+        valor = medir()
+        if valor is not None:
+            metricas.append([nome, [], valor])
+    return {"pid": os.getpid(), "metricas": metricas}
+
+
+def _gravar(dados):
+    global _ultima_gravacao
+    _ultima_gravacao = time.monotonic()
+    destino = os.path.join(METRICS_DIR, f"{dados['pid']}.json")
+    temporario = f"{destino}.{threading.get_ident()}.tmp"
+    with open(temporario, "w") as arquivo:
+        json.dump(dados, arquivo)
+    os.replace(temporario, destino)
+
+
+def _processo_vivo(pid):
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def coletar():
+    """
+    Junta as métricas deste processo (ao vivo) com os snapshots dos demais
+    workers, que têm no máximo METRICS_INTERVALO segundos de atraso enquanto
+    recebem requisições. Contadores e histogramas de workers que já terminaram
+    continuam somados (para não parecerem zerados); gauges vêm apenas dos
+    processos vivos, com o rótulo `pid`.
+    """
+    proprio = snapshot()
+    snapshots = [proprio]
+    if METRICS_DIR and os.path.isdir(METRICS_DIR):
+        for nome_arquivo in os.listdir(METRICS_DIR):
+            if not nome_arquivo.endswith(".json") or nome_arquivo == f"{proprio['pid']}.json":
+                continue
+            try:
+                with open(os.path.join(METRICS_DIR, nome_arquivo)) as arquivo:
+                    snapshots.append(json.load(arquivo))
+            except (OSError, ValueError):
+                continue
+
+    total = {}
+    for dados in snapshots:
+        vivo = dados is proprio or _processo_vivo(dados["pid"])
+        for nome, rotulos, valor in dados["metricas"]:
+            if nome not in METRICAS:
+                continue
+            rotulos = tuple(tuple(par) for par in rotulos)
+            if METRICAS[nome][0] == "gauge":
+                if not vivo:
+                    continue
+                rotulos += (("pid", str(dados["pid"])),)
+            atual = total.get((nome, rotulos))
+            if atual is None:
+                total[(nome, rotulos)] = valor
+            elif isinstance(valor, list):
+                total[(nome, rotulos)] = [a + b for a, b in zip(atual, valor)]
+            else:
+                total[(nome, rotulos)] = atual + valor
+    return total
+
+
+def _rotulos(rotulos, extra=()):
+    pares = list(rotulos) + list(extra)
+    if not pares:
+        return ""
+    escapar = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{chave}="{escapar(valor)}"' for chave, valor in pares) + "}"
+
+
+def exportar():
+    """Métricas no formato de texto do Prometheus (versão 0.0.4)."""
+    por_nome = {}
+    for (nome, rotulos), valor in sorted(coletar().items()):
+        por_nome.setdefault(nome, []).append((rotulos, valor))
+
+    linhas = []
+    for nome, amostras in por_nome.items():
+        tipo, ajuda = METRICAS[nome]
+        linhas.append(f"# HELP {nome} {ajuda}")
+        linhas.append(f"# TYPE {nome} {tipo}")
+        for rotulos, valor in amostras:
+            if tipo != "histogram":
+                linhas.append(f"{nome}{_rotulos(rotulos)} {valor}")
+                continue
+            acumulado = 0
+            for limite, quantidade in zip(BUCKETS + ("+Inf",), valor[:-1]):
+                acumulado += quantidade
+                linhas.append(f"{nome}_bucket{_rotulos(rotulos, [('le', limite)])} {acumulado}")
+            linhas.append(f"{nome}_sum{_rotulos(rotulos)} {valor[-1]}")
+            linhas.append(f"{nome}_count{_rotulos(rotulos)} {acumulado}")
+    return "\n".join(linhas) + "\n"
+
+
+def resposta():
+    return Response(exportar(), mimetype="text/plain; version=0.0.4")
+
+
+def acumular_tempo(parte, segundos):
+    """Soma `segundos` à `parte` ("db", "upstream", ...) do Server-Timing da requisição atual, se houver."""
+    if has_request_context():
+        tempos = g.get("tempos_servidor")
+        if tempos is not None:
+            tempos[parte] = tempos.get(parte, 0.0) + segundos
+
+
+def registrar_chamada_externa(servico, entidade, resultado, segundos):
+    """Registra uma chamada a outro serviço no histograma e no Server-Timing da requisição."""
+    registro.observar(
+        "upstream_request_duration_seconds",
+        (("service", servico), ("entity", entidade), ("outcome", resultado)),
+        segundos,
+    )
+    acumular_tempo("upstream", segundos)
+
+
+class JSONProviderMedido(DefaultJSONProvider):
+    """Provider JSON padrão do Flask que soma o tempo de serialização ao Server-Timing."""
+
+    def dumps(self, obj, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            acumular_tempo("serialization", time.perf_counter() - inicio)
+
+
+def _server_timing(tempos, total):
+    partes = [f"{parte};dur={tempos.get(parte, 0.0) * 1000:.1f}" for parte in PARTES_SERVER_TIMING]
+    partes.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(partes)
+
+
+def instrumentar(app):
+    """
+    Mede todas as requisições da aplicação (contagem por rota e classe de
+    status, histograma de latência, requisições em andamento) e registra os
+    gauges do processo e do pool de conexões do banco. Cada resposta leva o
+    header `Server-Timing` com o tempo gasto no banco, em outros serviços e
+    na serialização do JSON.
+    """
+    app.json = JSONProviderMedido(app)
+    with app.app_context():
+        engine = db.engine
+    pool = engine.pool
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _iniciar_consulta(conexao, cursor, statement, parameters, context, executemany):
+        context.metrics_inicio = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _encerrar_consulta(conexao, cursor, statement, parameters, context, executemany):
+        acumular_tempo("db", time.perf_counter() - context.metrics_inicio)
+
+    _medidores["process_resident_memory_bytes"] = _rss_bytes
+    _medidores["process_open_fds"] = _fds_abertos
+    _medidores["db_pool_connections_checked_out"] = getattr(pool, "checkedout", lambda: None)
+    _medidores["db_pool_size"] = getattr(pool, "size", lambda: None)
+
+    @app.before_request
+    def _iniciar_medicao():
+        g.metrics_inicio = time.perf_counter()
+        g.tempos_servidor = {}
+        registro.incrementar("http_requests_in_progress", ())
+
+    @app.after_request
+    def _registrar_medicao(resposta):
+        inicio = g.pop("metrics_inicio", None)
+        if inicio is None:
+            return resposta
+        registro.incrementar("http_requests_in_progress", (), -1)
+        duracao = time.perf_counter() - inicio
+
+        rota = request.url_rule.rule if request.url_rule else SEM_ROTA
+        registro.incrementar(
+            "http_requests_total",
+            (("method", request.method), ("route", rota), ("status", f"{resposta.status_code // 100}xx")),
+        )
+        registro.observar("http_request_duration_seconds", (("method", request.method), ("route", rota)), duracao)
+        resposta.headers["Server-Timing"] = _server_timing(g.pop("tempos_servidor", {}), duracao)
+
+        if METRICS_DIR and time.monotonic() - _ultima_gravacao >= METRICS_INTERVALO:
+            try:
+                os.makedirs(METRICS_DIR, exist_ok=True)
+                _gravar(snapshot())
+            except OSError as e:
+                logger.warning("Não foi possível gravar as métricas em %s: %s", METRICS_DIR, e)
+        return resposta
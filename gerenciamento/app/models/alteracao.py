@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+
+# tabelas cujas alterações entram no feed (nome da tabela = nome da entidade na API)
+TABELAS_RASTREADAS = ("professores", "turmas", "alunos")
+
+
+class Alteracao(db.Model):
+    """Registro append-only de criações, atualizações e remoções (feed de alterações)."""
+
+    __tablename__ = "alteracoes"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    seq = db.Column(db.Integer, primary_key=True)
+    entidade = db.Column(db.String(20), nullable=False)
+    entidade_id = db.Column(db.Integer, nullable=False)
+    operacao = db.Column(db.String(10), nullable=False)
+    criado_em = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "seq": self.seq,
+            "entidade": self.entidade,
+            "id": self.entidade_id,
+            "operacao": self.operacao,
+        }
+
+
+def registrar_alteracoes(conexao, entidade, ids, operacao):
+    """Grava uma alteração por ID na mesma transação de `conexao`."""
+    if not ids:
+        return
+    agora = datetime.utcnow()
+    conexao.execute(
+        insert(Alteracao.__table__),
+        [
+            {"entidade": entidade, "entidade_id": id, "operacao": operacao, "criado_em": agora}
+            for id in ids
+        ],
+    )
+
+
+def registrar_snapshot():
+    """
+    Preenche o feed com o estado atual das tabelas quando ele ainda está vazio,
+    para que bancos anteriores ao feed também sejam replicados.
+    """
+    if db.session.query(Alteracao.seq).first() is not None:
+        return
+    conexao = db.session.connection()
+    for tabela in TABELAS_RASTREADAS:
+        ids = conexao.execute(select(db.metadata.tables[tabela].c.id)).scalars().all()
+        registrar_alteracoes(conexao, tabela, ids, "criado")
+    db.session.commit()
+
+
+def geracao_atual():
+    """
+    Identifica a "geração" do feed pelo horário do seu primeiro registro. Muda
+    sempre que o banco é recriado (ex.: /api/seed), sinalizando às réplicas que
+    devem ressincronizar do zero.
+    """
+    primeiro = db.session.query(func.min(Alteracao.seq)).scalar()
+    if primeiro is None:
+        return None
+    return db.session.get(Alteracao, primeiro).criado_em.isoformat()
+
+
+@event.listens_for(Session, "after_flush")
+def _registrar_alteracoes_do_flush(session, flush_context):
+    por_operacao = {}
+    for operacao, objetos in (
+        ("criado", session.new),
+        ("atualizado", [o for o in session.dirty if session.is_modified(o, include_collections=False)]),
+        ("removido", session.deleted),
+    ):
+        for obj in objetos:
+            tabela = getattr(obj, "__tablename__", None)
+            if tabela in TABELAS_RASTREADAS:
+                por_operacao.setdefault((tabela, operacao), []).append(obj.id)
+
+    if por_operacao:
+        conexao = session.connection()
+        for (tabela, operacao), ids in por_operacao.items():
+            registrar_alteracoes(conexao, tabela, ids, operacao)
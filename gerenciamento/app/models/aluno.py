@@ -5,7 +5,7 @@ class Aluno(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(100), nullable=False)
-    turma_id = db.Column(db.Integer, nullable=True)
+    turma_id = db.Column(db.Integer, nullable=True, index=True)
 
     def to_dict(self):
         return {
@@ -5,7 +5,7 @@ class Turma(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     nome = db.Column(db.String(100), nullable=False)
-    professor_id = db.Column(db.Integer, nullable=True)
+    professor_id = db.Column(db.Integer, nullable=True, index=True)
 
     def to_dict(self):
         return {
@@ -0,0 +1,75 @@
+from urllib.parse import urlencode
+
+from flask import Response, json, jsonify, request, stream_with_context
+
+from app.query_filters import ParametroInvalido, parametro_inteiro
+
+LIMITE_MAXIMO = 1000
+TAMANHO_LOTE_STREAM = 500
+
+VALORES_VERDADEIROS = ("1", "true", "sim", "yes")
+
+
+def _link_proxima_pagina(cursor, limite):
+    args = request.args.to_dict()
+    args["after"] = cursor
+    args["limit"] = limite
+    return f"{request.base_url}?{urlencode(args)}"
+
+
+def _stream(query):
+    def gerar():
+        yield "["
+        primeiro = True
+        for obj in query.yield_per(TAMANHO_LOTE_STREAM):
+            if not primeiro:
+                yield ","
+            primeiro = False
+            yield json.dumps(obj.to_dict())
+        yield "]"
+
+    return Response(stream_with_context(gerar()), status=200, mimetype="application/json")
+
+
+def listar_paginado(query, modelo):
+    """
+    Lista registros de `modelo` usando paginação por cursor (keyset em `id`).
+
+    Parâmetros de query string aceitos:
+      - limit: tamanho máximo da página (até LIMITE_MAXIMO)
+      - after: cursor; retorna apenas registros com id maior que ele
+      - stream: quando verdadeiro, transmite as linhas do cursor do banco
+        conforme são serializadas, mantendo a memória constante
+
+    Sem `limit`/`after`/`stream` o comportamento antigo (lista completa) é mantido.
+    O cursor da próxima página vai nos headers `Link` (rel="next") e `X-Next-Cursor`.
+    """
+    try:
+        limite = parametro_inteiro("limit", 1)
+        cursor = parametro_inteiro("after", 0)
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+
+    query = query.order_by(modelo.id)
+    if cursor is not None:
+        query = query.filter(modelo.id > cursor)
+
+    if request.args.get("stream", "").lower() in VALORES_VERDADEIROS:
+        if limite is not None:
+            query = query.limit(limite)
+        return _stream(query)
+
+    if limite is None and cursor is None:
+        return jsonify([obj.to_dict() for obj in query.all()]), 200
+
+    limite = min(limite or LIMITE_MAXIMO, LIMITE_MAXIMO)
+    registros = query.limit(limite + 1).all()
+    tem_proxima = len(registros) > limite
+    registros = registros[:limite]
+
+    resposta = jsonify([obj.to_dict() for obj in registros])
+    if tem_proxima:
+        proximo_cursor = registros[-1].id
+        resposta.headers["Link"] = f'<{_link_proxima_pagina(proximo_cursor, limite)}>; rel="next"'
+        resposta.headers["X-Next-Cursor"] = str(proximo_cursor)
+    return resposta, 200
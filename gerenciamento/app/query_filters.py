@@ -0,0 +1,30 @@
+from flask import request
+
+
+class ParametroInvalido(ValueError):
+    pass
+
+
+def parametro_inteiro(nome, minimo=None, maximo=None):
+    """Lê `nome` da query string como inteiro (None se ausente)."""
+    valor = request.args.get(nome)
+    if valor is None or valor == "":
+        return None
+    try:
+        valor = int(valor)
+    except ValueError:
+        raise ParametroInvalido(f"Parâmetro '{nome}' deve ser um inteiro")
+    if minimo is not None and valor < minimo:
+        raise ParametroInvalido(f"Parâmetro '{nome}' deve ser maior ou igual a {minimo}")
+    if maximo is not None and valor > maximo:
+        raise ParametroInvalido(f"Parâmetro '{nome}' deve ser menor ou igual a {maximo}")
+    return valor
+
+
+def aplicar_filtros(query, modelo, campos):
+    """Aplica `?campo=<int>` da query string como igualdade sobre colunas indexadas do modelo."""
+    for campo in campos:
+        valor = parametro_inteiro(campo)
+        if valor is not None:
+            query = query.filter(getattr(modelo, campo) == valor)
+    return query
@@ -1,10 +1,8 @@
-from app import create_app
-from app.extensions import db
+from app import create_app, init_db
 
 app = create_app()
 
-with app.app_context():
-    db.create_all()
-
 if __name__ == "__main__":
+    # servidor de desenvolvimento; em produção use o gunicorn (ver wsgi.py)
+    init_db(app)
     app.run(host="0.0.0.0", port=5000, debug=True)
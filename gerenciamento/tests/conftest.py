@@ -0,0 +1,18 @@
+import pytest
+
+from app import create_app, init_db
+from app.extensions import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'gerenciamento.db'}"})
+    init_db(app)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
@@ -0,0 +1,67 @@
+import pytest
+
+from app.controllers import alteracao_controller
+
+
+def _criar_professor(cliente, nome):
+    return cliente.post("/api/professores/", json={"nome": nome}).get_json()["id"]
+
+
+def test_feed_registra_criacoes_atualizacoes_e_remocoes_em_ordem(cliente):
+    primeiro = _criar_professor(cliente, "Ana")
+    segundo = _criar_professor(cliente, "Bruno")
+    cliente.put(f"/api/professores/{primeiro}", json={"nome": "Ana Maria"})
+    cliente.delete(f"/api/professores/{segundo}")
+
+    resposta = cliente.get("/api/changes")
+
+    corpo = resposta.get_json()
+    assert resposta.status_code == 200
+    assert [(a["entidade"], a["id"], a["operacao"]) for a in corpo["alteracoes"]] == [
+        ("professores", primeiro, "criado"),
+        ("professores", segundo, "criado"),
+        ("professores", primeiro, "atualizado"),
+        ("professores", segundo, "removido"),
+    ]
+    assert corpo["ultimo_seq"] == corpo["alteracoes"][-1]["seq"]
+    assert corpo["tem_mais"] is False
+    assert corpo["geracao"]
+
+
+def test_feed_pagina_por_since_e_limit(cliente):
+    ids = [_criar_professor(cliente, f"Professor {i}") for i in range(3)]
+
+    primeira = cliente.get("/api/changes?limit=2").get_json()
+    assert [a["id"] for a in primeira["alteracoes"]] == ids[:2]
+    assert primeira["tem_mais"] is True
+
+    ultimo = primeira["alteracoes"][-1]["seq"]
+    segunda = cliente.get(f"/api/changes?since={ultimo}&limit=2").get_json()
+    assert [a["id"] for a in segunda["alteracoes"]] == ids[2:]
+    assert segunda["tem_mais"] is False
+
+
+def test_feed_sem_parametros_usa_o_limite_padrao(cliente, monkeypatch):
+    monkeypatch.setattr(alteracao_controller, "LIMITE_PADRAO", 1)
+    _criar_professor(cliente, "Ana")
+    _criar_professor(cliente, "Bruno")
+
+    corpo = cliente.get("/api/changes").get_json()
+
+    assert len(corpo["alteracoes"]) == 1
+    assert corpo["tem_mais"] is True
+
+
+@pytest.mark.parametrize("consulta", [
+    "since=abc",
+    "since=-1",
+    "since=1.5",
+    "limit=0",
+    "limit=abc",
+    f"limit={alteracao_controller.LIMITE_MAXIMO + 1}",
+])
+def test_since_ou_limit_invalido_devolve_400(cliente, consulta):
+    resposta = cliente.get(f"/api/changes?{consulta}")
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
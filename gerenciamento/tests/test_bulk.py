@@ -0,0 +1,81 @@
+import json
+
+from sqlalchemy import text
+
+from app import bulk
+from app.extensions import db
+from app.models.alteracao import Alteracao
+from app.models.professor import Professor
+
+
+def _proibir_nome(nome):
+    """Faz o banco recusar um nome específico, simulando uma falha só detectável no INSERT."""
+    db.session.execute(text(
+        "CREATE TRIGGER proibir_nome BEFORE INSERT ON professores "
+        f"WHEN NEW.nome = '{nome}' BEGIN SELECT RAISE(ABORT, 'nome proibido'); END"
+    ))
+    db.session.commit()
+
+
+def test_cria_todos_os_registros_validos_e_aponta_as_linhas_invalidas(cliente):
+    resposta = cliente.post("/api/professores/bulk", json=[
+        {"nome": "Ana", "materia": "Física"},
+        {"materia": "Química"},
+        {"nome": 42},
+        "Bruno",
+        {"nome": "Carla"},
+    ])
+
+    corpo = resposta.get_json()
+    assert resposta.status_code == 201
+    assert [c["linha"] for c in corpo["criados"]] == [1, 5]
+    assert [e["linha"] for e in corpo["erros"]] == [2, 3, 4]
+    assert [p.nome for p in Professor.query.order_by(Professor.id)] == ["Ana", "Carla"]
+
+
+def test_aceita_ndjson(cliente):
+    corpo = "\n".join(json.dumps({"nome": f"Professor {i}"}) for i in range(3))
+    resposta = cliente.post("/api/professores/bulk", data=corpo, content_type="application/x-ndjson")
+
+    assert resposta.status_code == 201
+    assert len(resposta.get_json()["criados"]) == 3
+
+
+def test_falha_no_banco_isola_a_linha_e_preserva_o_resto_do_lote(cliente, monkeypatch):
+    monkeypatch.setattr(bulk, "TAMANHO_LOTE", 2)
+    _proibir_nome("Proibido")
+
+    resposta = cliente.post("/api/professores/bulk", json=[
+        {"nome": "Ana"},
+        {"nome": "Bruno"},
+        {"nome": "Carla"},
+        {"nome": "Proibido"},
+        {"nome": "Davi"},
+    ])
+
+    corpo = resposta.get_json()
+    assert resposta.status_code == 201
+    assert [c["linha"] for c in corpo["criados"]] == [1, 2, 3, 5]
+    assert len(corpo["erros"]) == 1
+    assert corpo["erros"][0]["linha"] == 4
+    assert "nome proibido" in corpo["erros"][0]["erro"]
+
+    nomes = {p.id: p.nome for p in Professor.query}
+    assert sorted(nomes.values()) == ["Ana", "Bruno", "Carla", "Davi"]
+    assert {c["id"] for c in corpo["criados"]} == set(nomes)
+    # o feed só registra o que foi de fato gravado
+    assert sorted(a.entidade_id for a in Alteracao.query) == sorted(nomes)
+
+
+def test_lote_sem_nenhum_registro_criado_devolve_400(cliente):
+    resposta = cliente.post("/api/professores/bulk", json=[{"materia": "Física"}])
+
+    assert resposta.status_code == 400
+    assert resposta.get_json()["criados"] == []
+
+
+def test_corpo_invalido_devolve_400(cliente):
+    resposta = cliente.post("/api/professores/bulk", data="[{", content_type="application/json")
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
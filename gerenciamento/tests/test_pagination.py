@@ -0,0 +1,84 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from app import pagination
+from app.extensions import db
+from app.models.professor import Professor
+
+
+def _criar_professores(quantidade):
+    professores = [Professor(nome=f"Professor {i}", materia="Matemática") for i in range(quantidade)]
+    db.session.add_all(professores)
+    db.session.commit()
+    return [p.id for p in professores]
+
+
+def test_sem_parametros_devolve_a_lista_completa(cliente):
+    ids = _criar_professores(3)
+    resposta = cliente.get("/api/professores/")
+
+    assert [p["id"] for p in resposta.get_json()] == ids
+    assert "X-Next-Cursor" not in resposta.headers
+
+
+def test_cursor_e_estavel_com_insercoes_e_remocoes_entre_paginas(cliente):
+    ids = _criar_professores(5)
+
+    primeira = cliente.get("/api/professores/?limit=2")
+    assert [p["id"] for p in primeira.get_json()] == ids[:2]
+    assert primeira.headers["X-Next-Cursor"] == str(ids[1])
+    link = urlparse(primeira.headers["Link"].split(";")[0].strip("<>"))
+    assert parse_qs(link.query) == {"after": [str(ids[1])], "limit": ["2"]}
+
+    # entre as páginas, um registro já lido some e outro é criado no fim
+    db.session.delete(db.session.get(Professor, ids[0]))
+    db.session.commit()
+    novo = _criar_professores(1)[0]
+
+    vistos = [p["id"] for p in primeira.get_json()]
+    cursor = primeira.headers["X-Next-Cursor"]
+    while cursor:
+        pagina = cliente.get(f"/api/professores/?limit=2&after={cursor}")
+        vistos += [p["id"] for p in pagina.get_json()]
+        cursor = pagina.headers.get("X-Next-Cursor")
+
+    # nada pulado nem repetido: a posição é o id, não um deslocamento
+    assert vistos == ids + [novo]
+
+
+def test_limite_e_limitado_ao_maximo(cliente, monkeypatch):
+    monkeypatch.setattr(pagination, "LIMITE_MAXIMO", 2)
+    ids = _criar_professores(3)
+    resposta = cliente.get("/api/professores/?limit=500")
+
+    assert [p["id"] for p in resposta.get_json()] == ids[:2]
+    assert resposta.headers["X-Next-Cursor"] == str(ids[1])
+
+
+@pytest.mark.parametrize("consulta", ["after=abc", "after=-1", "limit=0", "limit=1.5"])
+def test_cursor_ou_limite_invalido_devolve_400(cliente, consulta):
+    resposta = cliente.get(f"/api/professores/?{consulta}")
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
+
+
+def test_stream_transmite_todas_as_linhas_em_ordem(cliente):
+    ids = _criar_professores(4)
+    resposta = cliente.get("/api/professores/?stream=true")
+
+    assert resposta.is_streamed
+    assert resposta.mimetype == "application/json"
+    assert [p["id"] for p in resposta.get_json()] == ids
+
+
+def test_stream_respeita_cursor_e_limite(cliente):
+    ids = _criar_professores(5)
+    resposta = cliente.get(f"/api/professores/?stream=1&after={ids[0]}&limit=2")
+
+    assert [p["id"] for p in resposta.get_json()] == ids[1:3]
+
+
+def test_stream_vazio_e_um_array_json_valido(cliente):
+    assert cliente.get("/api/professores/?stream=true").get_json() == []
@@ -0,0 +1,114 @@
+import pytest
+
+from app.controllers import validacao_controller
+from app.extensions import db
+from app.models.professor import Professor
+from app.models.turma import Turma
+
+
+def _criar(modelo, quantidade, **campos):
+    registros = [modelo(nome=f"{modelo.__name__} {i}", **campos) for i in range(quantidade)]
+    db.session.add_all(registros)
+    db.session.commit()
+    return [r.id for r in registros]
+
+
+def test_validate_separa_existentes_de_inexistentes(cliente):
+    professores = _criar(Professor, 2)
+    turmas = _criar(Turma, 1)
+
+    resposta = cliente.post("/api/validate", json={
+        "professores": [professores[1], 999, professores[0], professores[0]],
+        "turmas": [turmas[0], 998],
+        "alunos": [997],
+    })
+
+    assert resposta.status_code == 200
+    assert resposta.get_json() == {
+        "professores": {"existentes": sorted(professores), "inexistentes": [999]},
+        "turmas": {"existentes": turmas, "inexistentes": [998]},
+        "alunos": {"existentes": [], "inexistentes": [997]},
+    }
+
+
+def test_validate_divide_o_in_em_lotes(cliente, monkeypatch):
+    monkeypatch.setattr(validacao_controller, "TAMANHO_LOTE_IN", 2)
+    professores = _criar(Professor, 5)
+    consultados = professores + [1001, 1002]
+
+    resposta = cliente.post("/api/validate", json={"professores": consultados})
+
+    assert resposta.get_json()["professores"] == {
+        "existentes": professores,
+        "inexistentes": [1001, 1002],
+    }
+
+
+def test_validate_aceita_mais_ids_que_o_limite_de_parametros_do_sqlite(cliente):
+    professores = _criar(Professor, 3)
+    consultados = list(range(1, 2 * validacao_controller.TAMANHO_LOTE_IN + 2))
+
+    resposta = cliente.post("/api/validate", json={"professores": consultados})
+
+    resultado = resposta.get_json()["professores"]
+    assert resultado["existentes"] == professores
+    assert len(resultado["inexistentes"]) == len(consultados) - len(professores)
+
+
+@pytest.mark.parametrize("corpo", [
+    {"professores": ["1"]},
+    {"professores": [1.0]},
+    {"professores": [True]},
+    {"professores": [[1]]},
+    {"professores": 1},
+    {"salas": [1]},
+    {},
+    [1, 2],
+])
+def test_validate_rejeita_ids_que_nao_sao_inteiros(cliente, corpo):
+    resposta = cliente.post("/api/validate", json=corpo)
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
+
+
+def test_resolve_devolve_os_registros_encontrados_e_os_ids_inexistentes(cliente):
+    professores = _criar(Professor, 2)
+    turma = Turma(nome="Turma A", professor_id=professores[0])
+    db.session.add(turma)
+    db.session.commit()
+
+    resposta = cliente.post("/api/resolve", json={
+        "professores": [professores[1], 999, professores[0]],
+        "turmas": [turma.id],
+        "alunos": [998],
+    })
+
+    assert resposta.status_code == 200
+    assert resposta.get_json() == {
+        "professores": {
+            "encontrados": [db.session.get(Professor, id).to_dict() for id in professores],
+            "inexistentes": [999],
+        },
+        "turmas": {"encontrados": [turma.to_dict()], "inexistentes": []},
+        "alunos": {"encontrados": [], "inexistentes": [998]},
+    }
+
+
+def test_resolve_divide_o_in_em_lotes(cliente, monkeypatch):
+    monkeypatch.setattr(validacao_controller, "TAMANHO_LOTE_IN", 2)
+    professores = _criar(Professor, 5)
+
+    resposta = cliente.post("/api/resolve", json={"professores": professores + [1001]})
+
+    resultado = resposta.get_json()["professores"]
+    assert [p["id"] for p in resultado["encontrados"]] == professores
+    assert resultado["inexistentes"] == [1001]
+
+
+@pytest.mark.parametrize("corpo", [{"turmas": ["1"]}, {"alunos": [None]}, {"salas": [1]}, {}])
+def test_resolve_rejeita_ids_que_nao_sao_inteiros(cliente, corpo):
+    resposta = cliente.post("/api/resolve", json=corpo)
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
@@ -1,20 +1,58 @@
 from flask import Flask
 from flasgger import Swagger
-from .extensions import db
+from .extensions import db, configurar_sqlite, criar_indices_faltantes
 from .config import Config
+from .profiling import configurar_profiling
 from .controllers import register_controllers
+from .http_client import gerenciamento
+from . import entidades, metrics, replica, validacao
 
-def create_app():
+def init_db(app):
+    """Cria o schema. Executado uma única vez na inicialização, e não a cada import."""
+    from .migrations import deduplicar_reservas, migrar_datas_reserva
+
+    with app.app_context():
+        db.create_all()
+        migrar_datas_reserva()
+        deduplicar_reservas()
+        criar_indices_faltantes()
+
+def create_app(config=None):
+    """`config` sobrescreve valores de `Config` (ex.: outro banco nos testes)."""
     app = Flask(__name__)
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
 
     db.init_app(app)
+    configurar_sqlite(app)
+    metrics.instrumentar(app)
+    configurar_profiling(app)
     Swagger(app)
 
     register_controllers(app)
 
+    @app.cli.command("init-db")
+    def init_db_command():
+        """Cria as tabelas do banco."""
+        init_db(app)
+
     @app.route("/health")
     def health():
         return {"status": "ok"}, 200
 
+    @app.route("/metrics")
+    def metricas():
+        return metrics.resposta()
+
+    @app.route("/health/upstream")
+    def health_upstream():
+        return {
+            "gerenciamento": gerenciamento.estatisticas.resumo(),
+            "cache_validacao": validacao.cache.resumo(),
+            "cache_entidades": entidades.cache.resumo(),
+            "validacoes_em_voo": validacao.consultas.resumo(),
+            "replica": replica.resumo(),
+        }, 200
+
     return app
\ No newline at end of file
@@ -1,12 +1,57 @@
+from datetime import date, timedelta
+
 from flask import Blueprint, jsonify, request
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app.entidades import expandir
 from app.extensions import db
+from app.idempotency import idempotente
 from app.models.reserva import Reserva
+from app.query_filters import ParametroInvalido, aplicar_filtros, parametro_data, parametro_lista
+from app.recorrencia import gerar_datas, ler_dias_semana
+from app.validacao import existe
 import requests
-import os
 
 reserva_bp = Blueprint("reservas", __name__)
 
-GERENCIAMENTO_URL = os.getenv("GERENCIAMENTO_URL", "http://localhost:8001/api/turmas")
+ERRO_DATA = "Campo 'data_reserva' deve ser uma data no formato AAAA-MM-DD"
+
+def converter_data(valor):
+    """Converte `valor` (AAAA-MM-DD) em date; lança ValueError se inválido."""
+    if not isinstance(valor, str):
+        raise ValueError(ERRO_DATA)
+    return date.fromisoformat(valor)
+
+def commit_ou_conflito(sala, data_reserva):
+    """
+    Confirma a transação. Se o índice único (sala, data_reserva) rejeitar a
+    escrita, desfaz e devolve a resposta 409 com a reserva conflitante.
+    """
+    try:
+        db.session.commit()
+        return None
+    except IntegrityError:
+        db.session.rollback()
+        conflito = Reserva.query.filter_by(sala=sala, data_reserva=data_reserva).first()
+        if conflito is None:
+            raise
+        return jsonify({
+            "erro": f"Sala {sala} já reservada em {data_reserva}.",
+            "conflito": conflito.to_dict()
+        }), 409
+
+def inserir_datas_individualmente(sala, turma_id, datas):
+    """Grava cada data em seu próprio savepoint; as que colidirem com outra reserva são puladas."""
+    novas = []
+    for data_reserva in datas:
+        reserva = Reserva(sala=sala, data_reserva=data_reserva, turma_id=turma_id)
+        try:
+            with db.session.begin_nested():
+                db.session.add(reserva)
+        except IntegrityError:
+            continue
+        novas.append(reserva)
+    return novas
 
 @reserva_bp.route("/", methods=["GET"])
 def listar_reservas():
@@ -15,6 +60,39 @@ def listar_reservas():
     ---
     tags:
       - Reservas
+    description: |
+      Os filtros são atendidos pelos índices (sala, data_reserva),
+      (turma_id, data_reserva) e data_reserva.
+    parameters:
+      - in: query
+        name: from
+        type: string
+        format: date
+        required: false
+        description: Reservas a partir desta data, inclusive (AAAA-MM-DD)
+      - in: query
+        name: to
+        type: string
+        format: date
+        required: false
+        description: Reservas até esta data, inclusive (AAAA-MM-DD)
+      - in: query
+        name: sala
+        type: string
+        required: false
+        description: Filtra pelas reservas da sala
+      - in: query
+        name: turma_id
+        type: integer
+        required: false
+        description: Filtra pelas reservas da turma
+      - in: query
+        name: expand
+        type: string
+        required: false
+        description: |
+          Use `turma` para embutir a turma em cada reserva. As turmas da lista
+          são resolvidas juntas, em uma única chamada ao gerenciamento.
     responses:
       200:
         description: Lista de reservas
@@ -32,9 +110,153 @@ def listar_reservas():
                 format: date
               turma_id:
                 type: integer
+      400:
+        description: Parâmetros de filtro inválidos
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+      500:
+        description: Erro ao contatar serviço de gerenciamento (com `expand`)
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+    """
+    try:
+        query = aplicar_filtros(Reserva.query, Reserva, ["turma_id"])
+        de = parametro_data("from")
+        ate = parametro_data("to")
+        expand = parametro_lista("expand", ["turma"])
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+
+    sala = request.args.get("sala")
+    if sala:
+        query = query.filter(Reserva.sala == sala)
+    if de:
+        query = query.filter(Reserva.data_reserva >= de)
+    if ate:
+        query = query.filter(Reserva.data_reserva <= ate)
+
+    reservas = [r.to_dict() for r in query.order_by(Reserva.id).all()]
+
+    try:
+        expandir(reservas, expand)
+    except requests.exceptions.RequestException:
+        return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento."}), 500
+    return jsonify(reservas)
+
+# limite de dias por consulta de disponibilidade
+MAXIMO_DIAS_DISPONIBILIDADE = 366
+
+@reserva_bp.route("/disponibilidade", methods=["GET"])
+def consultar_disponibilidade():
+    """
+    Consulta a disponibilidade de salas em um intervalo de datas
+    ---
+    tags:
+      - Reservas
+    summary: Informa, para cada sala e dia, se a sala está livre
+    description: |
+      Responde com uma única consulta de intervalo sobre o índice (sala, data_reserva).
+      Sem `salas`, considera todas as salas que já tiveram alguma reserva.
+    parameters:
+      - in: query
+        name: from
+        type: string
+        format: date
+        required: true
+        description: Primeiro dia do intervalo (AAAA-MM-DD)
+      - in: query
+        name: to
+        type: string
+        format: date
+        required: true
+        description: Último dia do intervalo, inclusive (AAAA-MM-DD)
+      - in: query
+        name: salas
+        type: string
+        required: false
+        description: Salas separadas por vírgula (ex. "Sala 101,LAB-1")
+    responses:
+      200:
+        description: Disponibilidade por sala e dia
+        schema:
+          type: object
+          properties:
+            de:
+              type: string
+              format: date
+            ate:
+              type: string
+              format: date
+            salas:
+              type: object
+              additionalProperties:
+                type: array
+                items:
+                  type: object
+                  properties:
+                    data:
+                      type: string
+                      format: date
+                    livre:
+                      type: boolean
+                    reserva_id:
+                      type: integer
+                    turma_id:
+                      type: integer
+      400:
+        description: Parâmetros inválidos
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
     """
-    reservas = Reserva.query.all()
-    return jsonify([r.to_dict() for r in reservas])
+    try:
+        de = parametro_data("from")
+        ate = parametro_data("to")
+    except ParametroInvalido as e:
+        return jsonify({"erro": str(e)}), 400
+    if de is None or ate is None:
+        return jsonify({"erro": "Parâmetros obrigatórios: from, to"}), 400
+    if ate < de:
+        return jsonify({"erro": "'to' deve ser maior ou igual a 'from'"}), 400
+    dias = (ate - de).days + 1
+    if dias > MAXIMO_DIAS_DISPONIBILIDADE:
+        return jsonify({"erro": f"Intervalo máximo de {MAXIMO_DIAS_DISPONIBILIDADE} dias"}), 400
+
+    salas = [s.strip() for s in request.args.get("salas", "").split(",") if s.strip()]
+    if not salas:
+        salas = [s for (s,) in db.session.query(Reserva.sala).distinct().order_by(Reserva.sala)]
+
+    ocupadas = {}
+    if salas:
+        linhas = db.session.query(
+            Reserva.id, Reserva.sala, Reserva.data_reserva, Reserva.turma_id
+        ).filter(
+            Reserva.sala.in_(salas),
+            Reserva.data_reserva.between(de, ate)
+        )
+        for id, sala, data_reserva, turma_id in linhas:
+            ocupadas[(sala, data_reserva)] = {"reserva_id": id, "turma_id": turma_id}
+
+    datas = [de + timedelta(days=i) for i in range(dias)]
+    resultado = {}
+    for sala in salas:
+        resultado[sala] = []
+        for data in datas:
+            ocupacao = ocupadas.get((sala, data))
+            item = {"data": data.isoformat(), "livre": ocupacao is None}
+            if ocupacao:
+                item.update(ocupacao)
+            resultado[sala].append(item)
+
+    return jsonify({"de": de.isoformat(), "ate": ate.isoformat(), "salas": resultado}), 200
 
 @reserva_bp.route("/<int:id>", methods=["GET"])
 def obter_reserva(id):
@@ -79,6 +301,7 @@ def obter_reserva(id):
     return jsonify(reserva.to_dict()), 200
 
 @reserva_bp.route("/", methods=["POST"])
+@idempotente
 def criar_reserva():
     """
     Cria uma nova reserva
@@ -88,6 +311,11 @@ def criar_reserva():
     consumes:
       - application/json
     parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
       - in: body
         name: body
         required: true
@@ -128,6 +356,17 @@ def criar_reserva():
           properties:
             erro:
               type: string
+      409:
+        description: A sala já está reservada nesta data
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+              example: Sala LAB-101 já reservada em 2025-01-15.
+            conflito:
+              type: object
+              description: Reserva existente que ocupa a sala
       500:
         description: Erro ao comunicar com o serviço de gerenciamento
         schema:
@@ -141,25 +380,201 @@ def criar_reserva():
         return jsonify({"erro": "Campos obrigatórios: sala, data_reserva, turma_id"}), 400
 
     turma_id = data["turma_id"]
+    try:
+        data_reserva = converter_data(data["data_reserva"])
+    except ValueError:
+        return jsonify({"erro": ERRO_DATA}), 400
 
     # valida se a turma existe no serviço de gerenciamento
     try:
-        response = requests.get(f"{GERENCIAMENTO_URL}/{turma_id}")
-        if response.status_code != 200:
+        if not existe("turmas", turma_id):
             return jsonify({"erro": f"Turma {turma_id} não encontrada no serviço de gerenciamento."}), 400
     except requests.exceptions.RequestException:
         return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento."}), 500
 
     nova = Reserva(
         sala=data["sala"],
-        data_reserva=data["data_reserva"],
+        data_reserva=data_reserva,
         turma_id=turma_id
     )
 
     db.session.add(nova)
-    db.session.commit()
+    conflito = commit_ou_conflito(nova.sala, nova.data_reserva)
+    if conflito:
+        return conflito
     return jsonify(nova.to_dict()), 201
 
+@reserva_bp.route("/recorrente", methods=["POST"])
+@idempotente
+def criar_reserva_recorrente():
+    """
+    Cria as reservas de uma regra de recorrência
+    ---
+    tags:
+      - Reservas
+    summary: Reserva uma sala em dias da semana fixos dentro de um período
+    description: |
+      Valida a turma uma única vez, verifica conflitos de todas as datas com uma
+      consulta indexada e insere todas as ocorrências com um único INSERT, em
+      uma única transação. Havendo conflitos, nada é gravado (409), a menos que
+      `ignorar_conflitos` seja verdadeiro; nesse caso apenas as datas livres são
+      reservadas, inclusive quando outra requisição ocupa alguma delas durante
+      a gravação.
+    consumes:
+      - application/json
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        type: string
+        required: false
+        description: Chave única por operação; repetições com a mesma chave devolvem a resposta original
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required: [sala, turma_id, inicio, fim, dias_semana]
+          properties:
+            sala:
+              type: string
+              example: LAB-101
+            turma_id:
+              type: integer
+              example: 1
+            inicio:
+              type: string
+              format: date
+              example: 2025-08-04
+            fim:
+              type: string
+              format: date
+              description: Último dia, inclusive; no máximo 731 dias depois de `inicio`
+              example: 2025-12-12
+            dias_semana:
+              type: array
+              description: 0 = segunda ... 6 = domingo, ou "seg", "ter", "qua", "qui", "sex", "sab", "dom"
+              items:
+                type: string
+              example: ["ter", "qui"]
+            intervalo:
+              type: integer
+              description: Repetir a cada N semanas
+              default: 1
+              example: 1
+            ignorar_conflitos:
+              type: boolean
+              default: false
+    responses:
+      201:
+        description: Reservas criadas
+        schema:
+          type: object
+          properties:
+            criadas:
+              type: array
+              items:
+                type: object
+            conflitos:
+              type: array
+              description: Datas não reservadas por já estarem ocupadas
+              items:
+                type: object
+                properties:
+                  data:
+                    type: string
+                    format: date
+                  reserva:
+                    type: object
+      400:
+        description: Regra inválida ou turma não encontrada
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+      409:
+        description: Há datas em conflito (nada foi gravado)
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+            conflitos:
+              type: array
+              items:
+                type: object
+      500:
+        description: Erro ao comunicar com o serviço de gerenciamento
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+    """
+    data = request.get_json(silent=True)
+    campos = ["sala", "turma_id", "inicio", "fim", "dias_semana"]
+    if not data or not all(c in data for c in campos):
+        return jsonify({"erro": f"Campos obrigatórios: {', '.join(campos)}"}), 400
+
+    sala = data["sala"]
+    turma_id = data["turma_id"]
+    try:
+        inicio = converter_data(data["inicio"])
+        fim = converter_data(data["fim"])
+    except ValueError:
+        return jsonify({"erro": "Campos 'inicio' e 'fim' devem ser datas no formato AAAA-MM-DD"}), 400
+    try:
+        datas = gerar_datas(inicio, fim, ler_dias_semana(data["dias_semana"]), data.get("intervalo", 1))
+    except ValueError as e:
+        return jsonify({"erro": str(e)}), 400
+    if not datas:
+        return jsonify({"erro": "A regra não gera nenhuma data no período"}), 400
+
+    # valida a turma uma única vez para todas as ocorrências
+    try:
+        if not existe("turmas", turma_id):
+            return jsonify({"erro": f"Turma {turma_id} não encontrada no serviço de gerenciamento."}), 400
+    except requests.exceptions.RequestException:
+        return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento."}), 500
+
+    def buscar_conflitos():
+        # uma consulta de intervalo sobre o índice (sala, data_reserva)
+        ocupadas = Reserva.query.filter(
+            Reserva.sala == sala, Reserva.data_reserva.between(datas[0], datas[-1])
+        ).all()
+        pedidas = set(datas)
+        return [
+            {"data": r.data_reserva.isoformat(), "reserva": r.to_dict()}
+            for r in sorted(ocupadas, key=lambda r: r.data_reserva)
+            if r.data_reserva in pedidas
+        ]
+
+    conflitos = buscar_conflitos()
+    if conflitos and not data.get("ignorar_conflitos"):
+        return jsonify({"erro": "Há datas em conflito; nenhuma reserva foi criada.", "conflitos": conflitos}), 409
+
+    datas_ocupadas = {date.fromisoformat(c["data"]) for c in conflitos}
+    livres = [d for d in datas if d not in datas_ocupadas]
+    try:
+        # um INSERT de várias linhas com RETURNING, em vez de um INSERT por data no flush
+        novas = db.session.scalars(
+            insert(Reserva).returning(Reserva),
+            [{"sala": sala, "data_reserva": d, "turma_id": turma_id} for d in livres],
+        ).all() if livres else []
+    except IntegrityError:
+        # outra requisição ocupou alguma das datas entre a verificação e a gravação
+        db.session.rollback()
+        if not data.get("ignorar_conflitos"):
+            return jsonify({"erro": "Há datas em conflito; nenhuma reserva foi criada.", "conflitos": buscar_conflitos()}), 409
+        novas = inserir_datas_individualmente(sala, turma_id, livres)
+        ids_novas = {r.id for r in novas}
+        conflitos = [c for c in buscar_conflitos() if c["reserva"]["id"] not in ids_novas]
+
+    # serializa antes do commit, que expiraria as reservas e obrigaria a relê-las uma a uma
+    resposta = {"criadas": [r.to_dict() for r in novas], "conflitos": conflitos}
+    db.session.commit()
+    return jsonify(resposta), 201
+
 @reserva_bp.route("/<int:id>", methods=["PUT"])
 def atualizar_reserva(id):
     """
@@ -221,6 +636,17 @@ def atualizar_reserva(id):
           properties:
             erro:
               type: string
+      409:
+        description: A sala já está reservada nesta data
+        schema:
+          type: object
+          properties:
+            erro:
+              type: string
+              example: Sala LAB-101 já reservada em 2025-01-15.
+            conflito:
+              type: object
+              description: Reserva existente que ocupa a sala
       500:
         description: Erro ao comunicar com o serviço de gerenciamento
         schema:
@@ -234,20 +660,30 @@ def atualizar_reserva(id):
         return jsonify({"erro": "Reserva não encontrada"}), 404
 
     data = request.get_json()
-    if "sala" in data:
-        reserva.sala = data["sala"]
     if "data_reserva" in data:
-        reserva.data_reserva = data["data_reserva"]
+        try:
+            data_reserva = converter_data(data["data_reserva"])
+        except ValueError:
+            return jsonify({"erro": ERRO_DATA}), 400
+    # valida a turma antes de alterar a reserva: a consulta à réplica dispararia
+    # o autoflush do UPDATE, e um conflito de sala/data escaparia do 409
     if "turma_id" in data:
         try:
-            turma = requests.get(f"{GERENCIAMENTO_URL}/turmas/{data['turma_id']}")
-            if turma.status_code != 200:
+            if not existe("turmas", data["turma_id"]):
                 return jsonify({"erro": f"Turma {data['turma_id']} não encontrada."}), 400
-            reserva.turma_id = data["turma_id"]
         except requests.exceptions.RequestException:
             return jsonify({"erro": "Falha ao conectar ao serviço de gerenciamento."}), 500
 
-    db.session.commit()
+    if "sala" in data:
+        reserva.sala = data["sala"]
+    if "data_reserva" in data:
+        reserva.data_reserva = data_reserva
+    if "turma_id" in data:
+        reserva.turma_id = data["turma_id"]
+
+    conflito = commit_ou_conflito(reserva.sala, reserva.data_reserva)
+    if conflito:
+        return conflito
     return jsonify(reserva.to_dict()), 200
 
 @reserva_bp.route("/<int:id>", methods=["DELETE"])
@@ -1,3 +1,5 @@
+from datetime import date
+
 from flask import Blueprint, jsonify
 from app.extensions import db
 from app.models.reserva import Reserva
@@ -41,13 +43,16 @@ def seed_data():
     db.create_all()
 
     reservas = [
-        Reserva(sala="Sala 101", data_reserva="2025-11-20", turma_id=1),
-        Reserva(sala="Sala 202", data_reserva="2025-11-21", turma_id=2),
+        Reserva(sala="Sala 101", data_reserva=date(2025, 11, 20), turma_id=1),
+        Reserva(sala="Sala 202", data_reserva=date(2025, 11, 21), turma_id=2),
     ]
     db.session.add_all(reservas)
-    db.session.commit()
+    db.session.flush()
 
-    return jsonify({
+    # serializa antes do commit, que expiraria os objetos e obrigaria a relê-los do banco
+    resposta = {
         "message": "Banco de reservas populado!",
-        "reservas": [r.to_dict() for r in Reserva.query.all()]
-    }), 201
+        "reservas": [r.to_dict() for r in reservas]
+    }
+    db.session.commit()
+    return jsonify(resposta), 201
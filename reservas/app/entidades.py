@@ -0,0 +1,76 @@
+# Módulo compartilhado: mantenha idêntico em reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+import os
+
+from app import validacao
+from app.caching import CacheTTL
+from app.http_client import gerenciamento
+
+ENTIDADES_CACHE_TAMANHO = int(os.getenv("ENTIDADES_CACHE_TAMANHO", "10000"))
+# nomes mudam raramente; um registro desatualizado vive no máximo este tempo (s)
+ENTIDADES_CACHE_TTL = float(os.getenv("ENTIDADES_CACHE_TTL", "60"))
+
+# nome aceito em `?expand=` -> (campo com o ID, entidade no gerenciamento)
+EXPANSOES = {
+    "professor": ("professor_id", "professores"),
+    "turma": ("turma_id", "turmas"),
+}
+
+cache = CacheTTL(ENTIDADES_CACHE_TAMANHO)
+
+
+def resolver(pedido):
+    """
+    Busca professores, turmas e alunos do gerenciamento. `pedido` é
+    `{entidade: IDs}`; retorna `{entidade: {id: registro ou None}}`.
+
+    Os registros ficam em cache por ENTIDADES_CACHE_TTL segundos e tudo o que
+    faltar é buscado em uma única chamada `POST /resolve`, qualquer que seja
+    o número de IDs. Falhas propagam `requests.exceptions.RequestException`.
+    """
+    resultado = {entidade: {} for entidade in pedido}
+    faltantes = {}
+    for entidade, ids in pedido.items():
+        for id in set(ids):
+            encontrado, registro = cache.obter((entidade, id))
+            if encontrado:
+                resultado[entidade][id] = registro
+            else:
+                faltantes.setdefault(entidade, []).append(id)
+    if not faltantes:
+        return resultado
+
+    resposta = gerenciamento.post("/resolve", json={e: sorted(ids) for e, ids in faltantes.items()})
+    resposta.raise_for_status()
+
+    for entidade, dados in resposta.json().items():
+        for registro in dados["encontrados"]:
+            id = registro["id"]
+            resultado[entidade][id] = registro
+            cache.guardar((entidade, id), registro, ENTIDADES_CACHE_TTL)
+            # quem foi encontrado também já está validado
+            validacao.cache.guardar((entidade, str(id)), True, validacao.VALIDACAO_CACHE_TTL)
+        for id in dados["inexistentes"]:
+            resultado[entidade][id] = None
+            cache.guardar((entidade, id), None, validacao.VALIDACAO_CACHE_TTL_NEGATIVO)
+            validacao.cache.guardar((entidade, str(id)), False, validacao.VALIDACAO_CACHE_TTL_NEGATIVO)
+    return resultado
+
+
+def expandir(itens, nomes):
+    """
+    Embute em cada dicionário de `itens` os registros pedidos em `nomes`
+    (ex.: `["turma"]` acrescenta `item["turma"]` a partir de `item["turma_id"]`).
+    Os IDs distintos de todos os itens são resolvidos juntos, em no máximo
+    uma chamada ao gerenciamento. Um ID inexistente vira None.
+    """
+    if not nomes or not itens:
+        return itens
+    entidades = resolver({
+        EXPANSOES[nome][1]: [item[EXPANSOES[nome][0]] for item in itens] for nome in nomes
+    })
+    for item in itens:
+        for nome in nomes:
+            campo, entidade = EXPANSOES[nome]
+            item[nome] = entidades[entidade].get(item[campo])
+    return itens
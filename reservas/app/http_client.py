@@ -0,0 +1,144 @@
+# Módulo compartilhado: mantenha idêntico em reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+import os
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import TimeoutError as TimeoutUrllib3
+from urllib3.util.retry import Retry
+
+from app import metrics
+
+# variáveis de ambiente definidas no docker-compose
+GERENCIAMENTO_URL = os.getenv("GERENCIAMENTO_URL", "http://localhost:8001/api")
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "2"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "5"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.2"))
+
+AMOSTRAS_LATENCIA = 256
+
+
+class EstatisticasLatencia:
+    """Contadores de latência por chamada, seguros para uso entre threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._chamadas = {}
+
+    def registrar(self, nome, duracao_ms, erro=False):
+        with self._lock:
+            item = self._chamadas.get(nome)
+            if item is None:
+                item = self._chamadas[nome] = {
+                    "chamadas": 0,
+                    "erros": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "amostras": deque(maxlen=AMOSTRAS_LATENCIA),
+                }
+            item["chamadas"] += 1
+            item["erros"] += int(erro)
+            item["total_ms"] += duracao_ms
+            item["max_ms"] = max(item["max_ms"], duracao_ms)
+            item["amostras"].append(duracao_ms)
+
+    def resumo(self):
+        with self._lock:
+            copia = {nome: dict(item, amostras=sorted(item["amostras"])) for nome, item in self._chamadas.items()}
+
+        resultado = {}
+        for nome, item in copia.items():
+            amostras = item["amostras"]
+            resultado[nome] = {
+                "chamadas": item["chamadas"],
+                "erros": item["erros"],
+                "media_ms": round(item["total_ms"] / item["chamadas"], 2),
+                "max_ms": round(item["max_ms"], 2),
+                "p50_ms": round(amostras[len(amostras) // 2], 2),
+                "p95_ms": round(amostras[min(len(amostras) - 1, int(len(amostras) * 0.95))], 2),
+            }
+        return resultado
+
+
+def _resultado(status_code):
+    """Classifica a resposta para as métricas: hit (2xx/3xx), 404 ou error."""
+    if status_code == 404:
+        return "404"
+    return "hit" if status_code < 400 else "error"
+
+
+def _eh_timeout(erro):
+    # com novas tentativas, um timeout de leitura chega como ConnectionError(MaxRetryError(ReadTimeoutError))
+    if isinstance(erro, requests.exceptions.Timeout):
+        return True
+    causa = erro.args[0] if erro.args else None
+    return isinstance(getattr(causa, "reason", None), TimeoutUrllib3)
+
+
+class HttpClient:
+    """
+    Cliente HTTP compartilhado para as chamadas entre serviços.
+
+    Reaproveita conexões (keep-alive) através de um pool por host, aplica
+    timeouts de conexão/leitura e faz um número limitado de novas tentativas
+    com backoff. Usado apenas para consultas sem efeitos colaterais, por isso
+    as novas tentativas também valem para POST.
+    """
+
+    def __init__(self, nome, base_url, pool_size=HTTP_POOL_SIZE, connect_timeout=HTTP_CONNECT_TIMEOUT,
+                 read_timeout=HTTP_READ_TIMEOUT, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF):
+        self.nome = nome
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.estatisticas = EstatisticasLatencia()
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, caminho, **kwargs):
+        return self._request("GET", caminho, **kwargs)
+
+    def post(self, caminho, **kwargs):
+        return self._request("POST", caminho, **kwargs)
+
+    def _request(self, metodo, caminho, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        entidade = caminho.strip("/").split("/")[0]
+        nome = f"{metodo} /{entidade}"
+
+        inicio = time.perf_counter()
+        try:
+            resposta = self.session.request(metodo, f"{self.base_url}{caminho}", **kwargs)
+        except requests.exceptions.RequestException as e:
+            duracao = time.perf_counter() - inicio
+            self.estatisticas.registrar(nome, duracao * 1000, erro=True)
+            resultado = "timeout" if _eh_timeout(e) else "error"
+            metrics.registrar_chamada_externa(self.nome, entidade, resultado, duracao)
+            raise
+
+        duracao = time.perf_counter() - inicio
+        self.estatisticas.registrar(nome, duracao * 1000, erro=resposta.status_code >= 500)
+        metrics.registrar_chamada_externa(self.nome, entidade, _resultado(resposta.status_code), duracao)
+        return resposta
+
+
+gerenciamento = HttpClient("gerenciamento", GERENCIAMENTO_URL)
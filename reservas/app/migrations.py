@@ -0,0 +1,102 @@
+import logging
+from datetime import date, datetime
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# formatos aceitos antes de `data_reserva` virar uma coluna Date
+FORMATOS_LEGADOS = ("%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S")
+
+
+def _converter(valor):
+    for formato in FORMATOS_LEGADOS:
+        try:
+            return datetime.strptime(valor.strip(), formato).date()
+        except ValueError:
+            continue
+    return None
+
+
+def migrar_datas_reserva():
+    """
+    Normaliza `reservas.data_reserva` (antes String(20) livre) para o formato
+    ISO AAAA-MM-DD usado pela coluna Date, que é a representação da data no
+    SQLite. Toda linha é conferida com `date.fromisoformat`, pois o formato
+    certo não garante uma data válida (ex.: 2024-13-45). Linhas com datas
+    irreconhecíveis são copiadas para `reservas_datas_invalidas` e removidas,
+    para não quebrar a leitura da tabela.
+    Também remove o índice simples de `turma_id`, substituído por (turma_id, data_reserva).
+    """
+    conexao = db.session.connection()
+    conexao.exec_driver_sql("DROP INDEX IF EXISTS ix_reservas_turma_id")
+
+    convertidas, invalidas = [], []
+    for id, valor in conexao.exec_driver_sql("SELECT id, data_reserva FROM reservas ORDER BY id").all():
+        if not isinstance(valor, str):
+            invalidas.append(id)
+            continue
+        try:
+            # o Python 3.11 aceita outras formas ISO (ex.: 20240115); só AAAA-MM-DD é lido pela coluna
+            if date.fromisoformat(valor).isoformat() == valor:
+                continue
+        except ValueError:
+            pass
+        data = _converter(valor)
+        if data is None:
+            invalidas.append(id)
+        else:
+            convertidas.append((data.isoformat(), id))
+
+    if convertidas:
+        conexao.exec_driver_sql("UPDATE reservas SET data_reserva = ? WHERE id = ?", convertidas)
+
+    if invalidas:
+        marcadores = ", ".join("?" for _ in invalidas)
+        conexao.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS reservas_datas_invalidas AS SELECT * FROM reservas WHERE 0"
+        )
+        conexao.exec_driver_sql(
+            f"INSERT INTO reservas_datas_invalidas SELECT * FROM reservas WHERE id IN ({marcadores})",
+            tuple(invalidas),
+        )
+        conexao.exec_driver_sql(f"DELETE FROM reservas WHERE id IN ({marcadores})", tuple(invalidas))
+        logger.warning(
+            "%d reserva(s) com data inválida movida(s) para reservas_datas_invalidas: %s",
+            len(invalidas), invalidas
+        )
+
+    db.session.commit()
+    if convertidas:
+        logger.info("%d data(s) de reserva convertida(s) para AAAA-MM-DD", len(convertidas))
+
+
+def deduplicar_reservas():
+    """
+    Prepara `reservas` para o índice único (sala, data_reserva): quando a
+    mesma sala tem mais de uma reserva no mesmo dia (o que a normalização das
+    datas legadas pode revelar), mantém a mais antiga (menor id), que ocupou a
+    sala primeiro, e move as demais para `reservas_duplicadas`.
+    """
+    conexao = db.session.connection()
+    duplicadas = conexao.exec_driver_sql(
+        "SELECT id FROM reservas WHERE id NOT IN "
+        "(SELECT MIN(id) FROM reservas GROUP BY sala, data_reserva)"
+    ).scalars().all()
+
+    if duplicadas:
+        marcadores = ", ".join("?" for _ in duplicadas)
+        conexao.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS reservas_duplicadas AS SELECT * FROM reservas WHERE 0"
+        )
+        conexao.exec_driver_sql(
+            f"INSERT INTO reservas_duplicadas SELECT * FROM reservas WHERE id IN ({marcadores})",
+            tuple(duplicadas),
+        )
+        conexao.exec_driver_sql(f"DELETE FROM reservas WHERE id IN ({marcadores})", tuple(duplicadas))
+        logger.warning(
+            "%d reserva(s) duplicada(s) de uma mesma sala/data movida(s) para reservas_duplicadas: %s",
+            len(duplicadas), duplicadas
+        )
+
+    db.session.commit()
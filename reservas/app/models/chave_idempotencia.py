@@ -0,0 +1,16 @@
+# Módulo compartilhado: mantenha idêntico em gerenciamento/, reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+from app.extensions import db
+
+
+class ChaveIdempotencia(db.Model):
+    """Resposta registrada para uma `Idempotency-Key` (status nulo = em processamento)."""
+
+    __tablename__ = "chaves_idempotencia"
+
+    # sha256 de "MÉTODO rota chave-do-cliente"
+    chave = db.Column(db.String(64), primary_key=True)
+    hash_requisicao = db.Column(db.String(64), nullable=False)
+    status = db.Column(db.Integer)
+    corpo = db.Column(db.Text)
+    criado_em = db.Column(db.DateTime, nullable=False, index=True)
@@ -0,0 +1,23 @@
+# Módulo compartilhado: mantenha idêntico em reservas/ e atividades/
+# (verificado por tests/test_modulos_compartilhados.py).
+from app.extensions import db
+
+
+class ReplicaId(db.Model):
+    """IDs válidos de Professores/Turmas/Alunos replicados do gerenciamento."""
+
+    __tablename__ = "replica_ids"
+
+    entidade = db.Column(db.String(20), primary_key=True)
+    entidade_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+
+
+class ReplicaEstado(db.Model):
+    """Posição da réplica no feed de alterações (linha única, id = 1)."""
+
+    __tablename__ = "replica_estado"
+
+    id = db.Column(db.Integer, primary_key=True)
+    geracao = db.Column(db.String(40))
+    ultimo_seq = db.Column(db.Integer, nullable=False, default=0)
+    sincronizado_em = db.Column(db.DateTime)
@@ -2,16 +2,22 @@ from app.extensions import db
 
 class Reserva(db.Model):
     __tablename__ = "reservas"
+    __table_args__ = (
+        # impede dupla reserva da mesma sala no mesmo dia, mesmo entre workers;
+        # atende também os filtros por sala + intervalo de datas
+        db.Index("ux_reservas_sala_data", "sala", "data_reserva", unique=True),
+        db.Index("ix_reservas_turma_data", "turma_id", "data_reserva"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     sala = db.Column(db.String(100), nullable=False)
-    data_reserva = db.Column(db.String(20), nullable=False)
+    data_reserva = db.Column(db.Date, nullable=False, index=True)
     turma_id = db.Column(db.Integer, nullable=False)
 
     def to_dict(self):
         return {
             "id": self.id,
             "sala": self.sala,
-            "data_reserva": self.data_reserva,
+            "data_reserva": self.data_reserva.isoformat(),
             "turma_id": self.turma_id
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,55 @@
+from datetime import date
+
+from flask import request
+
+
+class ParametroInvalido(ValueError):
+    pass
+
+
+def parametro_inteiro(nome, minimo=None):
+    """Lê `nome` da query string como inteiro (None se ausente)."""
+    valor = request.args.get(nome)
+    if valor is None or valor == "":
+        return None
+    try:
+        valor = int(valor)
+    except ValueError:
+        raise ParametroInvalido(f"Parâmetro '{nome}' deve ser um inteiro")
+    if minimo is not None and valor < minimo:
+        raise ParametroInvalido(f"Parâmetro '{nome}' deve ser maior ou igual a {minimo}")
+    return valor
+
+
+def parametro_data(nome):
+    """Lê `nome` da query string como data ISO (AAAA-MM-DD); None se ausente."""
+    valor = request.args.get(nome)
+    if valor is None or valor == "":
+        return None
+    try:
+        return date.fromisoformat(valor)
+    except ValueError:
+        raise ParametroInvalido(f"Parâmetro '{nome}' deve ser uma data no formato AAAA-MM-DD")
+
+
+def parametro_lista(nome, permitidos):
+    """Lê `nome` da query string como lista separada por vírgulas de valores em `permitidos`."""
+    valor = request.args.get(nome)
+    if not valor:
+        return []
+    itens = list(dict.fromkeys(item.strip() for item in valor.split(",") if item.strip()))
+    invalidos = [item for item in itens if item not in permitidos]
+    if invalidos:
+        raise ParametroInvalido(
+            f"Parâmetro '{nome}' aceita apenas: {', '.join(permitidos)} (recebido: {', '.join(invalidos)})"
+        )
+    return itens
+
+
+def aplicar_filtros(query, modelo, campos):
+    """Aplica `?campo=<int>` da query string como igualdade sobre colunas indexadas do modelo."""
+    for campo in campos:
+        valor = parametro_inteiro(campo)
+        if valor is not None:
+            query = query.filter(getattr(modelo, campo) == valor)
+    return query
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+# 0 = segunda ... 6 = domingo (mesma convenção de date.weekday())
+DIAS_SEMANA = {"seg": 0, "ter": 1, "qua": 2, "qui": 3, "sex": 4, "sab": 5, "dom": 6}
+
+MAXIMO_OCORRENCIAS = 366
+# limite do período entre `inicio` e `fim` (dois anos)
+MAXIMO_DIAS = 731
+
+
+def ler_dias_semana(valores):
+    """Aceita inteiros 0-6 ou abreviações ("seg", "ter", ...). Lança ValueError se inválido."""
+    if not isinstance(valores, list) or not valores:
+        raise ValueError("'dias_semana' deve ser uma lista não vazia")
+
+    dias = set()
+    for valor in valores:
+        if isinstance(valor, str) and valor.lower()[:3] in DIAS_SEMANA:
+            dias.add(DIAS_SEMANA[valor.lower()[:3]])
+        elif type(valor) is int and 0 <= valor <= 6:
+            dias.add(valor)
+        else:
+            raise ValueError(f"Dia da semana inválido: {valor!r} (use 0-6 ou seg, ter, qua, qui, sex, sab, dom)")
+    return dias
+
+
+def gerar_datas(inicio, fim, dias_semana, intervalo=1):
+    """
+    Datas entre `inicio` e `fim` (inclusive) que caem em `dias_semana`, a cada
+    `intervalo` semanas contadas a partir da semana de `inicio`.
+    """
+    if fim < inicio:
+        raise ValueError("'fim' deve ser maior ou igual a 'inicio'")
+    if type(intervalo) is not int or intervalo < 1:
+        raise ValueError("'intervalo' deve ser um inteiro maior ou igual a 1")
+
+    if (fim - inicio).days + 1 > MAXIMO_DIAS:
+        raise ValueError(f"O período entre 'inicio' e 'fim' deve ter no máximo {MAXIMO_DIAS} dias")
+
+    # percorre só as semanas da regra e, nelas, só os dias pedidos
+    segunda_inicial = inicio - timedelta(days=inicio.weekday())
+    ultima_semana = (fim - segunda_inicial).days // 7
+    datas = []
+    for semana in range(0, ultima_semana + 1, intervalo):
+        for dia_semana in sorted(dias_semana):
+            dia = segunda_inicial + timedelta(days=7 * semana + dia_semana)
+            if inicio <= dia <= fim:
+                datas.append(dia)
+        if len(datas) > MAXIMO_OCORRENCIAS:
+            raise ValueError(f"A regra gera mais de {MAXIMO_OCORRENCIAS} ocorrências")
+    return datas
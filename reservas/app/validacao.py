@@ -0,0 +1,48 @@
+import os
+
+from app import replica
+from app.caching import CacheTTL, SingleFlight
+from app.http_client import gerenciamento
+
+VALIDACAO_CACHE_TAMANHO = int(os.getenv("VALIDACAO_CACHE_TAMANHO", "10000"))
+VALIDACAO_CACHE_TTL = float(os.getenv("VALIDACAO_CACHE_TTL", "60"))
+VALIDACAO_CACHE_TTL_NEGATIVO = float(os.getenv("VALIDACAO_CACHE_TTL_NEGATIVO", "10"))
+
+
+cache = CacheTTL(VALIDACAO_CACHE_TAMANHO)
+consultas = SingleFlight()
+
+
+def existe(entidade, id):
+    """
+    Verifica se `id` existe na `entidade` ("professores", "turmas", "alunos")
+    do serviço de gerenciamento.
+
+    Respostas 200 ficam em cache por VALIDACAO_CACHE_TTL segundos e 404 por
+    VALIDACAO_CACHE_TTL_NEGATIVO. Outros status não são guardados. Falhas de
+    conexão propagam `requests.exceptions.RequestException`.
+
+    Quando a réplica local está em dia e contém o ID, a resposta vem dela,
+    sem rede; IDs ausentes dela ainda são conferidos no gerenciamento.
+    Consultas simultâneas do mesmo ID compartilham uma única chamada ao
+    gerenciamento.
+    """
+    local = replica.consultar(entidade, id)
+    if local is not None:
+        return local
+
+    chave = (entidade, str(id))
+    encontrado, valor = cache.obter(chave)
+    if encontrado:
+        return valor
+    return consultas.executar(chave, lambda: _consultar(entidade, id, chave))
+
+
+def _consultar(entidade, id, chave):
+    resposta = gerenciamento.get(f"/{entidade}/{id}")
+    if resposta.status_code == 200:
+        cache.guardar(chave, True, VALIDACAO_CACHE_TTL)
+        return True
+    if resposta.status_code == 404:
+        cache.guardar(chave, False, VALIDACAO_CACHE_TTL_NEGATIVO)
+    return False
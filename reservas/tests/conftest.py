@@ -0,0 +1,33 @@
+from datetime import datetime
+
+import pytest
+
+from app import create_app, entidades, init_db, replica, validacao
+from app.extensions import db
+from app.models.replica import ReplicaEstado, ReplicaId
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'reservas.db'}"})
+    init_db(app)
+    validacao.cache.limpar()
+    entidades.cache.limpar()
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def cliente(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def turmas(app, monkeypatch):
+    """Réplica em dia com as turmas 1 a 3; qualquer outro ID é dado como inexistente, sem rede."""
+    monkeypatch.setattr(replica, "REPLICA_SYNC_INTERVALO", 5)
+    monkeypatch.setattr(validacao, "_consultar", lambda entidade, id, chave: False)
+    db.session.add(ReplicaEstado(id=1, ultimo_seq=3, sincronizado_em=datetime.utcnow()))
+    db.session.add_all([ReplicaId(entidade="turmas", entidade_id=id) for id in (1, 2, 3)])
+    db.session.commit()
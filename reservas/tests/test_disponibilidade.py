@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+
+from app.controllers import reserva_controller
+from app.extensions import db
+from app.models.reserva import Reserva
+
+
+def _reservar(sala, data_reserva, turma_id=1):
+    reserva = Reserva(sala=sala, data_reserva=date.fromisoformat(data_reserva), turma_id=turma_id)
+    db.session.add(reserva)
+    db.session.commit()
+    return reserva.id
+
+
+def test_informa_dia_a_dia_quais_salas_estao_livres(cliente):
+    ocupada = _reservar("LAB-101", "2025-01-16", turma_id=7)
+    _reservar("LAB-101", "2025-01-20")  # fora do intervalo
+    _reservar("LAB-303", "2025-01-15")  # sala não consultada
+
+    resposta = cliente.get("/api/reservas/disponibilidade?from=2025-01-15&to=2025-01-17&salas=LAB-101, LAB-202")
+
+    assert resposta.status_code == 200
+    assert resposta.get_json() == {
+        "de": "2025-01-15",
+        "ate": "2025-01-17",
+        "salas": {
+            "LAB-101": [
+                {"data": "2025-01-15", "livre": True},
+                {"data": "2025-01-16", "livre": False, "reserva_id": ocupada, "turma_id": 7},
+                {"data": "2025-01-17", "livre": True},
+            ],
+            "LAB-202": [
+                {"data": "2025-01-15", "livre": True},
+                {"data": "2025-01-16", "livre": True},
+                {"data": "2025-01-17", "livre": True},
+            ],
+        },
+    }
+
+
+def test_sem_salas_consulta_todas_as_salas_com_reservas(cliente):
+    _reservar("LAB-202", "2025-03-01")
+    _reservar("LAB-101", "2025-01-01")
+
+    salas = cliente.get("/api/reservas/disponibilidade?from=2025-03-01&to=2025-03-01").get_json()["salas"]
+
+    assert list(salas) == ["LAB-101", "LAB-202"]
+    assert salas["LAB-101"][0]["livre"] is True
+    assert salas["LAB-202"][0]["livre"] is False
+
+
+def test_intervalo_maximo_e_aceito_inteiro(cliente, monkeypatch):
+    monkeypatch.setattr(reserva_controller, "MAXIMO_DIAS_DISPONIBILIDADE", 3)
+
+    assert cliente.get("/api/reservas/disponibilidade?from=2025-01-01&to=2025-01-03&salas=A").status_code == 200
+    assert cliente.get("/api/reservas/disponibilidade?from=2025-01-01&to=2025-01-04&salas=A").status_code == 400
+
+
+@pytest.mark.parametrize("consulta", [
+    "from=2025-01-01",
+    "to=2025-01-01",
+    "from=2025-01-02&to=2025-01-01",
+    "from=01/01/2025&to=2025-01-02",
+    "from=2024-01-01&to=2025-12-31",
+])
+def test_parametros_invalidos_devolvem_400(cliente, consulta):
+    resposta = cliente.get(f"/api/reservas/disponibilidade?{consulta}")
+
+    assert resposta.status_code == 400
+    assert "erro" in resposta.get_json()
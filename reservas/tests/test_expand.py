@@ -0,0 +1,64 @@
+from datetime import date
+
+import pytest
+
+from app import entidades
+from app.extensions import db
+from app.models.reserva import Reserva
+
+
+class RespostaFalsa:
+    def __init__(self, dados):
+        self.dados = dados
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.dados
+
+
+@pytest.fixture
+def resolve(monkeypatch):
+    """`POST /resolve` do gerenciamento com as turmas 1 a 50; registra os pedidos."""
+    pedidos = []
+
+    def post(caminho, json):
+        pedidos.append((caminho, json))
+        return RespostaFalsa({
+            entidade: {
+                "encontrados": [{"id": id, "nome": f"Turma {id}"} for id in ids if id <= 50],
+                "inexistentes": [id for id in ids if id > 50],
+            }
+            for entidade, ids in json.items()
+        })
+
+    monkeypatch.setattr(entidades.gerenciamento, "post", post)
+    return pedidos
+
+
+@pytest.fixture
+def reservas(app):
+    db.session.add_all([
+        Reserva(sala="LAB-101", data_reserva=date(2025, 1, 15), turma_id=1),
+        Reserva(sala="LAB-102", data_reserva=date(2025, 1, 15), turma_id=60),
+        Reserva(sala="LAB-101", data_reserva=date(2025, 1, 16), turma_id=1),
+    ])
+    db.session.commit()
+
+
+def test_expand_turma_com_uma_unica_chamada_e_cache(cliente, resolve, reservas):
+    corpo = cliente.get("/api/reservas/?expand=turma").get_json()
+
+    assert [r["turma"] for r in corpo] == [{"id": 1, "nome": "Turma 1"}, None, {"id": 1, "nome": "Turma 1"}]
+    assert resolve == [("/resolve", {"turmas": [1, 60]})]
+
+    filtradas = cliente.get("/api/reservas/?sala=LAB-101&expand=turma").get_json()
+    assert [r["data_reserva"] for r in filtradas] == ["2025-01-15", "2025-01-16"]
+    assert len(resolve) == 1
+
+
+def test_sem_expand_ou_expand_invalido(cliente, resolve, reservas):
+    assert "turma" not in cliente.get("/api/reservas/").get_json()[0]
+    assert cliente.get("/api/reservas/?expand=professor").status_code == 400
+    assert resolve == []
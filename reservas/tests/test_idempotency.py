@@ -0,0 +1,78 @@
+import hashlib
+import json
+from datetime import datetime
+
+import pytest
+import requests
+
+from app import validacao
+from app.extensions import db
+from app.models.chave_idempotencia import ChaveIdempotencia
+from app.models.reserva import Reserva
+
+RESERVA = {"sala": "LAB-101", "data_reserva": "2025-01-15", "turma_id": 1}
+
+
+@pytest.fixture
+def cliente(app, monkeypatch):
+    monkeypatch.setattr(validacao, "_consultar", lambda entidade, id, chave: True)
+    return app.test_client()
+
+
+def _criar(cliente, corpo, chave="chave-1"):
+    return cliente.post("/api/reservas/", json=corpo, headers={"Idempotency-Key": chave})
+
+
+def test_repeticao_devolve_a_resposta_gravada_sem_executar_de_novo(cliente):
+    primeira = _criar(cliente, RESERVA)
+    repetida = _criar(cliente, RESERVA)
+
+    assert primeira.status_code == repetida.status_code == 201
+    assert repetida.get_json() == primeira.get_json()
+    assert repetida.headers["Idempotent-Replayed"] == "true"
+    assert Reserva.query.count() == 1
+
+
+def test_mesma_chave_com_outro_corpo_e_rejeitada(cliente):
+    _criar(cliente, RESERVA)
+    resposta = _criar(cliente, {**RESERVA, "sala": "LAB-202"})
+
+    assert resposta.status_code == 422
+    assert Reserva.query.count() == 1
+
+
+def test_chave_em_processamento_devolve_409(cliente):
+    chave = hashlib.sha256(b"POST /api/reservas/ chave-1").hexdigest()
+    corpo = json.dumps(RESERVA).encode()
+    db.session.add(ChaveIdempotencia(
+        chave=chave, hash_requisicao=hashlib.sha256(corpo).hexdigest(), criado_em=datetime.utcnow()
+    ))
+    db.session.commit()
+
+    resposta = cliente.post(
+        "/api/reservas/", data=corpo, content_type="application/json", headers={"Idempotency-Key": "chave-1"}
+    )
+    assert resposta.status_code == 409
+    assert Reserva.query.count() == 0
+
+
+def test_falha_5xx_libera_a_chave_para_nova_tentativa(cliente, monkeypatch):
+    def fora_do_ar(entidade, id, chave):
+        raise requests.exceptions.ConnectionError("gerenciamento fora do ar")
+
+    monkeypatch.setattr(validacao, "_consultar", fora_do_ar)
+    assert _criar(cliente, RESERVA).status_code == 500
+
+    monkeypatch.setattr(validacao, "_consultar", lambda entidade, id, chave: True)
+    resposta = _criar(cliente, RESERVA)
+    assert resposta.status_code == 201
+    assert "Idempotent-Replayed" not in resposta.headers
+
+
+def test_erros_4xx_tambem_sao_repetidos(cliente):
+    _criar(cliente, RESERVA, chave="a")
+    conflito = _criar(cliente, RESERVA, chave="b")
+    repetido = _criar(cliente, RESERVA, chave="b")
+
+    assert conflito.status_code == repetido.status_code == 409
+    assert repetido.headers["Idempotent-Replayed"] == "true"
@@ -0,0 +1,96 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import inspect
+
+from app import create_app, init_db
+from app.extensions import db
+from app.models.reserva import Reserva
+
+# schema anterior a `data_reserva` virar Date, com as datas em texto livre
+SCHEMA_LEGADO = """
+CREATE TABLE reservas (
+    id INTEGER NOT NULL PRIMARY KEY,
+    sala VARCHAR(100) NOT NULL,
+    data_reserva VARCHAR(20) NOT NULL,
+    turma_id INTEGER NOT NULL
+);
+CREATE INDEX ix_reservas_turma_id ON reservas (turma_id);
+"""
+
+
+@pytest.fixture
+def banco_legado(tmp_path):
+    caminho = tmp_path / "reservas.db"
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript(SCHEMA_LEGADO)
+    conexao.executemany("INSERT INTO reservas VALUES (?, ?, ?, 1)", [
+        (1, "LAB-101", "2025-01-15"),
+        (2, "LAB-101", "16/01/2025"),
+        (3, "LAB-202", "2025/01/17"),
+        (4, "LAB-202", "2025-01-18T08:00:00"),
+        (5, "LAB-303", "amanhã"),
+        (6, "LAB-303", "2024-13-45"),
+        # ISO compacto: o Python 3.11 aceita, mas a coluna Date não lê
+        (7, "LAB-303", "20250119"),
+        # mesmo dia da reserva 1, escrito em outro formato
+        (8, "LAB-101", "15-01-2025"),
+    ])
+    conexao.commit()
+    conexao.close()
+    return caminho
+
+
+@pytest.fixture
+def app(banco_legado):
+    """Sobrescreve o `app` do conftest: sobe o serviço sobre o banco legado."""
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{banco_legado}"})
+    init_db(app)
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+def _ids(tabela):
+    return db.session.connection().exec_driver_sql(f"SELECT id FROM {tabela} ORDER BY id").scalars().all()
+
+
+def test_datas_legadas_viram_iso(app):
+    datas = {r.id: r.data_reserva.isoformat() for r in Reserva.query}
+
+    assert datas == {
+        1: "2025-01-15",
+        2: "2025-01-16",
+        3: "2025-01-17",
+        4: "2025-01-18",
+    }
+
+
+def test_datas_invalidas_e_duplicadas_sao_separadas_e_nao_apagadas(app):
+    assert _ids("reservas_datas_invalidas") == [5, 6, 7]
+    # a mais antiga fica com a sala
+    assert _ids("reservas_duplicadas") == [8]
+
+
+def test_indices_novos_substituem_o_antigo(app):
+    indices = {i["name"]: i for i in inspect(db.engine).get_indexes("reservas")}
+
+    assert "ix_reservas_turma_id" not in indices
+    assert indices["ux_reservas_sala_data"]["unique"]
+    assert "ix_reservas_turma_data" in indices
+
+
+def test_filtro_por_intervalo_funciona_sobre_as_datas_migradas(cliente, turmas):
+    reservas = cliente.get("/api/reservas/?from=2025-01-16&to=2025-01-18").get_json()
+    assert [r["id"] for r in reservas] == [2, 3, 4]
+
+    conflito = cliente.post("/api/reservas/", json={"sala": "LAB-101", "data_reserva": "2025-01-16", "turma_id": 1})
+    assert conflito.status_code == 409
+
+
+def test_migracao_e_idempotente(app):
+    init_db(app)
+
+    assert _ids("reservas") == [1, 2, 3, 4]
+    assert _ids("reservas_datas_invalidas") == [5, 6, 7]
+    assert _ids("reservas_duplicadas") == [8]
@@ -0,0 +1,159 @@
+import sqlite3
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app.controllers.reserva_controller import inserir_datas_individualmente
+from app.extensions import db
+from app.models.reserva import Reserva
+from app.recorrencia import MAXIMO_DIAS, gerar_datas, ler_dias_semana
+
+
+def _datas(*valores):
+    return [date.fromisoformat(v) for v in valores]
+
+
+def _reservar(sala, data_reserva, turma_id=1):
+    reserva = Reserva(sala=sala, data_reserva=date.fromisoformat(data_reserva), turma_id=turma_id)
+    db.session.add(reserva)
+    db.session.commit()
+    return reserva.to_dict()
+
+
+def test_gera_os_dias_da_semana_pedidos_no_periodo():
+    # 2025-01-01 é uma quarta-feira
+    datas = gerar_datas(date(2025, 1, 1), date(2025, 1, 14), ler_dias_semana(["seg", "qua"]))
+
+    assert datas == _datas("2025-01-01", "2025-01-06", "2025-01-08", "2025-01-13")
+
+
+def test_intervalo_conta_semanas_a_partir_da_semana_do_inicio():
+    datas = gerar_datas(date(2025, 1, 1), date(2025, 2, 5), {0, 2}, intervalo=2)
+
+    # semanas de 30/12, 13/01, 27/01; a segunda 30/12 fica antes do início
+    assert datas == _datas("2025-01-01", "2025-01-13", "2025-01-15", "2025-01-27", "2025-01-29")
+
+
+def test_intervalo_enorme_gera_so_a_primeira_semana():
+    assert gerar_datas(date(2025, 1, 1), date(2025, 12, 31), {2}, intervalo=10**12) == _datas("2025-01-01")
+
+
+def test_periodo_acima_do_maximo_e_rejeitado():
+    inicio = date(2025, 1, 1)
+
+    assert gerar_datas(inicio, date.fromordinal(inicio.toordinal() + MAXIMO_DIAS - 1), {2}, intervalo=52)
+    with pytest.raises(ValueError, match="no máximo"):
+        gerar_datas(inicio, date.fromordinal(inicio.toordinal() + MAXIMO_DIAS), {2}, intervalo=52)
+    with pytest.raises(ValueError, match="no máximo"):
+        gerar_datas(inicio, date(9999, 12, 31), {2}, intervalo=10**6)
+
+
+def test_excesso_de_ocorrencias_e_rejeitado():
+    with pytest.raises(ValueError, match="ocorrências"):
+        gerar_datas(date(2025, 1, 1), date(2026, 12, 31), set(range(7)))
+
+
+@pytest.mark.parametrize("dias", [[], "seg", ["xyz"], [7], [True]])
+def test_dias_da_semana_invalidos(dias):
+    with pytest.raises(ValueError):
+        ler_dias_semana(dias)
+
+
+def _recorrente(cliente, **campos):
+    corpo = {"sala": "LAB-101", "turma_id": 1, "inicio": "2025-01-01", "fim": "2025-01-14", "dias_semana": ["seg", "qua"]}
+    return cliente.post("/api/reservas/recorrente", json={**corpo, **campos})
+
+
+def test_cria_todas_as_ocorrencias(cliente, turmas):
+    resposta = _recorrente(cliente)
+
+    assert resposta.status_code == 201
+    corpo = resposta.get_json()
+    assert [r["data_reserva"] for r in corpo["criadas"]] == ["2025-01-01", "2025-01-06", "2025-01-08", "2025-01-13"]
+    assert corpo["conflitos"] == []
+    assert Reserva.query.count() == 4
+
+
+def test_conflito_sem_ignorar_nao_grava_nada(cliente, turmas):
+    ocupada = _reservar("LAB-101", "2025-01-08", turma_id=2)
+    _reservar("LAB-101", "2025-01-07")  # mesma sala, dia fora da regra
+
+    resposta = _recorrente(cliente)
+
+    assert resposta.status_code == 409
+    assert resposta.get_json()["conflitos"] == [{"data": "2025-01-08", "reserva": ocupada}]
+    assert Reserva.query.count() == 2
+
+
+def test_ignorar_conflitos_reserva_so_as_datas_livres(cliente, turmas):
+    ocupada = _reservar("LAB-101", "2025-01-08", turma_id=2)
+
+    corpo = _recorrente(cliente, ignorar_conflitos=True).get_json()
+
+    assert [r["data_reserva"] for r in corpo["criadas"]] == ["2025-01-01", "2025-01-06", "2025-01-13"]
+    assert corpo["conflitos"] == [{"data": "2025-01-08", "reserva": ocupada}]
+
+
+@pytest.mark.parametrize("campos", [
+    {"fim": "2024-12-31"},
+    {"fim": "2030-01-01"},
+    {"intervalo": 0},
+    {"dias_semana": ["sab"], "fim": "2025-01-03"},
+    {"turma_id": 99},
+])
+def test_regras_invalidas_devolvem_400(cliente, turmas, campos):
+    resposta = _recorrente(cliente, **campos)
+
+    assert resposta.status_code == 400
+    assert Reserva.query.count() == 0
+
+
+@pytest.fixture
+def reserva_concorrente(app):
+    """Grava, por outra conexão, uma reserva em 2025-01-06 logo após a verificação de conflitos."""
+    caminho = app.config["SQLALCHEMY_DATABASE_URI"].removeprefix("sqlite:///")
+    gravada = []
+
+    def depois_da_consulta(conexao, cursor, sql, parametros, contexto, executemany):
+        if not gravada and sql.lstrip().upper().startswith("SELECT") and "FROM reservas" in sql:
+            outra = sqlite3.connect(caminho)
+            outra.execute("INSERT INTO reservas (sala, data_reserva, turma_id) VALUES ('LAB-101', '2025-01-06', 3)")
+            outra.commit()
+            outra.close()
+            gravada.append(True)
+
+    event.listen(db.engine, "after_cursor_execute", depois_da_consulta)
+    yield gravada
+    event.remove(db.engine, "after_cursor_execute", depois_da_consulta)
+
+
+def test_corrida_com_ignorar_conflitos_grava_as_demais_datas(cliente, turmas, reserva_concorrente):
+    resposta = _recorrente(cliente, ignorar_conflitos=True)
+
+    assert reserva_concorrente
+    assert resposta.status_code == 201
+    corpo = resposta.get_json()
+    assert [r["data_reserva"] for r in corpo["criadas"]] == ["2025-01-01", "2025-01-08", "2025-01-13"]
+    assert [(c["data"], c["reserva"]["turma_id"]) for c in corpo["conflitos"]] == [("2025-01-06", 3)]
+    assert Reserva.query.count() == 4
+
+
+def test_corrida_sem_ignorar_conflitos_devolve_409(cliente, turmas, reserva_concorrente):
+    resposta = _recorrente(cliente)
+
+    assert resposta.status_code == 409
+    assert [c["data"] for c in resposta.get_json()["conflitos"]] == ["2025-01-06"]
+    assert Reserva.query.count() == 1
+
+
+def test_insercao_individual_pula_so_as_datas_ocupadas(app):
+    _reservar("LAB-101", "2025-01-08")
+
+    novas = inserir_datas_individualmente("LAB-101", 2, _datas("2025-01-06", "2025-01-08", "2025-01-13"))
+    db.session.commit()
+
+    assert [r.data_reserva.isoformat() for r in novas] == ["2025-01-06", "2025-01-13"]
+    assert sorted((r.data_reserva.isoformat(), r.turma_id) for r in Reserva.query) == [
+        ("2025-01-06", 2), ("2025-01-08", 1), ("2025-01-13", 2),
+    ]
@@ -0,0 +1,102 @@
+import pytest
+
+from app import replica
+from app.extensions import db
+from app.models.replica import ReplicaEstado, ReplicaId
+
+
+class RespostaFalsa:
+    def __init__(self, dados):
+        self.dados = dados
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.dados
+
+
+class FeedFalso:
+    """Feed `GET /changes` do gerenciamento em memória."""
+
+    def __init__(self):
+        self.geracao = "g1"
+        self.alteracoes = []
+        self.pedidos = []
+
+    def registrar(self, entidade, id, operacao="criado"):
+        self.alteracoes.append({"seq": len(self.alteracoes) + 1, "entidade": entidade, "id": id, "operacao": operacao})
+
+    def recriar_banco(self):
+        self.geracao = f"g{int(self.geracao[1:]) + 1}"
+        self.alteracoes = []
+
+    def get(self, caminho, params):
+        assert caminho == "/changes"
+        self.pedidos.append(params["since"])
+        pendentes = [a for a in self.alteracoes if a["seq"] > params["since"]]
+        return RespostaFalsa({
+            "geracao": self.geracao,
+            "alteracoes": pendentes[:params["limit"]],
+            "tem_mais": len(pendentes) > params["limit"],
+        })
+
+
+@pytest.fixture
+def feed(app, monkeypatch):
+    feed = FeedFalso()
+    monkeypatch.setattr(replica.gerenciamento, "get", feed.get)
+    monkeypatch.setattr(replica, "REPLICA_SYNC_INTERVALO", 5)
+    monkeypatch.setattr(replica, "REPLICA_LOTE", 2)
+    return feed
+
+
+def _ids():
+    return {(r.entidade, r.entidade_id) for r in ReplicaId.query.all()}
+
+
+def test_sincroniza_em_paginas_e_aplica_remocoes(feed):
+    for id in (1, 2, 3):
+        feed.registrar("turmas", id)
+    feed.registrar("alunos", 10)
+    feed.registrar("turmas", 2, "removido")
+
+    assert replica.sincronizar() == 5
+    assert _ids() == {("turmas", 1), ("turmas", 3), ("alunos", 10)}
+    assert feed.pedidos == [0, 2, 4]
+    assert db.session.get(ReplicaEstado, 1).ultimo_seq == 5
+    assert replica.em_dia()
+
+    # a próxima sincronização pede só o que veio depois
+    feed.registrar("turmas", 4)
+    assert replica.sincronizar() == 1
+    assert feed.pedidos[-1] == 5
+    assert replica.consultar("turmas", 4) is True
+
+
+def test_nova_geracao_reinicia_a_replica(feed):
+    for id in (1, 2, 3):
+        feed.registrar("turmas", id)
+    replica.sincronizar()
+
+    # o banco do gerenciamento foi recriado: os IDs antigos deixam de valer
+    feed.recriar_banco()
+    feed.registrar("turmas", 9)
+    replica.sincronizar()
+
+    assert _ids() == {("turmas", 9)}
+    estado = db.session.get(ReplicaEstado, 1)
+    assert (estado.geracao, estado.ultimo_seq) == ("g2", 1)
+    # pediu a partir do último seq, viu a geração nova e recomeçou do zero
+    assert feed.pedidos == [0, 2, 3, 0]
+
+
+def test_consulta_confia_apenas_em_ids_presentes(feed):
+    feed.registrar("turmas", 1)
+    assert replica.consultar("turmas", 1) is None  # ainda não sincronizou
+
+    replica.sincronizar()
+    assert replica.consultar("turmas", 1) is True
+    # ausente pode ter sido criado depois da sincronização: decide o gerenciamento
+    assert replica.consultar("turmas", 2) is None
+    assert replica.consultar("turmas", "1") is None
@@ -0,0 +1,6 @@
+# ponto de entrada de produção: gunicorn -c gunicorn.conf.py wsgi:app
+from app import create_app
+from app.replica import iniciar_sincronizacao
+
+app = create_app()
+iniciar_sincronizacao(app)
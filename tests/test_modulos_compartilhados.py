@@ -0,0 +1,53 @@
+"""
+Os serviços são implantados separadamente (cada um com o seu contexto de build),
+então a infraestrutura comum é copiada em cada um. Este teste falha quando as
+cópias divergem: altere todas juntas.
+"""
+import difflib
+from pathlib import Path
+
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+TODOS = ("gerenciamento", "reservas", "atividades")
+CLIENTES = ("reservas", "atividades")
+
+# módulo -> serviços que mantêm uma cópia idêntica
+COMPARTILHADOS = {
+    "app/extensions.py": TODOS,
+    "app/idempotency.py": TODOS,
+    "app/metrics.py": TODOS,
+    "app/profiling.py": TODOS,
+    "app/models/chave_idempotencia.py": TODOS,
+    "app/caching.py": CLIENTES,
+    "app/entidades.py": CLIENTES,
+    "app/http_client.py": CLIENTES,
+    "app/replica.py": CLIENTES,
+    "app/models/replica.py": CLIENTES,
+}
+
+
+@pytest.mark.parametrize("modulo", sorted(COMPARTILHADOS))
+def test_copias_identicas(modulo):
+    servicos = COMPARTILHADOS[modulo]
+    referencia = servicos[0]
+    esperado = (RAIZ / referencia / modulo).read_text(encoding="utf-8")
+    for servico in servicos[1:]:
+        caminho = RAIZ / servico / modulo
+        assert caminho.exists(), f"{servico}/{modulo} não existe"
+        atual = caminho.read_text(encoding="utf-8")
+        diferenca = "".join(difflib.unified_diff(
+            esperado.splitlines(keepends=True), atual.splitlines(keepends=True),
+            f"{referencia}/{modulo}", f"{servico}/{modulo}",
+        ))
+        assert not diferenca, f"cópias divergentes de {modulo}:\n{diferenca}"
+
+
+@pytest.mark.parametrize("modulo", sorted(COMPARTILHADOS))
+def test_cabecalho_aponta_para_esta_verificacao(modulo):
+    for servico in COMPARTILHADOS[modulo]:
+        cabecalho = (RAIZ / servico / modulo).read_text(encoding="utf-8").splitlines()[:2]
+        assert cabecalho[0].startswith("# Módulo compartilhado:"), f"{servico}/{modulo} sem cabeçalho"
+        for outro in COMPARTILHADOS[modulo]:
+            assert f"{outro}/" in cabecalho[0], f"cabeçalho de {servico}/{modulo} não cita {outro}/"